@@ -17,16 +17,40 @@ from homeassistant.const import (
 from homeassistant.core import CoreState, Event
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.importlib import async_import_module
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .api import CupApi
-from .const import CONF_EXCLUDE_PATTERNS, CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL, DOMAIN
-from .frontend import JSModuleRegistration
+from .const import (
+    CONF_EXCLUDE_PATTERNS,
+    CONF_MEMORY_BUDGET,
+    CONF_PUSH_MODE,
+    CONF_STALE_MAX_AGE,
+    CONF_UPDATE_INTERVAL,
+    DEFAULT_MEMORY_BUDGET,
+    DEFAULT_STALE_MAX_AGE,
+    DEFAULT_UPDATE_INTERVAL,
+    DOMAIN,
+    PUSH_SAFETY_NET_INTERVAL,
+    SIGNAL_SNAPSHOT_UPDATED,
+)
+from .endpoint import async_acquire_endpoint, async_release_endpoint, normalize_url
+from .exceptions import CircuitOpenError, ContentApiTypeError
+from .helper import async_pop_prefetched_payload
+from .pending import PendingUpdateIndex, async_remove_pending_index
+from .push import async_setup_push
+from .services import async_remove_profile, async_setup_services
 
 if TYPE_CHECKING:
+    from collections.abc import Mapping
+
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.typing import ConfigType
 
+    from .frontend import JSModuleRegistration
+    from .snapshot import CupSnapshot
+
 _LOGGER = logging.getLogger(__name__)
 
 # This integration is configured exclusively via config entries (no YAML configuration).
@@ -37,8 +61,25 @@ PLATFORMS = [Platform.BINARY_SENSOR, Platform.SENSOR, Platform.BUTTON]
 type CupComponentConfigEntry = ConfigEntry[CupComponentData]
 
 
+async def _async_get_js_module_registration(hass: HomeAssistant) -> JSModuleRegistration:
+    """Return the shared Lovelace registrar, importing the frontend package on first use.
+
+    The frontend package pulls in the lovelace and http components: it is imported
+    in the executor when first needed rather than when the integration is loaded.
+
+    Args:
+        hass (HomeAssistant): The Home Assistant instance.
+
+    Returns:
+        JSModuleRegistration: The shared registrar.
+
+    """
+    frontend = await async_import_module(hass, f"{__name__}.frontend")
+    return frontend.async_get_js_module_registration(hass)
+
+
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:  # pyright: ignore[reportUnknownParameterType, reportMissingTypeArgument] # pylint: disable=unused-argument  # noqa: ARG001
-    """Register the static HTTP path and the Lovelace card resource.
+    """Register the card HTTP view, the Lovelace card resource, the card websocket API, the metrics view and the services.
 
     This function is called once when the integration is loaded, before any
     config entry setup. Registration is deferred until HA is fully started
@@ -60,9 +101,15 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:  # pyrig
             None.
 
         """
-        registrar = JSModuleRegistration(hass)
+        registrar = await _async_get_js_module_registration(hass)
         await registrar.async_register()
 
+    websocket = await async_import_module(hass, f"{__name__}.websocket")
+    websocket.async_register_websocket_commands(hass)
+    prometheus = await async_import_module(hass, f"{__name__}.prometheus")
+    prometheus.async_register_metrics_view(hass)
+    async_setup_services(hass)
+
     if hass.state == CoreState.running:
         # HA is already running (e.g. integration reloaded at runtime): register immediately
         # without waiting for EVENT_HOMEASSISTANT_STARTED, which will never fire again.
@@ -80,12 +127,50 @@ class CupComponentData:
 
     Attributes:
         api (CupApi): The API client used to fetch data from the Cup server.
-        coordinator (DataUpdateCoordinator[None]): The update coordinator managing polling.
+        coordinator (DataUpdateCoordinator[CupSnapshot]): The update coordinator managing polling.
+        pending (PendingUpdateIndex): The persistent first-seen index of the pending updates.
 
     """
 
     api: CupApi
-    coordinator: DataUpdateCoordinator[None]
+    coordinator: DataUpdateCoordinator[CupSnapshot]
+    pending: PendingUpdateIndex
+
+
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Migrate a config entry created by an older version of the integration.
+
+    Minor version 2 builds the unique ID from the normalised address, so that a
+    Cup server added again with an equivalent address (e.g. with a trailing slash
+    or the default port) is detected as already configured. The unique ID is kept
+    when another entry already uses the normalised one.
+
+    Args:
+        hass (HomeAssistant): The Home Assistant instance.
+        entry (ConfigEntry): The config entry to migrate.
+
+    Returns:
+        bool: True if the entry was migrated, False if its version is not supported.
+
+    """
+
+    if entry.version > 1:
+        # Downgraded from a future version.
+        return False
+
+    if entry.minor_version < 2:
+        unique_id = normalize_url(str(entry.data[CONF_URL])).lower()
+        taken = any(
+            other.unique_id == unique_id
+            for other in hass.config_entries.async_entries(DOMAIN)
+            if other.entry_id != entry.entry_id
+        )
+        if taken:
+            _LOGGER.warning("Another entry already uses the address of %s, unique ID kept", entry.title)
+            unique_id = entry.unique_id
+        hass.config_entries.async_update_entry(entry, unique_id=unique_id, minor_version=2)
+
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: CupComponentConfigEntry) -> bool:
@@ -106,6 +191,11 @@ async def async_setup_entry(hass: HomeAssistant, entry: CupComponentConfigEntry)
     _LOGGER.debug("Setting up %s integration with host %s", DOMAIN, url)
 
     session = async_get_clientsession(hass)
+
+    # Entries using the same Cup server share its requests.
+    endpoint = async_acquire_endpoint(hass, url)
+    entry.async_on_unload(lambda: async_release_endpoint(hass, endpoint))
+
     exclude_patterns: list[str] = entry.data.get(CONF_EXCLUDE_PATTERNS, [])
 
     api_client = CupApi(
@@ -113,37 +203,205 @@ async def async_setup_entry(hass: HomeAssistant, entry: CupComponentConfigEntry)
         url=url,
         logger=_LOGGER,
         exclude_patterns=exclude_patterns,
+        executor_job=hass.async_add_executor_job,
+        memory_budget=_get_memory_budget(entry.data),
+        endpoint=endpoint,
     )
+    api_client.poll_interval = _get_update_interval(entry.data)
+    entry.async_on_unload(api_client.async_close)
 
-    async def async_update_data() -> None:
+    async def async_update_data() -> CupSnapshot:
         """Fetch data from API endpoint.
 
+        When the refresh fails, the last good data keeps being served (flagged as
+        stale) as long as it is younger than the configured maximum age, so that
+        entities do not become unavailable during a short Cup outage.
+
         Returns:
-            None.
+            CupSnapshot: The snapshot published by the API client.
 
         """
 
-        await api_client.call_get_all_data()
-
-    conf_update_interval: int | None = entry.data.get(CONF_UPDATE_INTERVAL)
-
-    if conf_update_interval is None:
-        update_interval = DEFAULT_UPDATE_INTERVAL
-    else:
-        update_interval = timedelta(seconds=conf_update_interval)
-
-    coordinator: DataUpdateCoordinator[None] = DataUpdateCoordinator(
+        try:
+            await api_client.call_get_all_data()
+        # broad-exception-caught: any failure can be bridged by the last good data, unexpected ones are re-raised below
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            if api_client.can_serve_stale(_get_stale_max_age(entry.data)):
+                if not api_client.stale:
+                    _LOGGER.warning("Unable to refresh %s (%s), serving the last data received", name, err)
+                api_client.mark_stale()
+                return api_client.snapshot
+            if isinstance(err, CircuitOpenError):
+                raise UpdateFailed(err.message) from err
+            raise
+
+        return api_client.snapshot
+
+    coordinator: DataUpdateCoordinator[CupSnapshot] = DataUpdateCoordinator(
         hass,
         _LOGGER,
         config_entry=entry,
         name=name,
         update_method=async_update_data,
-        update_interval=update_interval,
+        update_interval=api_client.poll_interval,
+        # CupSnapshot compares by content: unchanged refreshes do not notify the entities.
+        always_update=False,
     )
 
-    await coordinator.async_config_entry_first_refresh()
-    entry.runtime_data = CupComponentData(api_client, coordinator)
+    pending_index = PendingUpdateIndex(hass, entry.entry_id)
+    await pending_index.async_load()
+    entry.async_on_unload(pending_index.async_flush)
+
+    if not await _async_load_prefetched_payload(hass, url, api_client, coordinator):
+        await coordinator.async_config_entry_first_refresh()
+
+    # Registered before the platforms, so that the index is up to date when the entities read it.
+    pending_index.async_update(coordinator.data)
+    entry.async_on_unload(coordinator.async_add_listener(lambda: pending_index.async_update(coordinator.data)))
+
+    entry.runtime_data = CupComponentData(api_client, coordinator, pending_index)
+
+    # The card subscriptions (see websocket.py) follow the entry across reloads through this signal.
+    signal = SIGNAL_SNAPSHOT_UPDATED.format(entry.entry_id)
+    entry.async_on_unload(coordinator.async_add_listener(lambda: async_dispatcher_send(hass, signal)))
+    async_dispatcher_send(hass, signal)
+
+    if entry.data.get(CONF_PUSH_MODE, False):
+        entry.async_on_unload(async_setup_push(hass, entry))
+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    if "recorder" in hass.config.components:
+        # Imported on demand: the recorder statistics API pulls in SQLAlchemy.
+        long_term_statistics = await async_import_module(hass, f"{__name__}.long_term_statistics")
+        entry.async_on_unload(long_term_statistics.async_setup_statistics(hass, entry.entry_id, name, coordinator))
+
+    if hass.state == CoreState.running:
+        # Entry added or reloaded at runtime: register the card if it was not yet
+        # (e.g. after the integration was removed). No-op when already registered.
+        registrar = await _async_get_js_module_registration(hass)
+        await registrar.async_register()
+
+    return True
+
+
+def _get_update_interval(data: Mapping[str, Any]) -> timedelta:
+    """Return the polling interval configured in the config entry data.
+
+    Args:
+        data (Mapping[str, Any]): The config entry data.
+
+    Returns:
+        timedelta: The configured interval, or the default one if not set. In push mode,
+            at least ``PUSH_SAFETY_NET_INTERVAL``.
+
+    """
+
+    conf_update_interval: int | None = data.get(CONF_UPDATE_INTERVAL)
+    update_interval = (
+        DEFAULT_UPDATE_INTERVAL if conf_update_interval is None else timedelta(seconds=conf_update_interval)
+    )
+
+    if data.get(CONF_PUSH_MODE, False):
+        # Cup pushes its data: polling only catches the pushes that were missed.
+        return max(update_interval, PUSH_SAFETY_NET_INTERVAL)
+
+    return update_interval
+
+
+def _get_stale_max_age(data: Mapping[str, Any]) -> timedelta:
+    """Return how long the last good data may be served while refreshes fail.
+
+    Args:
+        data (Mapping[str, Any]): The config entry data.
+
+    Returns:
+        timedelta: The configured maximum age, or the default one if not set.
+
+    """
+
+    conf_stale_max_age: int | None = data.get(CONF_STALE_MAX_AGE)
+
+    if conf_stale_max_age is None:
+        return DEFAULT_STALE_MAX_AGE
+
+    return timedelta(seconds=conf_stale_max_age)
+
+
+def _get_memory_budget(data: Mapping[str, Any]) -> int:
+    """Return the memory the data of the Cup server may hold.
+
+    Args:
+        data (Mapping[str, Any]): The config entry data.
+
+    Returns:
+        int: The configured budget in bytes, 0 when there is no limit.
+
+    """
+
+    conf_memory_budget: int = data.get(CONF_MEMORY_BUDGET, DEFAULT_MEMORY_BUDGET)
+
+    return conf_memory_budget * 1024 * 1024
+
+
+async def async_apply_options(entry: CupComponentConfigEntry) -> None:
+    """Apply the options stored in the config entry data to a loaded entry, without reloading it.
+
+    The polling interval is updated on the running coordinator and the images are
+    re-categorised from the cached payload with the new exclusion patterns and
+    memory budget, so that no request is sent to the Cup server. Fields dropped
+    to fit a previous budget come back with the next payload. The maximum age of stale data is
+    read on each refresh. A change of address or of push mode still requires a reload.
+
+    Args:
+        entry (CupComponentConfigEntry): The loaded config entry.
+
+    Returns:
+        None.
+
+    """
+
+    cup_data = entry.runtime_data
+    coordinator = cup_data.coordinator
+
+    cup_data.api.memory_budget = _get_memory_budget(entry.data)
+    await cup_data.api.async_set_exclude_patterns(entry.data.get(CONF_EXCLUDE_PATTERNS, []))
+    coordinator.update_interval = cup_data.api.poll_interval = _get_update_interval(entry.data)
+
+    if coordinator.last_update_success:
+        # Notify the entities and reschedule the next poll with the new interval.
+        coordinator.async_set_updated_data(cup_data.api.snapshot)
+
+
+async def _async_load_prefetched_payload(
+    hass: HomeAssistant,
+    url: str,
+    api_client: CupApi,
+    coordinator: DataUpdateCoordinator[CupSnapshot],
+) -> bool:
+    """Seed the API client with the payload fetched by the config flow, if any.
+
+    Args:
+        hass (HomeAssistant): The Home Assistant instance.
+        url (str): The URL of the Cup server.
+        api_client (CupApi): The API client to seed.
+        coordinator (DataUpdateCoordinator[CupSnapshot]): The coordinator to mark as up to date.
+
+    Returns:
+        bool: True if a prefetched payload was used, False if a first refresh is still needed.
+
+    """
+
+    if (payload := async_pop_prefetched_payload(hass, url)) is None:
+        return False
+
+    try:
+        await api_client.async_load_payload(payload)
+    except ContentApiTypeError:
+        return False
+
+    _LOGGER.debug("Reusing the payload fetched by the config flow for %s", url)
+    coordinator.async_set_updated_data(api_client.snapshot)
     return True
 
 
@@ -161,21 +419,24 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
 
-async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:  # noqa: ARG001 # pylint: disable=unused-argument
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Remove Cup Component entry and clean up Lovelace resources.
 
     Called when the integration is permanently removed by the user.
-    Unregisters the Lovelace card resource from storage.
+    Deletes the pending updates index and the profile of the entry and
+    unregisters the Lovelace card resource from storage.
 
     Args:
         hass (HomeAssistant): The Home Assistant instance.
-        entry (ConfigEntry): The config entry being removed (unused).
+        entry (ConfigEntry): The config entry being removed.
 
     Returns:
         None.
 
     """
-    registrar = JSModuleRegistration(hass)
+    await async_remove_pending_index(hass, entry.entry_id)
+    await async_remove_profile(hass, entry.entry_id)
+    registrar = await _async_get_js_module_registration(hass)
     await registrar.async_unregister()
-    # Note: the static HTTP path (URL_BASE) cannot be deregistered at runtime —
+    # Note: the card HTTP view (URL_BASE) cannot be deregistered at runtime —
     # HA provides no public API for this. It remains active until the next HA restart.
@@ -1,19 +1,40 @@
 """Cup API client for retrieving summary data, managing image refresh, and handling HTTP communication with the Cup server."""
 
 import asyncio
-from datetime import datetime
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, replace
+from datetime import UTC, datetime, timedelta
+from email.utils import parsedate_to_datetime
 import logging
+import random
 import re
 from socket import gaierror
+import sys
+import time
 from typing import Any
+from urllib.parse import urlparse
+from urllib.request import url2pathname
 
-from aiohttp import ClientError, ClientResponse, ClientSession, ContentTypeError
+from aiohttp import ClientError, ClientResponse, ClientSession, ContentTypeError, UnixConnector, hdrs
 
+from .circuit_breaker import CircuitBreaker
+from .const import CARD_INFO_KEYS
+from .endpoint import CupEndpoint
 from .exceptions import (
+    BadGatewayError,
+    CircuitOpenError,
     ClientConnectorError,
     ContentApiTypeError,
+    GatewayTimeoutError,
+    MethodNotAllowedError,
+    ServerError,
+    ServiceUnavailableError,
+    TooManyRequestsError,
     handle_status,
 )
+from .exclusion import ExclusionMatcher, parse_rule
+from .file_source import CupFileSource, file_url_path, is_file_url
+from .snapshot import CupSnapshot, estimate_size, image_digest
 
 # Mapping from API version_update_type values to internal names
 _VERSION_UPDATE_TYPE_MAPPING: dict[str, str] = {
@@ -25,6 +46,108 @@ _VERSION_UPDATE_TYPE_MAPPING: dict[str, str] = {
     "up_to_date": "up_to_date",
 }
 
+# Fields of the image information kept in the compact records used above the memory budget:
+# those read by the categorisation and the pending updates, and those rendered by the card.
+_COMPACT_RESULT_INFO_KEYS: tuple[str, ...] = tuple(
+    dict.fromkeys(("type", "version_update_type", "new_tag", "local_digests", "remote_digest", *CARD_INFO_KEYS))
+)
+
+# Scheme of the addresses of Cup servers listening on a Unix domain socket (unix:///path/to/cup.sock).
+UNIX_SCHEME: str = "unix"
+
+# Base URL of the requests sent over a Unix domain socket: only the path and the Host header matter.
+_UNIX_BASE_URL: str = "http://localhost"
+
+# Inventories larger than this are categorised in the executor, to avoid stalling the event loop.
+_EXECUTOR_THRESHOLD: int = 2000
+
+# Number of images measured to extrapolate the size of a payload (see _estimate_memory).
+_MEMORY_SAMPLE_SIZE: int = 256
+
+# Answers worth retrying: the server is busy or temporarily unavailable.
+_RETRY_STATUSES: frozenset[int] = frozenset({429, 502, 503, 504})
+_RETRY_MAX_ATTEMPTS: int = 4
+_RETRY_BASE_DELAY: float = 1.0
+_RETRY_MAX_DELAY: float = 30.0
+
+# Time budget of a request, retries included.
+_REQUEST_DEADLINE: float = 60.0
+
+# Errors counted as failures of the server by the circuit breaker.
+_SERVER_FAILURES: tuple[type[Exception], ...] = (
+    BadGatewayError,
+    ClientConnectorError,
+    GatewayTimeoutError,
+    ServerError,
+    ServiceUnavailableError,
+    TooManyRequestsError,
+)
+
+
+def _is_valid_image(image: Any) -> bool:
+    """Check that an image of a payload holds the fields read by the categorisation, with their expected types.
+
+    Args:
+        image (Any): An item of the ``images`` list of a payload.
+
+    Returns:
+        bool: True if the image can be categorised.
+
+    """
+
+    if not isinstance(image, dict) or not isinstance(image.get("reference", ""), str):  # pyright: ignore[reportUnknownMemberType]
+        return False
+
+    result: Any = image.get("result")  # pyright: ignore[reportUnknownMemberType]
+
+    if not isinstance(result, dict) or result.get("has_update") not in (True, False, None):  # pyright: ignore[reportUnknownMemberType]
+        return False
+
+    info: Any = result.get("info")  # pyright: ignore[reportUnknownMemberType]
+
+    # Images with an update are bucketed by the update type held in their info object.
+    return isinstance(info, dict) or (info is None and result.get("has_update") is not True)  # pyright: ignore[reportUnknownMemberType]
+
+
+@dataclass(slots=True)
+class _CategoryEntry:
+    """The bucket and the digest memoised for an image (see ``CupApi._calculate_images``).
+
+    Attributes:
+        key (tuple[Any, ...]): The fields the bucket was derived from.
+        bucket (str): The bucket of the image.
+        image (dict[str, Any]): The image (or its compact record) the digest was computed from.
+        digest (str): The digest of the image (see ``image_digest``).
+
+    """
+
+    key: tuple[Any, ...]
+    bucket: str
+    image: dict[str, Any]
+    digest: str
+
+
+# Bucket and digest of each image of a payload, by reference (see _calculate_images).
+type _CategoryMemo = dict[str, _CategoryEntry]
+
+
+@dataclass(frozen=True, slots=True)
+class _Categorisation:
+    """The outcome of a categorisation, published on the event loop by ``CupApi._async_recalculate``.
+
+    Attributes:
+        snapshot (CupSnapshot): The new snapshot, without timestamps.
+        data (dict[str, Any]): The payload to keep, compacted or not.
+        categories (_CategoryMemo): The buckets and digests memoised for the payload.
+        hits (int): The number of images whose bucket was memoised by the previous categorisation.
+
+    """
+
+    snapshot: CupSnapshot
+    data: dict[str, Any]
+    categories: _CategoryMemo
+    hits: int
+
 
 class CupApi:
     """Cup API Client."""
@@ -33,32 +156,71 @@ class CupApi:
     _session: ClientSession
     _prefix: str = "/api/v3"
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         session: ClientSession,
         url: str,
         logger: logging.Logger | None = None,
         exclude_patterns: list[str] | None = None,
+        executor_job: Callable[..., Awaitable[Any]] | None = None,
+        memory_budget: int = 0,
+        endpoint: CupEndpoint | None = None,
     ) -> None:
         """Initialize Cup API Client object with an API URL and an optional logger.
 
         Args:
             session (ClientSession): The aiohttp client session used to perform HTTP requests.
-            url (str): Represents the URL of API endpoint.
+            url (str): Represents the URL of API endpoint, a ``unix://`` URL of the socket Cup listens on,
+                or a ``file://`` URL of the JSON output written by Cup.
             logger (logging.Logger | None): Expects an object of type `logging.Logger` or `None` which will be used to display debug message.
-            exclude_patterns (list[str] | None): Optional list of exact names or regex patterns to exclude images from metrics.
+            exclude_patterns (list[str] | None): Optional list of exclusion rules (names, regex, globs or structured rules, see ``exclusion.py``).
+            executor_job (Callable[..., Awaitable[Any]] | None): Optional function running a job in an executor
+                (e.g. ``hass.async_add_executor_job``), used to categorise large inventories off the event loop.
+            memory_budget (int): Memory the payload and the snapshot may hold, in bytes (0 disables the limit).
+                Above it, images are reduced to compact records.
+            endpoint (CupEndpoint | None): Optional endpoint shared with the other entries using the same Cup server,
+                through which the ``/json`` payload is requested (see ``endpoint.py``).
 
         """
 
         self.url: str = url
         self._logger = logger
         self._session = session
-        # Deduplicate patterns while preserving order
-        self._exclude_patterns: list[str] = list(dict.fromkeys(exclude_patterns or []))
 
-        self.cache_metrics: dict[str, Any] = {}
-        self.cache_images: dict[str, list[Any]] = {}
-        self.cache_last_checked: datetime | None = None
+        # Set when the address is a unix:// URL: requests go through a session of their own bound to the socket.
+        parsed_url = urlparse(url)
+        self._socket_path: str | None = url2pathname(parsed_url.path) if parsed_url.scheme == UNIX_SCHEME else None
+        self._unix_session: ClientSession | None = None
+
+        # Set when the address is a file:// URL: the payload is read from a local file instead of HTTP.
+        self._file_source: CupFileSource | None = CupFileSource(file_url_path(url)) if is_file_url(url) else None
+        self._exclude_matcher: ExclusionMatcher = ExclusionMatcher([])
+        self._compile_exclude_patterns(exclude_patterns or [])
+
+        self._circuit_breaker: CircuitBreaker = CircuitBreaker()
+        self._executor_job = executor_job
+        self._categorisation_sequence: int = 0
+        self.memory_budget: int = memory_budget
+        self.endpoint: CupEndpoint | None = endpoint
+
+        # Polling interval of the entry: a payload fetched by another entry within it may be reused.
+        self.poll_interval: timedelta | None = None
+
+        # Timings of the last categorisation (see _async_recalculate).
+        self.instrumentation: dict[str, Any] = {}
+
+        # Timings of the last request: network (including retries) and JSON decoding (see _call).
+        self.request_timings: dict[str, Any] = {}
+
+        # Last raw payload, kept to re-categorise images without a network round trip.
+        self._raw_data: dict[str, Any] | None = None
+
+        # Bucket and digest of each image of the last payload, by reference, with the matcher used
+        # (see _calculate_images). Replaced as a whole, on the event loop, by each categorisation published.
+        self._categories: tuple[ExclusionMatcher | None, _CategoryMemo] = (None, {})
+
+        # Current data, replaced as a whole each time new content is categorised.
+        self.snapshot: CupSnapshot = CupSnapshot()
 
     def _get_logger(self) -> logging.Logger:
         """Return a logger if it exists, otherwise it creates a new logger.
@@ -73,13 +235,14 @@ class CupApi:
 
         return self._logger
 
-    async def _call(
+    async def _call(  # noqa: PLR0913
         self,
         route: str,
         method: str,
         data: dict[str, Any] | None = None,
-        req_timeout: int = 10,
+        req_timeout: float = 10,
         parse_response: bool = True,
+        retry: bool = True,
     ) -> dict[str, Any]:
         """Send HTTP requests with specified method, route, and data.
 
@@ -87,29 +250,62 @@ class CupApi:
             route (str): Represents the specific endpoint that you want to call.
             method (str): Represents the HTTP method to be used. It can be one of the following: "post", "delete", "get", etc.
             data (dict[str, Any] | None): Used to pass a dictionary containing data to be sent in the request when making a POST request.
-            req_timeout (int): The duration controlling the request timeout.
+            req_timeout (float): The duration controlling the request timeout.
             parse_response (bool): Whether to parse the JSON response body. Set to False when no response body is expected.
+            retry (bool): Whether to retry connection errors and 429/502/503/504 answers. Retries use an
+                exponential backoff with jitter (or the Retry-After header) within a ``_REQUEST_DEADLINE`` budget.
 
         Returns:
-            dict[str, Any]: A dictionary is being returned with keys "code", "reason", and "data".
+            dict[str, Any]: A dictionary is being returned with keys "code", "reason", "content_type" and "data".
 
         """
 
-        url: str = self._clean_url(f"{self.url}{self._prefix}{route}")
+        # The path of a socket is not part of the request URL (and must not lose its slashes in _clean_url).
+        base_url: str = _UNIX_BASE_URL if self._socket_path is not None else self.url
+        url: str = self._clean_url(f"{base_url}{self._prefix}{route}")
 
         headers: dict[str, str] = {
             "accept": "application/json",
             "content-type": "application/json",
         }
 
-        self._get_logger().debug("Request (%s): %s %s", route, method.upper(), url)
+        loop = asyncio.get_running_loop()
+        deadline_at: float = loop.time() + _REQUEST_DEADLINE
+        attempt: int = 0
+        started: float = time.perf_counter()
 
-        try:
-            request: ClientResponse = await self._dispatch_request(url, method, data, headers, req_timeout)
-        except (TimeoutError, ClientError, gaierror) as err:
-            raise ClientConnectorError from err
+        while True:
+            attempt += 1
+            remaining: float = deadline_at - loop.time()
+
+            self._get_logger().debug("Request (%s): %s %s (attempt %d)", route, method.upper(), url, attempt)
+
+            try:
+                request: ClientResponse = await self._dispatch_request(
+                    url, method, data, headers, min(req_timeout, remaining)
+                )
+            except (TimeoutError, ClientError, gaierror) as err:
+                delay = self._get_retry_delay(attempt, None)
+                if not retry or attempt >= _RETRY_MAX_ATTEMPTS or delay >= deadline_at - loop.time():
+                    raise ClientConnectorError from err
+                self._get_logger().debug("Request (%s) failed (%s), retrying in %.1fs", route, err, delay)
+                await asyncio.sleep(delay)
+                continue
+
+            if retry and request.status in _RETRY_STATUSES and attempt < _RETRY_MAX_ATTEMPTS:
+                delay = self._get_retry_delay(attempt, request.headers.get(hdrs.RETRY_AFTER))
+                if delay < deadline_at - loop.time():
+                    self._get_logger().debug(
+                        "Request (%s) answered %d, retrying in %.1fs", route, request.status, delay
+                    )
+                    request.release()
+                    await asyncio.sleep(delay)
+                    continue
+
+            break
 
         result_data: dict[str, Any] = {}
+        decode_ms: float = 0.0
 
         self._get_logger().debug("Status Code: %d", request.status)
         handle_status(request.status)
@@ -117,33 +313,72 @@ class CupApi:
         if request.status < 400 and request.content_length != 0 and request.content_length is not None:
             try:
                 if request.status != 204 and parse_response:
+                    # The body is read first, so that the time spent decoding it is measured apart.
+                    await request.read()
+                    decode_start = time.perf_counter()
                     result_data = await request.json()
+                    decode_ms = (time.perf_counter() - decode_start) * 1000
 
             except ContentTypeError as err:
                 raise ContentApiTypeError from err
 
+        self.request_timings = {
+            "route": route,
+            "attempts": attempt,
+            "network_ms": round((time.perf_counter() - started) * 1000 - decode_ms, 3),
+            "decode_ms": round(decode_ms, 3),
+        }
+
         return {
             "code": request.status,
             "reason": request.reason,
+            "content_type": request.content_type,
             "data": result_data,
         }
 
+    @staticmethod
+    def _get_retry_delay(attempt: int, retry_after: str | None) -> float:
+        """Compute how long to wait before retrying a request.
+
+        The Retry-After header (in seconds or as an HTTP date) is honoured when
+        present. Otherwise an exponential backoff with full jitter is used, so that
+        several clients do not retry against a busy server at the same time.
+
+        Args:
+            attempt (int): The number of the attempt that just failed (starting at 1).
+            retry_after (str | None): The value of the Retry-After header, if any.
+
+        Returns:
+            float: The delay in seconds.
+
+        """
+
+        if retry_after:
+            if retry_after.strip().isdigit():
+                return float(retry_after)
+            try:
+                return max(0.0, (parsedate_to_datetime(retry_after) - datetime.now(UTC)).total_seconds())
+            except (TypeError, ValueError):
+                pass
+
+        return random.uniform(0, min(_RETRY_MAX_DELAY, _RETRY_BASE_DELAY * 2 ** (attempt - 1)))  # noqa: S311
+
     async def _dispatch_request(
         self,
         url: str,
         method: str,
         data: dict[str, Any] | None,
         headers: dict[str, str],
-        req_timeout: int,
+        req_timeout: float,
     ) -> ClientResponse:
         """Dispatch an HTTP request using the appropriate aiohttp method.
 
         Args:
             url (str): The full URL to send the request to.
-            method (str): The HTTP method to use (get, post, put, delete).
+            method (str): The HTTP method to use (get, head, post, put, delete).
             data (dict[str, Any] | None): Optional payload for POST or PUT requests.
             headers (dict[str, str]): HTTP headers to include in the request.
-            req_timeout (int): Timeout duration in seconds.
+            req_timeout (float): Timeout duration in seconds.
 
         Returns:
             ClientResponse: The aiohttp response object.
@@ -154,102 +389,725 @@ class CupApi:
         """
 
         method = method.lower()
+        session = self._get_session()
 
         async with asyncio.timeout(req_timeout):
             if method == "post":
-                return await self._session.post(url, json=data, headers=headers)
+                return await session.post(url, json=data, headers=headers)
             if method == "put":
-                return await self._session.put(url, json=data, headers=headers)
+                return await session.put(url, json=data, headers=headers)
             if method == "delete":
-                return await self._session.delete(url, headers=headers)
+                return await session.delete(url, headers=headers)
             if method == "get":
-                return await self._session.get(url, headers=headers)
+                return await session.get(url, headers=headers)
+            if method == "head":
+                return await session.head(url, headers=headers)
 
             msg: str = "Method is not supported/implemented."
             raise RuntimeError(msg)
 
+    def _get_session(self) -> ClientSession:
+        """Return the session used to send the requests.
+
+        Servers listening on a Unix domain socket get a session of their own,
+        created on first use and closed by ``async_close``.
+
+        Returns:
+            ClientSession: The session.
+
+        """
+
+        if self._socket_path is None:
+            return self._session
+
+        if self._unix_session is None or self._unix_session.closed:
+            self._unix_session = ClientSession(connector=UnixConnector(path=self._socket_path))
+
+        return self._unix_session
+
+    async def async_close(self) -> None:
+        """Close the session created for a Unix domain socket, if any.
+
+        Returns:
+            None.
+
+        """
+
+        if self._unix_session is not None:
+            await self._unix_session.close()
+            self._unix_session = None
+
     async def refresh(self) -> dict[str, Any]:
         """Refresh image information from Cup Server.
 
+        No-op for a file source.
+
         Returns:
             dict[str, Any]: A dictionary with the keys "code", "reason", and "data".
 
         """
 
+        if self._file_source is not None:
+            # Cup rewrites the file on its own schedule: there is no server to ask, the file is read at the next poll.
+            return {"code": 200, "reason": "OK", "data": {}}
+
         url: str = "/refresh"
 
         result: dict[str, Any] = await self._call(url, method="GET", parse_response=False)
 
+        # The Cup server checks the images again: payloads fetched before are outdated.
+        self.invalidate_shared_payload()
+
+        return {
+            "code": result["code"],
+            "reason": result["reason"],
+            "data": result["data"],
+        }
+
+    async def probe(self, req_timeout: int = 5) -> dict[str, Any]:
+        """Check that the Cup server answers on its JSON endpoint without downloading the inventory.
+
+        A HEAD request is sent first. Servers rejecting HEAD (405) are probed with a
+        GET instead: the payload is then validated and returned, so that the caller
+        can hand it over to ``async_load_payload`` instead of fetching it again.
+        A file source is read and validated the same way.
+
+        Args:
+            req_timeout (int): The duration controlling the request timeout.
+
+        Returns:
+            dict[str, Any]: A dictionary with the keys "code", "reason", and "data" ("data" is empty after a HEAD probe).
+
+        Raises:
+            ClientConnectorError: If the file of a file source cannot be read.
+            ContentApiTypeError: If the endpoint does not serve JSON or the payload is invalid.
+
+        """
+
+        if self._file_source is not None:
+            data = await self._async_run_blocking(self._file_source.read)
+            self._parse_last_updated(data)
+            return {"code": 200, "reason": "OK", "data": data}
+
+        url: str = "/json"
+
+        try:
+            result: dict[str, Any] = await self._call(
+                url, method="HEAD", req_timeout=req_timeout, parse_response=False, retry=False
+            )
+        except MethodNotAllowedError:
+            self._get_logger().debug("HEAD not supported by %s, probing with GET.", self.url)
+            result = await self._call(url, method="GET", req_timeout=req_timeout, retry=False)
+            self._parse_last_updated(result["data"])
+        else:
+            if result["content_type"] != "application/json":
+                msg: str = f"Unexpected content type '{result['content_type']}' returned by the API."
+                raise ContentApiTypeError(msg)
+
         return {
             "code": result["code"],
             "reason": result["reason"],
             "data": result["data"],
         }
 
-    async def call_get_all_data(self) -> dict[str, Any]:
+    async def call_get_all_data(self, *, use_shared: bool = True) -> dict[str, Any]:
         """Retrieve metrics from Cup Server.
 
+        A circuit breaker protects a failing server: after several consecutive
+        failures, calls are refused for a while, then the server is probed
+        cheaply (see ``probe``) before the full payload is requested again.
+
+        A file source is decoded only when the file changed (see ``_async_get_file_data``).
+
+        Args:
+            use_shared (bool): Whether a payload recently fetched for another entry using the same
+                Cup server may be reused. The payload fetched for this entry is never reused, and
+                concurrent requests are merged in any case.
+
         Returns:
             dict[str, Any]: A dictionary with the keys "code", "reason", and "data".
 
         Raises:
+            CircuitOpenError: If polling of the server is currently suspended.
             ContentApiTypeError: If the 'last_updated' field is missing from the API response.
 
         """
 
+        if self._file_source is not None:
+            return await self._async_get_file_data(self._file_source)
+
         url: str = "/json"
 
-        result: dict[str, Any] = await self._call(url, method="GET")
+        if self._circuit_breaker.is_open:
+            msg: str = f"The Cup server keeps failing, polling is suspended for {int(self._circuit_breaker.retry_in)}s."
+            raise CircuitOpenError(msg)
 
-        last_updated = result["data"].get("last_updated")
+        try:
+            result: dict[str, Any] = {"data": {}}
+            if self._circuit_breaker.is_half_open:
+                self._get_logger().debug("Probing %s before resuming polling.", self.url)
+                result = await self.probe()
+            if not result["data"]:
+                result = await self._async_get_json(url, use_shared=use_shared)
+        except _SERVER_FAILURES:
+            self._circuit_breaker.record_failure()
+            raise
+
+        self._circuit_breaker.record_success()
+        await self.async_load_payload(result["data"])
 
-        if last_updated is None:
-            msg: str = "Missing 'last_updated' field in API response."
-            raise ContentApiTypeError(msg)
+        return {
+            "code": result["code"],
+            "reason": result["reason"],
+            "data": result["data"],
+        }
+
+    async def _async_get_json(self, url: str, *, use_shared: bool) -> dict[str, Any]:
+        """Request the payload, through the shared endpoint if there is one.
+
+        Args:
+            url (str): The route of the payload.
+            use_shared (bool): Whether a recent payload of the shared endpoint may be reused.
+
+        Returns:
+            dict[str, Any]: A dictionary with the keys "code", "reason", "content_type" and "data".
+
+        """
+
+        if self.endpoint is None:
+            return await self._call(url, method="GET")
+
+        return await self.endpoint.async_fetch(
+            lambda: self._call(url, method="GET"),
+            self.poll_interval if use_shared else None,
+            self,
+        )
+
+    def invalidate_shared_payload(self) -> None:
+        """Prevent the entries sharing the Cup server from reusing the payload fetched last.
+
+        Returns:
+            None.
+
+        """
+
+        if self.endpoint is not None:
+            self.endpoint.invalidate()
+
+    async def _async_get_file_data(self, source: CupFileSource) -> dict[str, Any]:
+        """Read the payload of a file source and publish a new snapshot if the file changed.
+
+        When the file did not change, the current snapshot is kept (its reception
+        time is renewed, since its content was confirmed) and no categorisation runs.
+
+        Args:
+            source (CupFileSource): The file source.
+
+        Returns:
+            dict[str, Any]: A dictionary with the keys "code", "reason", and "data" ("data" is empty if the file did not change).
+
+        Raises:
+            ClientConnectorError: If the file cannot be read.
+            ContentApiTypeError: If the file does not hold a valid Cup payload.
+
+        """
+
+        started: float = time.perf_counter()
+        data = await self._async_run_blocking(source.read_if_changed)
+
+        self.request_timings = {
+            "route": source.path,
+            "attempts": 1,
+            "network_ms": 0.0,
+            "decode_ms": round((time.perf_counter() - started) * 1000, 3),
+        }
+
+        if data is None:
+            if self._raw_data is not None:
+                self.snapshot = replace(self.snapshot, fetched_at=datetime.now(UTC), stale=False)
+            return {"code": 304, "reason": "Not Modified", "data": {}}
+
+        try:
+            await self.async_load_payload(data)
+        except ContentApiTypeError:
+            # Decode the file again at the next poll, even if it is not rewritten meanwhile.
+            source.invalidate()
+            raise
+
+        return {"code": 200, "reason": "OK", "data": data}
+
+    async def _async_run_blocking[T](self, func: Callable[[], T]) -> T:
+        """Run a blocking function in the executor.
+
+        Args:
+            func (Callable[[], T]): The function to run.
+
+        Returns:
+            T: The result of the function.
+
+        """
+
+        if self._executor_job is not None:
+            return await self._executor_job(func)
+
+        return await asyncio.to_thread(func)
+
+    async def async_load_payload(self, data: dict[str, Any]) -> None:
+        """Categorise a raw Cup payload and publish a new snapshot.
+
+        Used by ``call_get_all_data`` and to reuse a payload already fetched
+        elsewhere (e.g. during the config flow connection test).
+
+        Args:
+            data (dict[str, Any]): The raw payload returned by the Cup ``/json`` endpoint.
+
+        Returns:
+            None.
+
+        Raises:
+            ContentApiTypeError: If the payload is malformed (see ``_validate_payload``).
+
+        """
+
+        # Validated before it is cached: the options preview, the diagnostics and new exclusion patterns reuse it.
+        last_checked = self._validate_payload(data)
+        self._raw_data = data
+        await self._async_recalculate(last_checked, datetime.now(UTC), stale=False)
+
+    @property
+    def stale(self) -> bool:
+        """Return True while the current snapshot is served despite failed refreshes."""
+        return self.snapshot.stale
+
+    def mark_stale(self) -> None:
+        """Flag the current snapshot as served despite a failed refresh.
+
+        Returns:
+            None.
+
+        """
+
+        self.snapshot = self.snapshot.with_stale(stale=True)
+
+    @property
+    def data_age(self) -> timedelta | None:
+        """Return the time elapsed since the last payload was received.
+
+        Returns:
+            timedelta | None: The age of the cached data, or None if nothing was received yet.
+
+        """
 
-        self.cache_last_checked = datetime.fromisoformat(last_updated)
+        if self.snapshot.fetched_at is None:
+            return None
+
+        return datetime.now(UTC) - self.snapshot.fetched_at
+
+    def can_serve_stale(self, max_age: timedelta) -> bool:
+        """Check whether the cached data may still be served after a failed refresh.
+
+        Args:
+            max_age (timedelta): The maximum age of the data that may be served (0 disables it).
+
+        Returns:
+            bool: True if the caches hold data younger than ``max_age``.
+
+        """
+
+        age = self.data_age
+        return age is not None and age < max_age
+
+    async def async_set_exclude_patterns(self, exclude_patterns: list[str]) -> None:
+        """Replace the exclusion patterns and re-categorise the cached payload.
+
+        No request is sent to the Cup server: the last payload received is reused.
+
+        Args:
+            exclude_patterns (list[str]): The new list of exclusion rules.
+
+        Returns:
+            None.
+
+        """
+
+        self._compile_exclude_patterns(exclude_patterns)
+        await self._async_recalculate(self.snapshot.last_checked, self.snapshot.fetched_at, stale=self.snapshot.stale)
+
+    async def _async_recalculate(
+        self,
+        last_checked: datetime | None,
+        fetched_at: datetime | None,
+        stale: bool,
+    ) -> None:
+        """Build a new snapshot from the cached raw payload and publish it.
+
+        Inventories larger than ``_EXECUTOR_THRESHOLD`` images are categorised in
+        the executor (when one was provided), so that the event loop is not
+        stalled. The payload and the matcher are not mutated meanwhile, and the
+        snapshot is swapped in at once, unless a newer categorisation started in
+        the meantime. Timings are recorded in ``instrumentation``.
+
+        No-op until a first payload has been received.
+
+        Args:
+            last_checked (datetime | None): Time of the last check performed by the Cup server.
+            fetched_at (datetime | None): Time the payload was received.
+            stale (bool): Whether the payload is served despite failed refreshes.
+
+        Returns:
+            None.
+
+        """
+
+        if self._raw_data is None:
+            return
+
+        data = self._raw_data
+        matcher = self._exclude_matcher
+        self._categorisation_sequence += 1
+        sequence = self._categorisation_sequence
+        previous_matcher, previous_categories = self._categories
+        cached = previous_categories if previous_matcher is matcher else {}
+        compact = self.snapshot.over_budget
+        image_count = len(data.get("images", []))
+        offloaded = self._executor_job is not None and image_count > _EXECUTOR_THRESHOLD
+
+        start = time.perf_counter()
+
+        if self._executor_job is not None and offloaded:
+            result = await self._executor_job(
+                self._categorise, data, matcher, cached, sequence, self.memory_budget, compact
+            )
+            categorisation_ms = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+        else:
+            result = self._categorise(data, matcher, cached, sequence, self.memory_budget, compact)
+            categorisation_ms = (time.perf_counter() - start) * 1000
+
+        if sequence != self._categorisation_sequence:
+            # Outdated: a newer payload or new patterns were categorised meanwhile.
+            return
+
+        if result is None:
+            # Unexpected format: keep the previous content with the new timestamps.
+            snapshot = self.snapshot
+            hits = 0
+        else:
+            snapshot, self._raw_data, hits = result.snapshot, result.data, result.hits
+            self._categories = (matcher, result.categories)
+            if snapshot.fingerprint == self.snapshot.fingerprint:
+                # Same content: keep the generation, so that consumers see nothing new.
+                snapshot = replace(snapshot, generation=self.snapshot.generation)
+
+        self.snapshot = replace(snapshot, last_checked=last_checked, fetched_at=fetched_at, stale=stale)
+
+        self.instrumentation = {
+            "images": image_count,
+            "offloaded": offloaded,
+            "categorisation_ms": round(categorisation_ms, 3),
+            "loop_blocking_ms": round((time.perf_counter() - start) * 1000, 3),
+            "memoised_images": hits,
+        }
+
+    def _categorise(  # noqa: PLR0913
+        self,
+        data: dict[str, Any],
+        matcher: ExclusionMatcher,
+        cached: _CategoryMemo,
+        generation: int,
+        memory_budget: int,
+        compact: bool,
+    ) -> _Categorisation | None:
+        """Categorise the images of a payload and build a snapshot, without publishing it.
+
+        When the payload and the snapshot exceed the memory budget, the images are
+        reduced to compact records (see ``_compact_payload``). A payload following
+        one over the budget is compacted first, so that the digests memoised for
+        the compact records are reused, and categorised in full again only when
+        it fits in the budget. Either way, the second pass finds every bucket in
+        the memo of the first one.
+
+        This method may run in the executor: it does not mutate the client nor its
+        arguments, the memoised buckets are returned with the snapshot and only
+        kept by ``_async_recalculate`` if the categorisation is still current.
+
+        Args:
+            data (dict[str, Any]): The raw payload returned by the Cup API.
+            matcher (ExclusionMatcher): The compiled exclusion rules.
+            cached (_CategoryMemo): The buckets and digests memoised by the previous categorisation with the same
+                matcher.
+            generation (int): The generation number of the snapshot.
+            memory_budget (int): The memory budget, in bytes (0 disables it).
+            compact (bool): Whether the previous payload exceeded the memory budget.
+
+        Returns:
+            _Categorisation | None: The new snapshot (without timestamps), the payload to keep (compacted
+                or not) and the memoised buckets, or None if the payload has an unexpected format.
+
+        """
+
+        payload = self._compact_payload(data) if compact else data
+        built = self._build_snapshot(payload, matcher, cached, generation)
+
+        if built is None:
+            return None
+
+        snapshot, categories, hits = built
+
+        # The containers of a snapshot only reference the images: their size does not depend on the compaction.
+        over_budget = bool(memory_budget) and self._estimate_memory(data, snapshot, categories) > memory_budget
+
+        if over_budget != compact:
+            other = self._compact_payload(data) if over_budget else data
+            rebuilt = self._build_snapshot(other, matcher, categories, generation)
+            if rebuilt is None:
+                over_budget = compact
+            else:
+                payload, snapshot, categories = other, rebuilt[0], rebuilt[1]
+
+        memory_bytes = self._estimate_memory(payload, snapshot, categories)
+        return _Categorisation(
+            replace(snapshot, memory_bytes=memory_bytes, over_budget=over_budget), payload, categories, hits
+        )
+
+    def _build_snapshot(
+        self,
+        data: dict[str, Any],
+        matcher: ExclusionMatcher,
+        cached: _CategoryMemo,
+        generation: int,
+    ) -> tuple[CupSnapshot, _CategoryMemo, int] | None:
+        """Categorise the images of a payload into a snapshot.
+
+        Args:
+            data (dict[str, Any]): The raw payload returned by the Cup API.
+            matcher (ExclusionMatcher): The compiled exclusion rules.
+            cached (_CategoryMemo): The buckets and digests memoised by the previous categorisation with the same
+                matcher.
+            generation (int): The generation number of the snapshot.
+
+        Returns:
+            tuple[CupSnapshot, _CategoryMemo, int] | None: The snapshot (without timestamps), the memoised
+                buckets and digests and the number of images found in ``cached``, or None if the payload has an
+                unexpected format.
+
+        """
 
         try:
-            self._calculate_images(result["data"])
+            images, digests, categories, hits = self._calculate_images(data, matcher, cached)
         except KeyError:  # ai: ignore
-            if self._logger is not None:
-                self._logger.exception("Incorrect output format for _calculate_images().")
+            self._get_logger().exception("Incorrect output format for _calculate_images().")
+            return None
 
         try:
-            self._calculate_metrics()
+            metrics = self._calculate_metrics(images)
         except KeyError:  # ai: ignore
-            if self._logger is not None:
-                self._logger.exception("Incorrect output format for _calculate_metrics().")
+            self._get_logger().exception("Incorrect output format for _calculate_metrics().")
+            return None
 
-        return {
-            "code": result["code"],
-            "reason": result["reason"],
-            "data": result["data"],
-        }
+        snapshot = CupSnapshot.build(
+            images, metrics, generation, last_checked=None, fetched_at=None, image_digests=digests
+        )
+        return snapshot, categories, hits
 
-    def _is_image_excluded(self, image_name: str) -> bool:
-        """Check whether an image name matches any of the configured exclusion patterns.
+    @staticmethod
+    def _estimate_memory(data: dict[str, Any], snapshot: CupSnapshot, categories: _CategoryMemo) -> int:
+        """Estimate the memory held by a payload, the snapshot built from it and the memoised buckets.
 
-        Each pattern is first tried as a regex. If the pattern is not a valid
-        regex, it is compared as a plain string.
+        Walking every image would cost more than categorising them: the size of the
+        images is extrapolated from an evenly spread sample of ``_MEMORY_SAMPLE_SIZE``
+        of them, and the containers of the snapshot, which only reference the images
+        of the payload, are measured without being walked. The memoised entries are
+        measured from one of them: they only reference the images and their fields.
 
         Args:
-            image_name (str): The full image name including tag (e.g. ``nginx:latest``).
+            data (dict[str, Any]): The raw payload.
+            snapshot (CupSnapshot): The snapshot built from the payload.
+            categories (_CategoryMemo): The buckets and digests memoised for the payload.
 
         Returns:
-            bool: True if the image should be excluded, False otherwise.
+            int: The estimated size, in bytes. Images shared by both are counted once.
+
+        """
+
+        images: list[Any] = data.get("images", [])
+        sample = images[:: max(len(images) // _MEMORY_SAMPLE_SIZE, 1)]
+        images_bytes = estimate_size(*sample) * len(images) // len(sample) if sample else 0
+
+        containers: list[Any] = [data, images, *snapshot.images.values(), *snapshot.views.values()]
+        # Copied to measure the dictionaries behind the read-only mappings.
+        containers.extend(dict(mapping) for mapping in (snapshot.metrics, snapshot.references, snapshot.digests))
+
+        categories_bytes = sys.getsizeof(categories)
+        if categories:
+            entry = next(iter(categories.values()))
+            entry_bytes = sys.getsizeof(entry) + sys.getsizeof(entry.key) + sys.getsizeof(entry.digest)
+            categories_bytes += entry_bytes * len(categories)
+
+        return images_bytes + categories_bytes + sum(sys.getsizeof(container) for container in containers)
+
+    @staticmethod
+    def _compact_payload(data: dict[str, Any]) -> dict[str, Any]:
+        """Return a copy of a payload whose images only keep the fields the integration uses.
+
+        The reference, the URL, the update status and the fields of
+        ``_COMPACT_RESULT_INFO_KEYS`` are kept; everything else (parts, timings,
+        server, errors...) is dropped.
+
+        Args:
+            data (dict[str, Any]): The raw payload returned by the Cup API.
+
+        Returns:
+            dict[str, Any]: The compacted payload.
+
+        """
+
+        images: list[dict[str, Any]] = []
+
+        for image in data.get("images", []):
+            result: dict[str, Any] = image.get("result") or {}
+            info: dict[str, Any] = result.get("info") or {}
+            images.append(
+                {
+                    "reference": image.get("reference", ""),
+                    "url": image.get("url"),
+                    "result": {
+                        "has_update": result.get("has_update"),
+                        "info": {key: info[key] for key in _COMPACT_RESULT_INFO_KEYS if key in info},
+                    },
+                }
+            )
+
+        return {"last_updated": data.get("last_updated"), "images": images}
+
+    @staticmethod
+    def _parse_last_updated(data: dict[str, Any]) -> datetime:
+        """Extract the 'last_updated' timestamp from a raw Cup payload.
+
+        Args:
+            data (dict[str, Any]): The raw payload returned by the Cup ``/json`` endpoint.
+
+        Returns:
+            datetime: The time of the last check performed by the Cup server.
+
+        Raises:
+            ContentApiTypeError: If the 'last_updated' field is missing from the payload.
 
         """
 
-        for pattern in self._exclude_patterns:
+        last_updated = data.get("last_updated")
+
+        if last_updated is None:
+            msg: str = "Missing 'last_updated' field in API response."
+            raise ContentApiTypeError(msg)
+
+        try:
+            return datetime.fromisoformat(last_updated)
+        except (TypeError, ValueError) as err:
+            msg = f"Invalid 'last_updated' field in API response: {last_updated!r}."
+            raise ContentApiTypeError(msg) from err
+
+    @classmethod
+    def _validate_payload(cls, data: dict[str, Any]) -> datetime:
+        """Check that a raw Cup payload has the shape the categorisation expects.
+
+        Payloads may come from the network (e.g. the push webhook): they are checked
+        before being cached, so that a malformed one is rejected as a whole.
+
+        Args:
+            data (dict[str, Any]): The raw payload returned by the Cup ``/json`` endpoint.
+
+        Returns:
+            datetime: The time of the last check performed by the Cup server.
+
+        Raises:
+            ContentApiTypeError: If the 'last_updated' field is missing or invalid, or if the
+                'images' field is not a list of image objects.
+
+        """
+
+        last_checked = cls._parse_last_updated(data)
+        images = data.get("images")
+
+        if not isinstance(images, list) or not all(_is_valid_image(image) for image in images):  # pyright: ignore[reportUnknownVariableType]
+            msg: str = "Invalid 'images' field in API response."
+            raise ContentApiTypeError(msg)
+
+        return last_checked
+
+    def preview_exclude_patterns(self, exclude_patterns: list[str]) -> dict[str, Any]:
+        """Evaluate exclusion patterns against the cached payload without applying them.
+
+        Nothing is sent to the Cup server and the caches are left untouched. For each
+        pattern, the number of images it matches and the time spent matching it are
+        reported, so that expensive patterns can be spotted before saving them.
+
+        Args:
+            exclude_patterns (list[str]): The list of exclusion rules to evaluate.
+
+        Returns:
+            dict[str, Any]: A dictionary with the keys "images" (number of images evaluated,
+                or None if no payload was received yet), "excluded" (number of images that
+                would be excluded) and "patterns" (one entry per pattern with the keys
+                "pattern", "valid", "matches" and "duration_ms").
+
+        """
+
+        if self._raw_data is None:
+            return {"images": None, "excluded": 0, "patterns": []}
+
+        references: list[str] = [image.get("reference", "") for image in self._raw_data.get("images", [])]
+        patterns: list[dict[str, Any]] = []
+
+        for pattern in dict.fromkeys(exclude_patterns):
             try:
-                if re.fullmatch(pattern, image_name):
-                    return True
-            except re.error:
-                # Invalid regex pattern: log a warning and skip it
-                self._get_logger().warning("Invalid regex pattern '%s', ignoring it.", pattern)
+                rule = parse_rule(pattern)
+            except ValueError:
+                patterns.append({"pattern": pattern, "valid": False, "matches": 0, "duration_ms": 0.0})
+                continue
 
-        return False
+            start = time.perf_counter()
+            matches = sum(1 for reference in references if rule.matches(reference))
+            duration_ms = (time.perf_counter() - start) * 1000
+
+            patterns.append({"pattern": pattern, "valid": True, "matches": matches, "duration_ms": duration_ms})
+
+        # Combined effect, include rules taking precedence over exclude rules
+        matcher = ExclusionMatcher(exclude_patterns)
+        excluded = sum(1 for reference in references if matcher.is_excluded(reference))
+
+        return {"images": len(references), "excluded": excluded, "patterns": patterns}
+
+    def _compile_exclude_patterns(self, exclude_patterns: list[str]) -> None:
+        """Compile the exclusion patterns once, instead of on every image check.
+
+        Invalid patterns are logged once and ignored.
+
+        Args:
+            exclude_patterns (list[str]): The list of exclusion rules (see ``exclusion.py`` for the syntax).
+
+        Returns:
+            None.
+
+        """
+
+        self._exclude_matcher = ExclusionMatcher(exclude_patterns)
+
+        for pattern in self._exclude_matcher.invalid_patterns:
+            self._get_logger().warning("Invalid exclusion pattern '%s', ignoring it.", pattern)
+
+    def _is_image_excluded(self, image_name: str) -> bool:
+        """Check whether an image name matches the configured exclusion rules.
+
+        Args:
+            image_name (str): The full image name including tag (e.g. ``nginx:latest``).
+
+        Returns:
+            bool: True if the image should be excluded, False otherwise.
+
+        """
+
+        return self._exclude_matcher.is_excluded(image_name)
 
     def _clean_url(self, url: str) -> str:
         """Remove extra slashes in a URL while ignoring those immediately following "://".
@@ -265,20 +1123,37 @@ class CupApi:
         pattern = r"(?<!:)/{2,}"
         return re.sub(pattern, "/", url)
 
-    def _calculate_images(self, data: dict[str, Any]) -> None:
+    def _calculate_images(
+        self,
+        data: dict[str, Any],
+        matcher: ExclusionMatcher,
+        cached: _CategoryMemo,
+    ) -> tuple[dict[str, list[Any]], dict[str, list[str]], _CategoryMemo, int]:
         """Parse image data from the API response and group images by update type.
 
         Iterates over the list of images returned by the Cup API and categorises each
         image into one of the following buckets: major_updates, minor_updates,
-        patch_updates, other_updates, unknown, or up_to_date. The result is stored
-        in the instance attribute ``cache_images``.
+        patch_updates, other_updates, unknown, up_to_date or excluded_images.
+
+        The bucket of each image is memoised by reference, along with the fields it
+        depends on (``has_update``, the digests and the update type): an image
+        unchanged since the previous payload, categorised with the same matcher, is
+        not evaluated again. The digest of each image (see ``image_digest``) is
+        memoised too, and reused for an identical image only. References missing
+        from the payload are forgotten. ``cached`` is not mutated: a new memo is
+        returned.
 
         Args:
             data (dict[str, Any]): The raw payload returned by the Cup API, expected
                 to contain an ``images`` key holding a list of image objects.
+            matcher (ExclusionMatcher): The compiled exclusion rules.
+            cached (_CategoryMemo): The buckets and digests memoised by the previous categorisation with the same
+                matcher.
 
         Returns:
-            None.
+            tuple[dict[str, list[Any]], dict[str, list[str]], _CategoryMemo, int]: The images grouped by bucket,
+                their digests grouped the same way, the memoised buckets and digests, and the number of images
+                whose bucket was found in ``cached``.
 
         """
 
@@ -292,46 +1167,82 @@ class CupApi:
             "excluded_images": [],
         }
 
+        new_digests: dict[str, list[str]] = {bucket: [] for bucket in new_images}
+        categories: _CategoryMemo = {}
+        hits: int = 0
+
         for image in data["images"]:
-            # Skip images matching any exclusion pattern
             image_name: str = image.get("reference", "")
-            if self._is_image_excluded(image_name):
-                self._get_logger().debug("Image '%s' excluded from metrics.", image_name)
-                new_images["excluded_images"].append(image)
-                continue
+            result: dict[str, Any] = image["result"]
+            info: dict[str, Any] = result.get("info") or {}
+            key = (
+                result["has_update"],
+                info.get("remote_digest"),
+                info.get("local_digests"),
+                info.get("version_update_type"),
+            )
+
+            entry = cached.get(image_name)
+            if entry is not None and entry.key == key:
+                bucket = entry.bucket
+                hits += 1
+            else:
+                bucket = self._calculate_bucket(image_name, result, matcher)
 
-            if image["result"]["has_update"] is None:
-                new_images["unknown"].append(image)
-                continue
+            # Any field of the image may have changed since: the digest is only reused for an identical image.
+            digest = entry.digest if entry is not None and entry.image == image else image_digest(image)
 
-            if image["result"]["has_update"] is False:
-                new_images["up_to_date"].append(image)
-                continue
+            categories[image_name] = _CategoryEntry(key, bucket, image, digest)
+            new_images[bucket].append(image)
+            new_digests[bucket].append(digest)
 
-            if "version_update_type" in image["result"]["info"]:
-                key: str = image["result"]["info"]["version_update_type"]
-                new_images[_VERSION_UPDATE_TYPE_MAPPING[key]].append(image)  # KeyError thrown later
-                continue
+        return new_images, new_digests, categories, hits
+
+    def _calculate_bucket(self, image_name: str, result: dict[str, Any], matcher: ExclusionMatcher) -> str:
+        """Return the bucket of an image.
 
-            new_images["other_updates"].append(image)
+        Args:
+            image_name (str): The reference of the image.
+            result (dict[str, Any]): The ``result`` object of the image.
+            matcher (ExclusionMatcher): The compiled exclusion rules.
+
+        Returns:
+            str: The name of the bucket.
+
+        """
+
+        # Skip images matching any exclusion pattern
+        if matcher.is_excluded(image_name):
+            self._get_logger().debug("Image '%s' excluded from metrics.", image_name)
+            return "excluded_images"
 
-        self.cache_images = new_images
+        if result["has_update"] is None:
+            return "unknown"
 
-    def _calculate_metrics(self) -> None:
-        """Compute summary counters from the categorised image cache.
+        if result["has_update"] is False:
+            return "up_to_date"
 
-        Reads ``cache_images`` (populated by ``_calculate_images``) and builds a
-        flat dictionary of integer counters for each update category. Two derived
+        if "version_update_type" in result["info"]:
+            return _VERSION_UPDATE_TYPE_MAPPING[result["info"]["version_update_type"]]  # KeyError thrown later
+
+        return "other_updates"
+
+    def _calculate_metrics(self, images: dict[str, list[Any]]) -> dict[str, int]:
+        """Compute summary counters from the categorised images.
+
+        Reads the images grouped by ``_calculate_images`` and builds a flat
+        dictionary of integer counters for each update category. Two derived
         metrics are also computed:
 
         - ``monitored_images``: total number of images across all categories.
         - ``updates_available``: number of images that have an update pending,
           excluding images in the ``up_to_date`` and ``unknown`` categories.
 
-        The result is stored in the instance attribute ``cache_metrics``.
+        Args:
+            images (dict[str, list[Any]]): The images grouped by bucket.
 
         Returns:
-            None.
+            dict[str, int]: The counters.
 
         """
 
@@ -345,11 +1256,11 @@ class CupApi:
             "excluded_images": 0,
         }
 
-        for version_update_type, images in self.cache_images.items():
+        for version_update_type, bucket_images in images.items():
             if version_update_type == "excluded_images":
-                new_metrics["excluded_images"] = len(images)
+                new_metrics["excluded_images"] = len(bucket_images)
             else:
-                new_metrics[version_update_type] = len(images)
+                new_metrics[version_update_type] = len(bucket_images)
 
         new_metrics["monitored_images"] = sum(v for k, v in new_metrics.items() if k != "excluded_images")
 
@@ -357,4 +1268,4 @@ class CupApi:
             new_metrics["monitored_images"] - new_metrics["up_to_date"] - new_metrics["unknown"]
         )
 
-        self.cache_metrics = new_metrics
+        return new_metrics
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 import logging
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
@@ -12,6 +12,7 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntityDescription,
 )
 from homeassistant.const import CONF_NAME
+from homeassistant.core import callback
 
 from .entity import CupComponentEntity
 from .helper import create_entity_id_name
@@ -23,6 +24,7 @@ if TYPE_CHECKING:
 
     from . import CupComponentConfigEntry, CupComponentData
     from .api import CupApi
+    from .snapshot import CupSnapshot
 
 PARALLEL_UPDATES = 1
 _LOGGER = logging.getLogger(__name__)
@@ -96,7 +98,7 @@ class CupComponentBinarySensor(CupComponentEntity, BinarySensorEntity):  # pyrig
 
         """
         api: CupApi = cup_data.api
-        coordinator: DataUpdateCoordinator[None] = cup_data.coordinator
+        coordinator: DataUpdateCoordinator[CupSnapshot] = cup_data.coordinator
 
         super().__init__(api, coordinator, name, server_unique_id)
         self.entity_description = description  # pyright: ignore[reportIncompatibleVariableOverride]
@@ -105,6 +107,17 @@ class CupComponentBinarySensor(CupComponentEntity, BinarySensorEntity):  # pyrig
         raw_name: str = f"binary_sensor.{name}_{description.key}"
         self.entity_id = create_entity_id_name(raw_name)
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if the value or the attributes of this binary sensor changed.
+
+        Returns:
+            None.
+
+        """
+
+        self._async_write_state_if_changed((self.available, self.is_on, self.snapshot.stale))
+
     @property
     def is_on(self) -> bool | None:  # pyright: ignore[reportIncompatibleVariableOverride]
         """Return true if at least one update is available.
@@ -113,9 +126,19 @@ class CupComponentBinarySensor(CupComponentEntity, BinarySensorEntity):  # pyrig
             bool | None: True if updates are available, False otherwise, or None if data is unavailable.
 
         """
-        value = self.api.cache_metrics.get("updates_available")
+        value = self.snapshot.metrics.get("updates_available")
 
         if value is None:
             return None
 
         return value > 0
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:  # pyright: ignore[reportIncompatibleVariableOverride]
+        """Return the state attributes.
+
+        Returns:
+            dict[str, Any]: The "stale" flag, True while the last good data is served because the Cup server fails to answer.
+
+        """
+        return {"stale": self.snapshot.stale}
@@ -20,6 +20,7 @@ if TYPE_CHECKING:
 
     from . import CupComponentConfigEntry, CupComponentData
     from .api import CupApi
+    from .snapshot import CupSnapshot
 
 PARALLEL_UPDATES = 1
 _LOGGER = logging.getLogger(__name__)
@@ -93,7 +94,7 @@ class CupComponentButton(CupComponentEntity, ButtonEntity):  # pyright: ignore[r
         """
 
         api: CupApi = cup_data.api
-        coordinator: DataUpdateCoordinator[None] = cup_data.coordinator
+        coordinator: DataUpdateCoordinator[CupSnapshot] = cup_data.coordinator
 
         super().__init__(api, coordinator, name, server_unique_id)
         self.entity_description = description  # pyright: ignore[reportIncompatibleVariableOverride]
@@ -120,7 +121,6 @@ class CupComponentButton(CupComponentEntity, ButtonEntity):  # pyright: ignore[r
             match action:
                 case "action_refresh":
                     result = await self.api.refresh()
-                    await self.api.call_get_all_data()
                 case _:
                     raise ActionExecutionError  # noqa: TRY301
 
@@ -132,4 +132,5 @@ class CupComponentButton(CupComponentEntity, ButtonEntity):  # pyright: ignore[r
         except ActionExecutionError:
             _LOGGER.exception("Unable to launch '%s' action: %s", action, result.get("data", {}))  # ai: ignore
         else:
-            self.coordinator.async_update_listeners()
+            # Fetch the new data through the coordinator, which notifies the entities if it changed.
+            await self.coordinator.async_refresh()
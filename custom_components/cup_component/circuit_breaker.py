@@ -0,0 +1,94 @@
+"""Circuit breaker suspending the polling of a Cup server that keeps failing."""
+
+from __future__ import annotations
+
+import time
+from typing import Final
+
+# Number of consecutive failures opening the circuit.
+DEFAULT_FAILURE_THRESHOLD: Final[int] = 3
+
+# Suspension after the circuit opens, doubled on each failed probe up to the maximum.
+DEFAULT_COOLDOWN: Final[float] = 60.0
+DEFAULT_MAX_COOLDOWN: Final[float] = 1800.0
+
+
+class CircuitBreaker:
+    """Track consecutive failures of a server and decide when it may be called again.
+
+    The circuit is closed while the server answers. After ``failure_threshold``
+    consecutive failures it opens: calls are refused until the cooldown has
+    elapsed. The next call is then a trial (half-open): a success closes the
+    circuit, a failure reopens it with a doubled cooldown.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        cooldown: float = DEFAULT_COOLDOWN,
+        max_cooldown: float = DEFAULT_MAX_COOLDOWN,
+    ) -> None:
+        """Initialize a closed circuit breaker.
+
+        Args:
+            failure_threshold (int): Number of consecutive failures opening the circuit.
+            cooldown (float): Seconds during which calls are refused after the circuit opens.
+            max_cooldown (float): Upper bound of the cooldown once it has been doubled.
+
+        """
+
+        self._failure_threshold = failure_threshold
+        self._base_cooldown = cooldown
+        self._max_cooldown = max_cooldown
+
+        self._failures: int = 0
+        self._cooldown: float = cooldown
+        self._opened_at: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        """Return True while calls are refused."""
+        return self._opened_at is not None and time.monotonic() - self._opened_at < self._cooldown
+
+    @property
+    def is_half_open(self) -> bool:
+        """Return True when the cooldown has elapsed and the next call is a trial."""
+        return self._opened_at is not None and not self.is_open
+
+    @property
+    def retry_in(self) -> float:
+        """Return the number of seconds before calls are allowed again (0 when allowed)."""
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self._opened_at + self._cooldown - time.monotonic())
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call.
+
+        Returns:
+            None.
+
+        """
+
+        self._failures = 0
+        self._cooldown = self._base_cooldown
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening (or reopening) the circuit when needed.
+
+        Returns:
+            None.
+
+        """
+
+        if self._opened_at is not None:
+            # Failed trial: suspend again for longer.
+            self._cooldown = min(self._cooldown * 2, self._max_cooldown)
+            self._opened_at = time.monotonic()
+            return
+
+        self._failures += 1
+
+        if self._failures >= self._failure_threshold:
+            self._opened_at = time.monotonic()
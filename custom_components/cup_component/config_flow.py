@@ -7,50 +7,73 @@ from typing import Any
 
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigEntry, ConfigFlow, ConfigFlowResult, OptionsFlow
-from homeassistant.const import CONF_NAME, CONF_URL
+from homeassistant.components import webhook
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState, ConfigFlow, ConfigFlowResult, OptionsFlow
+from homeassistant.const import CONF_NAME, CONF_URL, CONF_WEBHOOK_ID
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import selector
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
+from . import async_apply_options
 from .api import CupApi
 from .const import (
     CONF_EXCLUDE_PATTERNS,
+    CONF_MEMORY_BUDGET,
+    CONF_PUSH_MODE,
+    CONF_STALE_MAX_AGE,
     CONF_UPDATE_INTERVAL,
+    DEFAULT_MEMORY_BUDGET,
     DEFAULT_NAME,
+    DEFAULT_STALE_MAX_AGE,
     DEFAULT_UPDATE_INTERVAL,
     DEFAULT_URL,
     DOMAIN,
+    MAX_SELECTED_MEMORY_BUDGET,
+    MAX_SELECTED_STALE_MAX_AGE,
     MIN_SELECTED_UPDATE_INTERVAL,
 )
+from .endpoint import normalize_url
 from .exceptions import (
     ClientConnectorError,
     ContentApiTypeError,
     MethodNotAllowedError,
     NotFoundError,
 )
+from .file_source import file_url_path, is_file_url
+from .helper import async_store_prefetched_payload
 
 _LOGGER = logging.getLogger(__name__)
 
+# Options form field asking for a dry-run of the exclusion patterns before saving (never stored).
+_PREVIEW_EXCLUSIONS: str = "preview_exclusions"
+
 
 async def async_try_connect(hass: HomeAssistant, config: dict[str, Any]) -> dict[str, str]:
     """Attempt to connect to the Cup API and return any connection errors.
 
+    The server is only probed (see ``CupApi.probe``). If the probe had to download
+    the payload, it is kept for the entry setup so that it is not fetched twice.
+    A ``file://`` address must be in a directory allowed by ``allowlist_external_dirs``.
+
     Returns:
         dict[str, str]: A dictionary mapping field names to error keys, or an empty dict if successful.
 
     """
 
+    if is_file_url(config[CONF_URL]) and not hass.config.is_allowed_path(file_url_path(config[CONF_URL])):
+        return {CONF_URL: "path_not_allowed"}
+
     session = async_get_clientsession(hass)
 
     api_client = CupApi(
         session=session,
         url=config[CONF_URL],
         logger=_LOGGER,
+        executor_job=hass.async_add_executor_job,
     )
 
     try:
-        await api_client.call_get_all_data()
+        result = await api_client.probe()
     except ClientConnectorError as err:
         _LOGGER.debug("Connection failed: %s", err)
         return {CONF_URL: "cannot_connect"}
@@ -65,6 +88,11 @@ async def async_try_connect(hass: HomeAssistant, config: dict[str, Any]) -> dict
     except Exception:  # pylint: disable=broad-exception-caught # ai: ignore
         _LOGGER.exception("Unexpected exception during connection attempt to %s", config[CONF_URL])
         return {CONF_URL: "unknown_error"}
+    finally:
+        await api_client.async_close()
+
+    if result["data"]:
+        async_store_prefetched_payload(hass, config[CONF_URL], result["data"])
 
     return {}
 
@@ -73,6 +101,8 @@ class CupComponentFlowHandler(ConfigFlow, domain=DOMAIN):
     """Handle a Cup Component config flow."""
 
     VERSION = 1
+    # 2: unique IDs built from the normalised address (see async_migrate_entry).
+    MINOR_VERSION = 2
 
     def __init__(self) -> None:
         """Initialize the config flow."""
@@ -96,7 +126,7 @@ class CupComponentFlowHandler(ConfigFlow, domain=DOMAIN):
                 CONF_URL: user_input[CONF_URL],
             }
 
-            await self.async_set_unique_id(user_input[CONF_URL].lower())
+            await self.async_set_unique_id(normalize_url(user_input[CONF_URL]).lower())
             self._abort_if_unique_id_configured()
 
             if not (errors := await async_try_connect(self.hass, self._config)):
@@ -160,6 +190,39 @@ def _get_data_option_schema() -> vol.Schema:
                 ),
                 vol.Coerce(int),
             ),
+            vol.Optional(
+                CONF_STALE_MAX_AGE,
+                default=int(DEFAULT_STALE_MAX_AGE.total_seconds()),
+            ): vol.All(
+                selector.NumberSelector(  # pyright: ignore[reportUnknownMemberType]
+                    selector.NumberSelectorConfig(
+                        min=0,
+                        max=int(MAX_SELECTED_STALE_MAX_AGE.total_seconds()),
+                        step=1,
+                        mode=selector.NumberSelectorMode.BOX,
+                    )
+                ),
+                vol.Coerce(int),
+            ),
+            vol.Optional(
+                CONF_MEMORY_BUDGET,
+                default=DEFAULT_MEMORY_BUDGET,
+            ): vol.All(
+                selector.NumberSelector(  # pyright: ignore[reportUnknownMemberType]
+                    selector.NumberSelectorConfig(
+                        min=0,
+                        max=MAX_SELECTED_MEMORY_BUDGET,
+                        step=1,
+                        mode=selector.NumberSelectorMode.BOX,
+                        unit_of_measurement="MiB",
+                    )
+                ),
+                vol.Coerce(int),
+            ),
+            vol.Optional(
+                CONF_PUSH_MODE,
+                default=False,
+            ): bool,
             vol.Optional(
                 CONF_EXCLUDE_PATTERNS,
             ): selector.TextSelector(  # pyright: ignore[reportUnknownMemberType]
@@ -167,10 +230,39 @@ def _get_data_option_schema() -> vol.Schema:
                     multiple=True,
                 )
             ),
+            vol.Optional(
+                _PREVIEW_EXCLUSIONS,
+                default=False,
+            ): bool,
         }
     )
 
 
+def _format_exclusion_preview(preview: dict[str, Any]) -> str:
+    """Render the result of ``CupApi.preview_exclude_patterns`` for the preview step.
+
+    Args:
+        preview (dict[str, Any]): The preview computed by the API client.
+
+    Returns:
+        str: A markdown summary, one line per pattern.
+
+    """
+
+    if preview["images"] is None:
+        return "No data has been received from the Cup server yet."
+
+    lines: list[str] = [f"**{preview['excluded']} / {preview['images']}** images would be excluded.", ""]
+
+    for item in preview["patterns"]:
+        if not item["valid"]:
+            lines.append(f"- `{item['pattern']}`: invalid pattern, ignored")
+        else:
+            lines.append(f"- `{item['pattern']}`: {item['matches']} images ({item['duration_ms']:.2f} ms)")
+
+    return "\n".join(lines)
+
+
 async def _async_validate_input(
     user_input: dict[str, Any],
 ) -> dict[str, str]:
@@ -197,6 +289,10 @@ async def _async_validate_input(
 class OptionsFlowHandler(OptionsFlow):
     """Options flow used to change configuration (options) of existing instance of integration."""
 
+    def __init__(self) -> None:
+        """Initialize the options flow."""
+        self._pending_input: dict[str, Any] = {}
+
     async def async_step_init(self, user_input: dict[str, Any] | None = None) -> ConfigFlowResult:
         """Handle the initial step of the options flow.
 
@@ -209,8 +305,10 @@ class OptionsFlowHandler(OptionsFlow):
         """
         if user_input is not None:  # we asked to validate values entered by user
             errors = await _async_validate_input(user_input)
+            url_changed = user_input.get(CONF_URL) != self.config_entry.data.get(CONF_URL)
 
-            if len(errors) == 0:
+            if len(errors) == 0 and url_changed:
+                # Only a new address needs a connection test.
                 config = {
                     CONF_URL: user_input.get(CONF_URL),
                 }
@@ -218,11 +316,13 @@ class OptionsFlowHandler(OptionsFlow):
                 errors = await async_try_connect(self.hass, config)
 
             if not errors:
-                self.hass.config_entries.async_update_entry(
-                    self.config_entry, data={**self.config_entry.data, **user_input}
-                )
-                await self.hass.config_entries.async_reload(self.config_entry.entry_id)
-                return self.async_create_entry(title="", data={})
+                preview_requested: bool = user_input.pop(_PREVIEW_EXCLUSIONS, False)
+
+                if preview_requested and self.config_entry.state is ConfigEntryState.LOADED:
+                    self._pending_input = user_input
+                    return await self.async_step_preview()
+
+                return await self._async_save(user_input)
             return self.async_show_form(
                 step_id="init",
                 data_schema=self.add_suggested_values_to_schema(
@@ -230,15 +330,72 @@ class OptionsFlowHandler(OptionsFlow):
                     user_input,
                 ),
                 errors=dict(errors),
+                description_placeholders=self._webhook_placeholders(),
             )
 
         return self._async_show_init_form()
 
+    async def async_step_preview(self, user_input: dict[str, Any] | None = None) -> ConfigFlowResult:
+        """Show how the exclusion patterns would apply to the cached inventory before saving.
+
+        The patterns are evaluated against the last payload received, without any
+        request to the Cup server. Submitting this step saves the pending options.
+
+        Args:
+            user_input (dict[str, Any] | None): Empty dict when the user confirms, or None on first display.
+
+        Returns:
+            ConfigFlowResult: The result of the options flow step.
+
+        """
+        if user_input is not None:
+            return await self._async_save(self._pending_input)
+
+        # Every pattern is matched against every image: kept off the event loop for large inventories.
+        preview = await self.hass.async_add_executor_job(
+            self.config_entry.runtime_data.api.preview_exclude_patterns,
+            self._pending_input.get(CONF_EXCLUDE_PATTERNS, []),
+        )
+
+        return self.async_show_form(
+            step_id="preview",
+            data_schema=vol.Schema({}),
+            description_placeholders={"preview": _format_exclusion_preview(preview)},
+        )
+
+    async def _async_save(self, user_input: dict[str, Any]) -> ConfigFlowResult:
+        """Store the options in the config entry data and apply them.
+
+        A new address, or push mode switched on or off, reloads the entry.
+
+        Args:
+            user_input (dict[str, Any]): The validated options.
+
+        Returns:
+            ConfigFlowResult: The final result of the options flow.
+
+        """
+        reload_required = any(
+            user_input.get(key, default) != self.config_entry.data.get(key, default)
+            for key, default in ((CONF_URL, None), (CONF_PUSH_MODE, False))
+        )
+
+        self.hass.config_entries.async_update_entry(self.config_entry, data={**self.config_entry.data, **user_input})
+
+        if reload_required or self.config_entry.state is not ConfigEntryState.LOADED:
+            await self.hass.config_entries.async_reload(self.config_entry.entry_id)
+        else:
+            # Interval and exclusion patterns are applied live, without a full reload.
+            await async_apply_options(self.config_entry)
+
+        return self.async_create_entry(title="", data={})
+
     def _async_show_init_form(self) -> ConfigFlowResult:
-        """Initialise the default update interval if missing and display the options form.
+        """Initialise the default update interval and the webhook ID if missing and display the options form.
 
         If the update interval is not yet set in the config entry data, it is initialised
-        with the default value before the form is displayed.
+        with the default value before the form is displayed. A webhook ID is generated
+        the same way, for push mode.
 
         Returns:
             ConfigFlowResult: The form result with pre-filled default values.
@@ -256,6 +413,16 @@ class OptionsFlowHandler(OptionsFlow):
                 },
             )
 
+        if CONF_WEBHOOK_ID not in self.config_entry.data:
+            # Generated beforehand, so that the webhook path can be shown before push mode is enabled.
+            self.hass.config_entries.async_update_entry(
+                self.config_entry,
+                data={
+                    **self.config_entry.data,
+                    CONF_WEBHOOK_ID: webhook.async_generate_id(),
+                },
+            )
+
         # we asked to provide default values for the form
         return self.async_show_form(
             step_id="init",
@@ -263,4 +430,16 @@ class OptionsFlowHandler(OptionsFlow):
                 _get_data_option_schema(),
                 self.config_entry.data,
             ),
+            description_placeholders=self._webhook_placeholders(),
         )
+
+    def _webhook_placeholders(self) -> dict[str, str]:
+        """Return the placeholders of the options form describing push mode.
+
+        Returns:
+            dict[str, str]: The path of the webhook Cup can post to.
+
+        """
+
+        webhook_id: str | None = self.config_entry.data.get(CONF_WEBHOOK_ID)
+        return {"webhook_path": webhook.async_generate_path(webhook_id) if webhook_id else "-"}
@@ -1,31 +1,41 @@
 """Constants for HA Cup Component."""
 
 from datetime import timedelta
-import json
-from pathlib import Path
-import time
 from typing import Final
 
 DOMAIN: Final[str] = "cup_component"
 
-# Integration version read from manifest.json — used to version Lovelace resources.
-_MANIFEST_PATH: Final[Path] = Path(__file__).parent / "manifest.json"
-with _MANIFEST_PATH.open(encoding="utf-8") as _f:
-    # Fallback to a Unix timestamp if version is missing or set to the default placeholder (dev environment only).
-    _version: str = json.load(_f).get("version", "")
-    INTEGRATION_VERSION: Final[str] = _version if _version and _version != "0.0.0" else str(int(time.time()))
-
 # URL path used to serve JS files via a registered static HTTP route.
 URL_BASE: Final[str] = "/cup_component"
 LOVELACE_CARD_JS: Final[str] = "cup-component-card.js"
 LOVELACE_CARD_NAME: Final[str] = "Cup Component Card"
 LOVELACE_MODULE_URL: Final[str] = f"{URL_BASE}/{LOVELACE_CARD_JS}"
 
+# Fields of the image information rendered by the Lovelace card (see websocket.py), kept in compact records.
+CARD_INFO_KEYS: Final[tuple[str, ...]] = ("type", "current_version", "new_version", "local_digests", "remote_digest")
+
+# Dispatched after each coordinator update of an entry (formatted with the entry ID), for the card subscriptions.
+SIGNAL_SNAPSHOT_UPDATED: Final[str] = f"{DOMAIN}_snapshot_updated_{{}}"
+
 DEFAULT_NAME: Final[str] = "Cup server name"
 DEFAULT_URL: Final[str] = "http://<YOUR_IP>:8000"
 
 CONF_UPDATE_INTERVAL: Final[str] = "update_interval"
 CONF_EXCLUDE_PATTERNS: Final[str] = "exclude_patterns"
+CONF_STALE_MAX_AGE: Final[str] = "stale_max_age"
+CONF_MEMORY_BUDGET: Final[str] = "memory_budget"
+CONF_PUSH_MODE: Final[str] = "push_mode"
 
 DEFAULT_UPDATE_INTERVAL: Final[timedelta] = timedelta(seconds=300)
 MIN_SELECTED_UPDATE_INTERVAL: Final[timedelta] = timedelta(seconds=15)
+
+# How long the last good data keeps being served while the Cup server fails (0 disables it).
+DEFAULT_STALE_MAX_AGE: Final[timedelta] = timedelta(hours=1)
+MAX_SELECTED_STALE_MAX_AGE: Final[timedelta] = timedelta(days=1)
+
+# Memory the data of a Cup server may hold, in MiB (0 disables the limit).
+DEFAULT_MEMORY_BUDGET: Final[int] = 0
+MAX_SELECTED_MEMORY_BUDGET: Final[int] = 1024
+
+# Polling interval kept as a safety net while Cup pushes its data through the webhook.
+PUSH_SAFETY_NET_INTERVAL: Final[timedelta] = timedelta(hours=1)
@@ -1,42 +1,154 @@
-"""Diagnostics support for Cup Component."""
+"""Diagnostics support for Cup Component.
+
+The config entry diagnostics are a summary (counts, a sample of images, pattern
+statistics, timings and the snapshot fingerprint), small whatever the size of
+the inventory. The full list of images is available from the device
+diagnostics, built image by image and capped in size.
+"""
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+import json
+from typing import TYPE_CHECKING, Any, Final
 
 from homeassistant.components.diagnostics import async_redact_data  # pyright: ignore[reportUnknownVariableType]
-from homeassistant.const import CONF_URL
+from homeassistant.const import CONF_URL, CONF_WEBHOOK_ID
+
+from .const import CONF_EXCLUDE_PATTERNS
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.device_registry import DeviceEntry
 
     from . import CupComponentConfigEntry
+    from .snapshot import CupSnapshot
 
 # Fields to redact from diagnostics output to avoid exposing sensitive data.
-_DIAGNOSTICS_REDACT: frozenset[str] = frozenset({CONF_URL})
+_DIAGNOSTICS_REDACT: frozenset[str] = frozenset({CONF_URL, CONF_WEBHOOK_ID})
+
+# Number of images of each bucket included in the summary.
+_SAMPLE_SIZE: Final[int] = 3
+
+# Approximate maximum size of the images of the full dump, in bytes of JSON.
+_FULL_DUMP_MAX_BYTES: Final[int] = 5 * 1024 * 1024
+
+
+def _snapshot_summary(snapshot: CupSnapshot) -> dict[str, Any]:
+    """Summarise a snapshot without its image lists.
+
+    Args:
+        snapshot (CupSnapshot): The data of the Cup server.
+
+    Returns:
+        dict[str, Any]: The generation, fingerprint, timestamps and counters of the snapshot.
+
+    """
+
+    return {
+        "generation": snapshot.generation,
+        "fingerprint": snapshot.fingerprint,
+        "stale": snapshot.stale,
+        "memory_bytes": snapshot.memory_bytes,
+        "over_budget": snapshot.over_budget,
+        "metrics": dict(snapshot.metrics),
+        "last_checked": str(snapshot.last_checked),
+        "fetched_at": str(snapshot.fetched_at),
+    }
+
+
+def _build_full_dump(snapshot: CupSnapshot, max_bytes: int) -> dict[str, Any]:
+    """Copy the images of a snapshot one by one, until the size budget is spent.
+
+    The size of each image is measured as it is added, so that the dump never
+    grows much past the budget. This function may run in the executor.
+
+    Args:
+        snapshot (CupSnapshot): The data of the Cup server.
+        max_bytes (int): The approximate maximum size of the images, in bytes of JSON.
+
+    Returns:
+        dict[str, Any]: The images grouped by bucket, the size used and the number of images left out.
+
+    """
+
+    images: dict[str, list[dict[str, Any]]] = {}
+    size = 0
+    omitted = 0
+
+    for bucket, bucket_images in snapshot.images.items():
+        dumped: list[dict[str, Any]] = images.setdefault(bucket, [])
+        for image in bucket_images:
+            if size >= max_bytes:
+                omitted += 1
+                continue
+            size += len(json.dumps(image, default=str))
+            dumped.append(image)
+
+    return {
+        "images": images,
+        "size_bytes": size,
+        "truncated": omitted > 0,
+        "omitted_images": omitted,
+    }
 
 
 async def async_get_config_entry_diagnostics(
-    hass: HomeAssistant,  # noqa: ARG001 # pylint: disable=unused-argument
+    hass: HomeAssistant,
     entry: CupComponentConfigEntry,
 ) -> dict[str, Any]:
-    """Return diagnostics for a config entry.
+    """Return summarised diagnostics for a config entry.
 
-    Sensitive fields (URL) are redacted from the output.
+    Sensitive fields (URL, webhook ID) are redacted from the output. Pattern statistics are
+    computed in the executor, since they evaluate every pattern on every image.
 
     Args:
-        hass (HomeAssistant): The Home Assistant instance (unused).
+        hass (HomeAssistant): The Home Assistant instance.
         entry (CupComponentConfigEntry): The config entry to diagnose.
 
     Returns:
-        dict[str, Any]: A dictionary containing redacted config and current runtime data.
+        dict[str, Any]: A dictionary containing redacted config, a summary of the runtime data, pattern statistics and the timings of the last categorisation.
 
     """
+    api = entry.runtime_data.api
+    snapshot = entry.runtime_data.coordinator.data
+
+    pattern_stats = await hass.async_add_executor_job(
+        api.preview_exclude_patterns, entry.data.get(CONF_EXCLUDE_PATTERNS, [])
+    )
+
     return {
         "config": async_redact_data(dict(entry.data), _DIAGNOSTICS_REDACT),
         "data": {
-            "metrics": entry.runtime_data.api.cache_metrics,
-            "last_checked": str(entry.runtime_data.api.cache_last_checked),
-            "images": entry.runtime_data.api.cache_images,
+            **_snapshot_summary(snapshot),
+            "sample": {bucket: list(images[:_SAMPLE_SIZE]) for bucket, images in snapshot.images.items()},
         },
+        "patterns": pattern_stats,
+        "instrumentation": api.instrumentation,
+    }
+
+
+async def async_get_device_diagnostics(
+    hass: HomeAssistant,
+    entry: CupComponentConfigEntry,
+    device: DeviceEntry,  # noqa: ARG001 # pylint: disable=unused-argument
+) -> dict[str, Any]:
+    """Return the full diagnostics of a Cup server, capped in size.
+
+    Args:
+        hass (HomeAssistant): The Home Assistant instance.
+        entry (CupComponentConfigEntry): The config entry of the device.
+        device (DeviceEntry): The Cup server device (unused, there is one device per entry).
+
+    Returns:
+        dict[str, Any]: A dictionary containing redacted config, a summary of the runtime data and every image, up to ``_FULL_DUMP_MAX_BYTES``.
+
+    """
+    snapshot = entry.runtime_data.coordinator.data
+
+    full_dump = await hass.async_add_executor_job(_build_full_dump, snapshot, _FULL_DUMP_MAX_BYTES)
+
+    return {
+        "config": async_redact_data(dict(entry.data), _DIAGNOSTICS_REDACT),
+        "data": {**_snapshot_summary(snapshot), **full_dump},
+        "instrumentation": entry.runtime_data.api.instrumentation,
     }
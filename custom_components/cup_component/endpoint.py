@@ -0,0 +1,227 @@
+"""Cup servers shared by several config entries.
+
+Entries whose addresses normalise to the same endpoint (e.g. with and without
+a trailing slash) share one ``CupEndpoint``: concurrent requests for the
+``/json`` payload are merged into one, and a payload fetched recently for one
+entry is reused by the others on their next scheduled poll. Each entry gets a
+payload at most once, and the payload is dropped once every entry got it.
+Each entry still applies its own exclusion
+rules and publishes its own snapshot. Endpoints are reference counted and
+dropped when their last entry is unloaded.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import posixpath
+import re
+import time
+from typing import TYPE_CHECKING, Any, Final
+from urllib.parse import urlsplit, urlunsplit
+
+from homeassistant.core import callback
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+    from datetime import timedelta
+
+    from homeassistant.core import HomeAssistant
+
+# Endpoints in use, keyed by normalised URL.
+_DATA_ENDPOINTS: Final[HassKey[dict[str, CupEndpoint]]] = HassKey(f"{DOMAIN}_endpoints")
+
+# Default ports, dropped from the normalised URLs.
+_DEFAULT_PORTS: Final[dict[str, int]] = {"http": 80, "https": 443}
+
+# A payload younger than this share of the polling interval of an entry is reused for it.
+_REUSE_RATIO: Final[float] = 0.9
+
+
+def normalize_url(url: str) -> str:
+    """Return a canonical form of the address of a Cup server.
+
+    The scheme and the host are lowercased, default ports, fragments, repeated
+    and trailing slashes are dropped, and socket or file paths are normalised.
+    Host names are not resolved: a host name and its IP address remain two
+    different endpoints.
+
+    Args:
+        url (str): The address configured for the Cup server.
+
+    Returns:
+        str: The normalised address, or the address as entered if it cannot be parsed
+            (e.g. an invalid port, reported by the connection test).
+
+    """
+
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return url.strip()
+
+    scheme = parts.scheme.lower()
+
+    if scheme not in _DEFAULT_PORTS:
+        # unix:// and file:// URLs: only the path designates the endpoint.
+        path = posixpath.normpath(parts.path) if parts.path else ""
+        query = f"?{parts.query}" if parts.query else ""
+        return f"{scheme}://{parts.netloc.lower()}{path}{query}"
+
+    host = (parts.hostname or "").lower()
+    netloc = f"[{host}]" if ":" in host else host
+
+    if port is not None and port != _DEFAULT_PORTS[scheme]:
+        netloc = f"{netloc}:{port}"
+    if parts.username is not None:
+        credentials = parts.username if parts.password is None else f"{parts.username}:{parts.password}"
+        netloc = f"{credentials}@{netloc}"
+
+    path = re.sub(r"/{2,}", "/", parts.path).rstrip("/")
+    return urlunsplit((scheme, netloc, path, parts.query, ""))
+
+
+class CupEndpoint:
+    """The ``/json`` payload of a Cup server, fetched once for all the entries using it.
+
+    Attributes:
+        key (str): The normalised URL of the Cup server.
+        references (int): The number of loaded entries using the endpoint.
+
+    """
+
+    def __init__(self, key: str) -> None:
+        """Initialize an endpoint with no payload.
+
+        Args:
+            key (str): The normalised URL of the Cup server.
+
+        """
+        self.key = key
+        self.references: int = 0
+
+        self._fetch: asyncio.Task[dict[str, Any]] | None = None
+        self._result: dict[str, Any] | None = None
+        self._fetched_at: float = 0.0
+
+        # Clients the last payload was returned to.
+        self._consumers: set[object] = set()
+
+    def invalidate(self) -> None:
+        """Forget the last payload, so that the next request reaches the Cup server.
+
+        Returns:
+            None.
+
+        """
+
+        self._result = None
+        self._consumers = set()
+
+    async def async_fetch(
+        self,
+        fetch: Callable[[], Awaitable[dict[str, Any]]],
+        poll_interval: timedelta | None,
+        requester: object,
+    ) -> dict[str, Any]:
+        """Return the payload of the Cup server, reusing a recent or pending request.
+
+        A recent payload is only reused for requesters it was not returned to yet:
+        an entry refreshing again before its polling interval elapsed (e.g. on
+        request of the user or of a push notification) reaches the Cup server.
+        The payload is dropped once every entry using the endpoint got it.
+
+        Args:
+            fetch (Callable[[], Awaitable[dict[str, Any]]]): The request to send when the payload cannot be reused.
+            poll_interval (timedelta | None): The polling interval of the calling entry. A payload younger than
+                ``_REUSE_RATIO`` of it is reused (None only merges concurrent requests).
+            requester (object): The client asking for the payload (e.g. its ``CupApi``).
+
+        Returns:
+            dict[str, Any]: The result of the request, with the keys "code", "reason", "content_type" and "data".
+
+        """
+
+        if (
+            self._result is not None
+            and poll_interval is not None
+            and requester not in self._consumers
+            and time.monotonic() - self._fetched_at < poll_interval.total_seconds() * _REUSE_RATIO
+        ):
+            result = self._result
+        else:
+            if self._fetch is None:
+                self._fetch = asyncio.create_task(self._async_run(fetch))
+
+            # Shielded: a caller giving up (e.g. timeout) does not cancel the request of the others.
+            result = await asyncio.shield(self._fetch)
+
+        if result is self._result:
+            self._consumers.add(requester)
+            if len(self._consumers) >= self.references:
+                # Every entry got the payload: it is no longer worth its memory.
+                self.invalidate()
+
+        return result
+
+    async def _async_run(self, fetch: Callable[[], Awaitable[dict[str, Any]]]) -> dict[str, Any]:
+        """Send the request and keep its result.
+
+        Args:
+            fetch (Callable[[], Awaitable[dict[str, Any]]]): The request to send.
+
+        Returns:
+            dict[str, Any]: The result of the request.
+
+        """
+
+        try:
+            result = await fetch()
+        finally:
+            self._fetch = None
+
+        self._result = result
+        self._fetched_at = time.monotonic()
+        self._consumers = set()
+        return result
+
+
+@callback
+def async_acquire_endpoint(hass: HomeAssistant, url: str) -> CupEndpoint:
+    """Return the endpoint of a Cup server, created on first use, and count one more user.
+
+    Args:
+        hass (HomeAssistant): The Home Assistant instance.
+        url (str): The address configured for the Cup server.
+
+    Returns:
+        CupEndpoint: The shared endpoint.
+
+    """
+
+    key = normalize_url(url)
+    endpoint = hass.data.setdefault(_DATA_ENDPOINTS, {}).setdefault(key, CupEndpoint(key))
+    endpoint.references += 1
+    return endpoint
+
+
+@callback
+def async_release_endpoint(hass: HomeAssistant, endpoint: CupEndpoint) -> None:
+    """Count one user less of an endpoint, and drop it when it is no longer used.
+
+    Args:
+        hass (HomeAssistant): The Home Assistant instance.
+        endpoint (CupEndpoint): The endpoint returned by ``async_acquire_endpoint``.
+
+    Returns:
+        None.
+
+    """
+
+    endpoint.references -= 1
+
+    if endpoint.references <= 0:
+        hass.data.get(_DATA_ENDPOINTS, {}).pop(endpoint.key, None)
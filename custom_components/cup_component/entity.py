@@ -5,6 +5,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 from urllib.parse import urlparse, urlunparse
 
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
@@ -12,12 +13,15 @@ from homeassistant.helpers.update_coordinator import (
 )
 
 from .const import DOMAIN
+from .snapshot import CupSnapshot
 
 if TYPE_CHECKING:
+    from collections.abc import Hashable
+
     from .api import CupApi
 
 
-class CupComponentEntity(CoordinatorEntity[DataUpdateCoordinator[None]]):
+class CupComponentEntity(CoordinatorEntity[DataUpdateCoordinator[CupSnapshot]]):
     """Representation of a Cup Component entity."""
 
     _attr_has_entity_name = True
@@ -25,7 +29,7 @@ class CupComponentEntity(CoordinatorEntity[DataUpdateCoordinator[None]]):
     def __init__(
         self,
         api: CupApi,
-        coordinator: DataUpdateCoordinator[None],
+        coordinator: DataUpdateCoordinator[CupSnapshot],
         name: str,
         server_unique_id: str,
     ) -> None:
@@ -33,7 +37,7 @@ class CupComponentEntity(CoordinatorEntity[DataUpdateCoordinator[None]]):
 
         Args:
             api (CupApi): The Cup API client instance.
-            coordinator (DataUpdateCoordinator[None]): The data update coordinator.
+            coordinator (DataUpdateCoordinator[CupSnapshot]): The data update coordinator.
             name (str): The human-readable name of the Cup server.
             server_unique_id (str): The unique identifier of the config entry.
 
@@ -43,6 +47,38 @@ class CupComponentEntity(CoordinatorEntity[DataUpdateCoordinator[None]]):
         self._name = name
         self._server_unique_id = server_unique_id
 
+        # Digest of the state last written by _async_write_state_if_changed
+        self._written_state: Hashable | None = None
+
+    @property
+    def snapshot(self) -> CupSnapshot:
+        """Return the data published by the coordinator.
+
+        Returns:
+            CupSnapshot: The snapshot of the last refresh (possibly stale).
+
+        """
+
+        return self.coordinator.data
+
+    @callback
+    def _async_write_state_if_changed(self, state: Hashable) -> None:
+        """Write the entity state, unless it is the same as the last one written.
+
+        Args:
+            state (Hashable): A cheap digest of the value, attributes and availability of the entity.
+
+        Returns:
+            None.
+
+        """
+
+        if state == self._written_state:
+            return
+
+        self._written_state = state
+        self.async_write_ha_state()
+
     @property
     def device_info(self) -> DeviceInfo:  # pyright: ignore[reportIncompatibleVariableOverride]
         """Return the device information of the entity.
@@ -52,9 +88,9 @@ class CupComponentEntity(CoordinatorEntity[DataUpdateCoordinator[None]]):
 
         """
 
-        # Build the base URL (scheme + netloc only) from the API URL
+        # Build the base URL (scheme + netloc only) from the API URL (none for a file or a Unix socket)
         parsed = urlparse(self.api.url)
-        config_url = urlunparse((parsed.scheme, parsed.netloc, "", "", "", ""))
+        config_url = urlunparse((parsed.scheme, parsed.netloc, "", "", "", "")) if parsed.netloc else None
 
         return DeviceInfo(
             identifiers={(DOMAIN, self._server_unique_id)},
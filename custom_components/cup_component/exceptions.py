@@ -45,6 +45,23 @@ class BadRequestError(Exception):
         super().__init__(self.message)
 
 
+class CircuitOpenError(Exception):
+    """The class `CircuitOpenError` is used to raise an exception when polling of a failing Cup server is suspended."""
+
+    def __init__(
+        self,
+        message: str = "The Cup server keeps failing, polling is suspended for a while.",
+    ) -> None:
+        """Initialize CircuitOpenError with an optional custom message.
+
+        Args:
+            message (str): The error message describing the suspension.
+
+        """
+        self.message = message
+        super().__init__(self.message)
+
+
 class ClientConnectorError(Exception):
     """The class `ClientConnectorError` is used to raise an exception when the Cup server is unreachable."""
 
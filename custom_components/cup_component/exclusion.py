@@ -0,0 +1,374 @@
+"""Exclusion rules used to leave images out of the Cup Component metrics.
+
+Each configured pattern is one rule:
+
+- ``glob:<pattern>``: shell-style glob matched against the full reference
+  (``*`` matches any sequence of characters, ``?`` a single character).
+- ``registry=<glob> repository=<glob> tag=<glob>``: structured rule matched
+  against the parts of the reference. Any subset of the fields can be given;
+  a pattern is only read as a structured rule when every token starts with
+  one of these fields (``^app(?=.*dev).*`` remains a regex).
+- anything else: regex that must match the full reference (e.g. ``nginx:latest``
+  or ``^myapp.*``), which is the historical behaviour. The regex is used as
+  entered, surrounding spaces included.
+
+A rule prefixed with ``!`` is an include rule: images it matches are never
+excluded, whatever the exclude rules say. No reference contains ``!``, so such
+patterns matched nothing when they were read as regexes.
+
+Rules are indexed by the literal prefix they require (a trie walked along the
+reference) and structured rules by registry, so that only the rules which can
+possibly match a reference are evaluated.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import fnmatch
+import re
+from typing import Final
+
+# Registry assumed by Docker for references without an explicit registry.
+DEFAULT_REGISTRY: Final[str] = "docker.io"
+DEFAULT_TAG: Final[str] = "latest"
+
+_GLOB_PREFIX: Final[str] = "glob:"
+_INCLUDE_PREFIX: Final[str] = "!"
+_STRUCTURED_FIELDS: Final[frozenset[str]] = frozenset({"registry", "repository", "tag"})
+
+_REGEX_METACHARACTERS: Final[frozenset[str]] = frozenset(".^$*+?{}[]\\|()")
+_GLOB_METACHARACTERS: Final[frozenset[str]] = frozenset("*?[")
+
+
+def split_reference(reference: str) -> tuple[str, str, str]:
+    """Split an image reference into its registry, repository and tag.
+
+    Args:
+        reference (str): The image reference (e.g. ``ghcr.io/foo/bar:1.2``).
+
+    Returns:
+        tuple[str, str, str]: The registry, repository and tag. Docker defaults are
+            applied when the registry or the tag are omitted.
+
+    """
+
+    name = reference.split("@", 1)[0]
+    registry = DEFAULT_REGISTRY
+    first, sep, rest = name.partition("/")
+
+    if sep and ("." in first or ":" in first or first == "localhost"):
+        registry, name = first, rest
+
+    repository, sep, tag = name.rpartition(":")
+
+    if not sep or "/" in tag:
+        repository, tag = name, DEFAULT_TAG
+
+    return registry, repository, tag
+
+
+def _regex_literal_prefix(pattern: str) -> str:
+    """Return the literal text every match of a regex must start with.
+
+    The analysis is conservative: an empty string is returned as soon as the
+    pattern is not a simple concatenation (alternation, group, class...).
+
+    Args:
+        pattern (str): The regex pattern.
+
+    Returns:
+        str: The literal prefix, possibly empty.
+
+    """
+
+    if "|" in pattern:
+        return ""
+
+    prefix: list[str] = []
+    index = 1 if pattern.startswith("^") else 0
+
+    while index < len(pattern):
+        char = pattern[index]
+
+        if char == "\\" and index + 1 < len(pattern) and not pattern[index + 1].isalnum():
+            literal, width = pattern[index + 1], 2
+        elif char not in _REGEX_METACHARACTERS:
+            literal, width = char, 1
+        else:
+            break
+
+        # A quantified character is optional or repeated: it is not part of the prefix.
+        if index + width < len(pattern) and pattern[index + width] in "?*+{":
+            break
+
+        prefix.append(literal)
+        index += width
+
+    return "".join(prefix)
+
+
+def _glob_literal_prefix(pattern: str) -> str:
+    """Return the literal text every match of a glob must start with.
+
+    Args:
+        pattern (str): The glob pattern.
+
+    Returns:
+        str: The characters before the first wildcard.
+
+    """
+
+    for index, char in enumerate(pattern):
+        if char in _GLOB_METACHARACTERS:
+            return pattern[:index]
+    return pattern
+
+
+@dataclass(frozen=True, slots=True)
+class ExclusionRule:
+    """A single compiled exclusion (or include) rule.
+
+    Attributes:
+        pattern (str): The pattern as configured by the user.
+        include (bool): True for include rules (``!`` prefix), which take precedence over exclude rules.
+        prefix (str): Literal prefix every matching reference starts with (reference rules only).
+        regex (re.Pattern[str] | None): Compiled regex matched against the full reference, None for structured rules.
+        fields (dict[str, re.Pattern[str]]): Compiled globs for the registry, repository and tag (structured rules only).
+        registry (str): The registry a structured rule is limited to, when given without wildcard.
+
+    """
+
+    pattern: str
+    include: bool
+    prefix: str = ""
+    regex: re.Pattern[str] | None = None
+    fields: dict[str, re.Pattern[str]] = field(default_factory=dict)  # pyright: ignore[reportUnknownVariableType]
+    registry: str = ""
+
+    @property
+    def structured(self) -> bool:
+        """Return True for rules matched against the parts of the reference."""
+        return self.regex is None
+
+    def matches(self, reference: str) -> bool:
+        """Check whether the rule matches an image reference.
+
+        Args:
+            reference (str): The full image reference.
+
+        Returns:
+            bool: True if the rule matches.
+
+        """
+
+        if self.regex is not None:
+            return self.regex.fullmatch(reference) is not None
+
+        registry, repository, tag = split_reference(reference)
+        parts = {"registry": registry, "repository": repository, "tag": tag}
+        return all(regex.fullmatch(parts[name]) for name, regex in self.fields.items())
+
+
+def parse_rule(pattern: str) -> ExclusionRule:
+    """Compile a configured pattern into a rule.
+
+    Args:
+        pattern (str): The pattern as configured by the user.
+
+    Returns:
+        ExclusionRule: The compiled rule.
+
+    Raises:
+        ValueError: If the pattern is an invalid regex or an invalid structured rule.
+
+    """
+
+    include = pattern.startswith(_INCLUDE_PREFIX)
+    body = pattern.removeprefix(_INCLUDE_PREFIX)
+
+    if body.startswith(_GLOB_PREFIX):
+        glob = body.removeprefix(_GLOB_PREFIX)
+        return ExclusionRule(
+            pattern=pattern,
+            include=include,
+            prefix=_glob_literal_prefix(glob),
+            regex=re.compile(fnmatch.translate(glob)),
+        )
+
+    tokens = body.split()
+
+    if tokens and all(token.partition("=")[0] in _STRUCTURED_FIELDS and "=" in token for token in tokens):
+        fields: dict[str, re.Pattern[str]] = {}
+        registry = ""
+        for token in tokens:
+            name, _, value = token.partition("=")
+            if name in fields or not value:
+                msg = f"Invalid structured rule '{pattern}'."
+                raise ValueError(msg)
+            fields[name] = re.compile(fnmatch.translate(value))
+            if name == "registry" and not _GLOB_METACHARACTERS.intersection(value):
+                registry = value
+        return ExclusionRule(pattern=pattern, include=include, fields=fields, registry=registry)
+
+    try:
+        regex = re.compile(body)
+    except re.error as err:
+        msg = f"Invalid regex pattern '{pattern}'."
+        raise ValueError(msg) from err
+
+    return ExclusionRule(pattern=pattern, include=include, prefix=_regex_literal_prefix(body), regex=regex)
+
+
+class _TrieNode:
+    """Node of the prefix index: the rules whose literal prefix ends here, and the next characters."""
+
+    __slots__ = ("children", "rules")
+
+    def __init__(self) -> None:
+        """Initialize an empty node."""
+        self.children: dict[str, _TrieNode] = {}
+        self.rules: list[ExclusionRule] = []
+
+
+class ExclusionMatcher:
+    """Compiled set of exclusion rules.
+
+    Attributes:
+        patterns (list[str]): The configured patterns, deduplicated, in their original order.
+        rules (list[ExclusionRule]): The successfully compiled rules.
+        invalid_patterns (list[str]): The patterns that could not be compiled and are ignored.
+
+    """
+
+    def __init__(self, patterns: list[str]) -> None:
+        """Compile and index the given patterns.
+
+        Args:
+            patterns (list[str]): The configured patterns.
+
+        """
+
+        # Deduplicate patterns while preserving order
+        self.patterns: list[str] = list(dict.fromkeys(patterns))
+        self.rules: list[ExclusionRule] = []
+        self.invalid_patterns: list[str] = []
+
+        self._literals: dict[str, bool] = {}
+        self._trie: _TrieNode = _TrieNode()
+        self._structured_by_registry: dict[str, list[ExclusionRule]] = {}
+        self._structured_any_registry: list[ExclusionRule] = []
+
+        for pattern in self.patterns:
+            try:
+                rule = parse_rule(pattern)
+            except ValueError:
+                self.invalid_patterns.append(pattern)
+                continue
+            self.rules.append(rule)
+            self._index(rule)
+
+    def __bool__(self) -> bool:
+        """Return False when there is no rule to evaluate."""
+        return bool(self.rules)
+
+    def _index(self, rule: ExclusionRule) -> None:
+        """Add a compiled rule to the lookup structures.
+
+        Args:
+            rule (ExclusionRule): The rule to index.
+
+        Returns:
+            None.
+
+        """
+
+        if rule.structured:
+            if rule.registry:
+                self._structured_by_registry.setdefault(rule.registry, []).append(rule)
+            else:
+                self._structured_any_registry.append(rule)
+            return
+
+        if _is_exact(rule):
+            # The rule only matches its literal prefix: a plain dictionary lookup is enough.
+            self._literals[rule.prefix] = self._literals.get(rule.prefix, False) or rule.include
+            return
+
+        node = self._trie
+        for char in rule.prefix:
+            node = node.children.setdefault(char, _TrieNode())
+        node.rules.append(rule)
+
+    def _candidates(self, reference: str) -> list[ExclusionRule]:
+        """Return the rules that can possibly match a reference.
+
+        Args:
+            reference (str): The full image reference.
+
+        Returns:
+            list[ExclusionRule]: The candidate rules, to be confirmed with ``ExclusionRule.matches``.
+
+        """
+
+        node = self._trie
+        candidates: list[ExclusionRule] = list(node.rules)
+
+        for char in reference:
+            next_node = node.children.get(char)
+            if next_node is None:
+                break
+            node = next_node
+            candidates.extend(node.rules)
+
+        if self._structured_by_registry or self._structured_any_registry:
+            candidates.extend(self._structured_by_registry.get(split_reference(reference)[0], ()))
+            candidates.extend(self._structured_any_registry)
+
+        return candidates
+
+    def is_excluded(self, reference: str) -> bool:
+        """Check whether an image must be excluded.
+
+        Include rules take precedence over exclude rules.
+
+        Args:
+            reference (str): The full image reference (e.g. ``nginx:latest``).
+
+        Returns:
+            bool: True if at least one exclude rule and no include rule match the reference.
+
+        """
+
+        excluded = False
+
+        if (literal_include := self._literals.get(reference)) is not None:
+            if literal_include:
+                return False
+            excluded = True
+
+        for rule in self._candidates(reference):
+            if (rule.include or not excluded) and rule.matches(reference):
+                if rule.include:
+                    return False
+                excluded = True
+
+        return excluded
+
+
+def _is_exact(rule: ExclusionRule) -> bool:
+    """Return True if a reference rule matches nothing but its literal prefix.
+
+    Args:
+        rule (ExclusionRule): A rule with a regex.
+
+    Returns:
+        bool: True if the pattern has no wildcard or regex construct.
+
+    """
+
+    body = rule.pattern.removeprefix(_INCLUDE_PREFIX)
+
+    if body.startswith(_GLOB_PREFIX):
+        return not _GLOB_METACHARACTERS.intersection(body.removeprefix(_GLOB_PREFIX))
+
+    return not _REGEX_METACHARACTERS.intersection(body)
@@ -0,0 +1,148 @@
+"""Local file source of Cup data.
+
+When Cup runs on the same host as Home Assistant, it can write the output of
+``cup check -r json`` to a file, configured as ``file:///path/to/cup.json``
+instead of an HTTP address. Each poll then costs a ``stat`` call: the file is
+read and decoded again only when its inode, modification time or size changed.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Final
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+from homeassistant.util.json import json_loads
+
+from .exceptions import ClientConnectorError, ContentApiTypeError
+
+FILE_SCHEME: Final[str] = "file"
+
+
+def is_file_url(url: str) -> bool:
+    """Check whether an address designates a local file.
+
+    Args:
+        url (str): The address configured for the Cup server.
+
+    Returns:
+        bool: True for a ``file://`` URL.
+
+    """
+
+    return urlparse(url).scheme == FILE_SCHEME
+
+
+def file_url_path(url: str) -> str:
+    """Return the local path of a ``file://`` URL.
+
+    Args:
+        url (str): The ``file://`` URL.
+
+    Returns:
+        str: The path of the file.
+
+    """
+
+    return url2pathname(urlparse(url).path)
+
+
+class CupFileSource:
+    """Read the JSON output of Cup from a local file, only when the file changed.
+
+    The methods of this class do blocking I/O and must run in the executor.
+
+    Attributes:
+        path (str): The path of the file.
+
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize the source.
+
+        Args:
+            path (str): The path of the file written by Cup.
+
+        """
+        self.path = path
+        self._path = Path(path)
+
+        # Inode, modification time and size of the file when it was last decoded.
+        self._signature: tuple[int, int, int] | None = None
+
+    def invalidate(self) -> None:
+        """Forget the last file decoded, so that the next read decodes it again.
+
+        Returns:
+            None.
+
+        """
+
+        self._signature = None
+
+    def read(self) -> dict[str, Any]:
+        """Decode the file, whether it changed or not.
+
+        Returns:
+            dict[str, Any]: The payload, as served by the Cup ``/json`` endpoint.
+
+        Raises:
+            ClientConnectorError: If the file cannot be read.
+            ContentApiTypeError: If the file does not hold a JSON object.
+
+        """
+
+        self.invalidate()
+        data = self.read_if_changed()
+        return data if data is not None else {}
+
+    def read_if_changed(self) -> dict[str, Any] | None:
+        """Decode the file if it changed since it was last decoded.
+
+        A file being rewritten may be caught half-written: it then fails to decode
+        and is decoded again at the next read.
+
+        Returns:
+            dict[str, Any] | None: The payload, or None if the file did not change.
+
+        Raises:
+            ClientConnectorError: If the file cannot be read.
+            ContentApiTypeError: If the file does not hold a JSON object.
+
+        """
+
+        try:
+            stat = self._path.stat()
+            signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            if signature == self._signature:
+                return None
+            data = self._decode()
+        except OSError as err:
+            msg: str = f"Unable to read the Cup output file {self.path}: {err}"
+            raise ClientConnectorError(msg) from err
+        except ValueError as err:
+            msg = f"The Cup output file {self.path} does not hold valid JSON: {err}"
+            raise ContentApiTypeError(msg) from err
+
+        if not isinstance(data, dict):
+            msg = f"The Cup output file {self.path} does not hold a JSON object."
+            raise ContentApiTypeError(msg)
+
+        self._signature = signature
+        return data
+
+    def _decode(self) -> Any:
+        """Read and decode the file.
+
+        The file is read into memory before decoding, whatever its size: a file
+        mapped in memory and truncated meanwhile (``cup check -r json > file``
+        truncates it first) would crash the process when read past its new end.
+
+        Returns:
+            Any: The decoded JSON value.
+
+        """
+
+        with self._path.open("rb") as file:
+            return json_loads(file.read())
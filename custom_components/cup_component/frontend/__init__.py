@@ -1,18 +1,40 @@
 """JavaScript module registration for the cup_component Lovelace card."""
 
+from __future__ import annotations
+
+import asyncio
 import logging
-from pathlib import Path
-from typing import Any
+from typing import Any, Final
 
-from homeassistant.components.http import StaticPathConfig
 from homeassistant.components.lovelace.const import LOVELACE_DATA, MODE_STORAGE
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.event import async_call_later
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util.hass_dict import HassKey
 
-from ..const import INTEGRATION_VERSION, LOVELACE_CARD_NAME, LOVELACE_MODULE_URL, URL_BASE
+from ..const import DOMAIN, LOVELACE_CARD_NAME, LOVELACE_MODULE_URL
+from ..helper import async_get_integration_version
+from .view import async_register_card_view
 
 _LOGGER = logging.getLogger(__name__)
 
+# Shared registrar, so that the config entries (and reloads) register the card one at a time.
+_DATA_JS_MODULE: Final[HassKey[JSModuleRegistration]] = HassKey(f"{DOMAIN}_js_module")
+
+
+@callback
+def async_get_js_module_registration(hass: HomeAssistant) -> JSModuleRegistration:
+    """Return the registrar shared by all config entries, creating it on first use.
+
+    Args:
+        hass (HomeAssistant): The Home Assistant instance.
+
+    Returns:
+        JSModuleRegistration: The shared registrar.
+
+    """
+    if (registrar := hass.data.get(_DATA_JS_MODULE)) is None:
+        registrar = hass.data[_DATA_JS_MODULE] = JSModuleRegistration(hass)
+    return registrar
+
 
 class JSModuleRegistration:
     """Registers the cup_component JS card as a Lovelace resource."""
@@ -20,6 +42,8 @@ class JSModuleRegistration:
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize the registrar."""
         self.hass = hass
+        self._path_registered: bool = False
+        self._lock = asyncio.Lock()
 
     @property
     def _lovelace(self) -> Any:
@@ -27,12 +51,15 @@ class JSModuleRegistration:
         return self.hass.data.get(LOVELACE_DATA)
 
     async def async_register(self) -> None:
-        """Register the static HTTP path and the Lovelace resources.
+        """Register the card HTTP view and the Lovelace resources.
 
         Lovelace resource registration is skipped silently when HA is configured
         in YAML mode (resource_mode != MODE_STORAGE): resources must be declared
         manually in the YAML configuration in that case.
 
+        The resources are loaded first if no frontend client loaded them yet.
+        Concurrent calls are serialised, so that the resource is created once.
+
         Returns:
             None.
 
@@ -41,56 +68,48 @@ class JSModuleRegistration:
         lovelace = self._lovelace
         # Resource registration only works in Lovelace storage mode.
         # In YAML mode, the user must declare the resource manually.
-        if lovelace and lovelace.resource_mode == MODE_STORAGE:
-            await self._async_wait_for_lovelace_resources()
+        if not lovelace or lovelace.resource_mode != MODE_STORAGE:
+            return
+
+        async with self._lock:
+            await self._async_load_resources(lovelace.resources)
+            await self._async_register_modules()
 
     async def _async_register_path(self) -> None:
-        """Register the static HTTP path serving the www/ directory.
+        """Register the HTTP view serving the Lovelace card.
 
-        The path is registered once per HA session. On subsequent calls (e.g.
-        after an integration reload), the RuntimeError is caught and silently
-        ignored — the existing registration remains valid.
+        The view is registered once per HA session: HA provides no way to remove
+        a view, so subsequent calls (e.g. after an integration reload) keep the
+        existing registration.
 
         Returns:
             None.
 
         """
-        www_dir = Path(__file__).parent.parent / "www"
-        try:
-            await self.hass.http.async_register_static_paths(
-                [StaticPathConfig(URL_BASE, str(www_dir), cache_headers=False)]
-            )
-            _LOGGER.debug("Registered static path %s -> %s", URL_BASE, www_dir)
-        except RuntimeError:
-            # Path already registered (e.g. after a reload) — safe to ignore.
-            _LOGGER.debug("Static path already registered: %s", URL_BASE)
-
-    async def _async_wait_for_lovelace_resources(self) -> None:
-        """Wait until Lovelace resources are loaded before registering modules.
-
-        Polls every 5 seconds indefinitely until resources are available.
-        There is no retry limit: if Lovelace never loads, this will run forever.
+        if self._path_registered:
+            return
 
-        Returns:
-            None.
+        await async_register_card_view(self.hass)
+        self._path_registered = True
 
-        """
+    @staticmethod
+    async def _async_load_resources(resources: Any) -> None:
+        """Load the Lovelace resource collection, unless a frontend client already did.
 
-        async def _check_loaded(_now: Any) -> None:
-            """Check if Lovelace resources are loaded and register modules or reschedule.
+        Lovelace only loads its resources when a frontend client asks for them: they
+        are loaded here the way the ``lovelace/resources`` websocket command does,
+        so that the card is registered even when no browser is opened after a restart.
 
-            Returns:
-                None.
+        Args:
+            resources (Any): The Lovelace resource collection (storage mode).
 
-            """
-            lovelace = self._lovelace
-            if lovelace and lovelace.resources.loaded:
-                await self._async_register_modules()
-            else:
-                _LOGGER.debug("Lovelace resources not yet loaded, retrying in 5s")
-                async_call_later(self.hass, 5, _check_loaded)
+        Returns:
+            None.
 
-        await _check_loaded(None)
+        """
+        if not resources.loaded:
+            await resources.async_load()
+            resources.loaded = True
 
     async def _async_register_modules(self) -> None:
         """Add or update the JS module entry in Lovelace resources.
@@ -107,24 +126,25 @@ class JSModuleRegistration:
         if not lovelace:
             return
 
-        # Version is read from manifest.json at module load time.
+        # The version comes from the integration metadata cached by HA.
         # If the version changes between HA restarts, the resource URL is updated automatically.
-        # In dev environments, INTEGRATION_VERSION falls back to a Unix timestamp (see const.py),
+        # In dev environments, it falls back to a Unix timestamp (see async_get_integration_version),
         # which guarantees the resource is always refreshed.
-        versioned_url: str = f"{LOVELACE_MODULE_URL}?v={INTEGRATION_VERSION}"
+        version = await async_get_integration_version(self.hass)
+        versioned_url: str = f"{LOVELACE_MODULE_URL}?v={version}"
 
         for resource in lovelace.resources.async_items():
             if resource["url"].split("?")[0] == LOVELACE_MODULE_URL:
                 # Module already registered — update URL if version has changed.
-                if self._get_version(resource["url"]) != INTEGRATION_VERSION:
-                    _LOGGER.info("Updating %s to version %s", LOVELACE_CARD_NAME, INTEGRATION_VERSION)
+                if self._get_version(resource["url"]) != version:
+                    _LOGGER.info("Updating %s to version %s", LOVELACE_CARD_NAME, version)
                     await lovelace.resources.async_update_item(
                         resource["id"],
                         {"res_type": "module", "url": versioned_url},
                     )
                 return
 
-        _LOGGER.info("Registering Lovelace resource: %s v%s", LOVELACE_MODULE_URL, INTEGRATION_VERSION)
+        _LOGGER.info("Registering Lovelace resource: %s v%s", LOVELACE_MODULE_URL, version)
         await lovelace.resources.async_create_item({"res_type": "module", "url": versioned_url})
 
     @staticmethod
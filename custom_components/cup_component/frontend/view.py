@@ -0,0 +1,149 @@
+"""HTTP view serving the cup_component Lovelace card with precompressed variants."""
+
+from __future__ import annotations
+
+import gzip
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING, Final
+
+from aiohttp import hdrs, web
+
+from homeassistant.components.http import HomeAssistantView
+
+from ..const import DOMAIN, LOVELACE_CARD_JS, LOVELACE_MODULE_URL
+from ..helper import async_get_integration_version
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+_WWW_DIR: Final[Path] = Path(__file__).parent.parent / "www"
+
+# Encodings served when a precompressed variant exists, in order of preference.
+# The file suffix of each variant is the value (e.g. cup-component-card.js.br).
+_ENCODINGS: Final[dict[str, str]] = {
+    "br": ".br",
+    "gzip": ".gz",
+}
+
+# The Lovelace resource URL carries ?v=<version>, so a versioned response never changes.
+_CACHE_CONTROL_VERSIONED: Final[str] = "public, max-age=31536000, immutable"
+_CACHE_CONTROL_UNVERSIONED: Final[str] = "no-cache"
+
+
+def _load_card_variants() -> dict[str, bytes]:
+    """Read the card and its precompressed variants from the www/ directory.
+
+    The release build ships ``.br`` and ``.gz`` files next to the card. When the
+    gzip variant is missing (e.g. dev environment), it is generated in memory.
+    This function does blocking I/O and must run in the executor.
+
+    Returns:
+        dict[str, bytes]: The card content keyed by content encoding ("identity", "br", "gzip").
+
+    """
+
+    card_path = _WWW_DIR / LOVELACE_CARD_JS
+    variants: dict[str, bytes] = {"identity": card_path.read_bytes()}
+
+    for encoding, suffix in _ENCODINGS.items():
+        variant_path = card_path.with_name(card_path.name + suffix)
+        if variant_path.is_file():
+            variants[encoding] = variant_path.read_bytes()
+
+    if "gzip" not in variants:
+        variants["gzip"] = gzip.compress(variants["identity"], compresslevel=9)
+
+    return variants
+
+
+def _accepted_encodings(header: str) -> set[str]:
+    """Parse an Accept-Encoding header into the set of accepted encodings.
+
+    Args:
+        header (str): The raw Accept-Encoding header value.
+
+    Returns:
+        set[str]: The accepted encodings, excluding those explicitly refused with ``q=0``.
+
+    """
+
+    accepted: set[str] = set()
+
+    for item in header.split(","):
+        encoding, _, params = item.strip().partition(";")
+        quality = params.strip().removeprefix("q=")
+        if encoding and quality not in {"0", "0.0", "0.00", "0.000"}:
+            accepted.add(encoding.strip().lower())
+
+    return accepted
+
+
+class CupComponentCardView(HomeAssistantView):
+    """Serve the Lovelace card, picking a precompressed variant from Accept-Encoding."""
+
+    url = LOVELACE_MODULE_URL
+    name = f"{DOMAIN}:card"
+    requires_auth = False
+
+    def __init__(self, variants: dict[str, bytes], version: str) -> None:
+        """Initialize the view with the card content loaded in memory.
+
+        Args:
+            variants (dict[str, bytes]): The card content keyed by content encoding.
+            version (str): The integration version carried by the Lovelace resource URL.
+
+        """
+        self._variants = variants
+        self._version = version
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the card, compressed when the client supports it.
+
+        Args:
+            request (web.Request): The incoming HTTP request.
+
+        Returns:
+            web.Response: The card JavaScript response.
+
+        """
+
+        versioned = request.query.get("v") == self._version
+        headers: dict[str, str] = {
+            hdrs.CACHE_CONTROL: _CACHE_CONTROL_VERSIONED if versioned else _CACHE_CONTROL_UNVERSIONED,
+            hdrs.VARY: hdrs.ACCEPT_ENCODING,
+        }
+
+        accepted = _accepted_encodings(request.headers.get(hdrs.ACCEPT_ENCODING, ""))
+        body = self._variants["identity"]
+
+        for encoding in _ENCODINGS:
+            if encoding in accepted and encoding in self._variants:
+                body = self._variants[encoding]
+                headers[hdrs.CONTENT_ENCODING] = encoding
+                break
+
+        return web.Response(
+            body=body,
+            content_type="application/javascript",
+            charset="utf-8",
+            headers=headers,
+        )
+
+
+async def async_register_card_view(hass: HomeAssistant) -> None:
+    """Load the card variants and register the view serving them.
+
+    Args:
+        hass (HomeAssistant): The Home Assistant instance.
+
+    Returns:
+        None.
+
+    """
+
+    variants = await hass.async_add_executor_job(_load_card_variants)
+    hass.http.register_view(CupComponentCardView(variants, await async_get_integration_version(hass)))
+    _LOGGER.debug("Registered card view %s (%s)", LOVELACE_MODULE_URL, ", ".join(sorted(variants)))
@@ -1,6 +1,29 @@
 """Utility functions for the Cup Component integration."""
 
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Any, Final
+
+from homeassistant.core import callback
+from homeassistant.loader import async_get_integration
 from homeassistant.util import slugify
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+from .endpoint import normalize_url
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+# Payloads fetched by the config flow, keyed by normalised URL, waiting to be reused by the entry setup.
+_DATA_PREFETCHED: Final[HassKey[dict[str, tuple[float, dict[str, Any]]]]] = HassKey(f"{DOMAIN}_prefetched")
+
+# Integration version, resolved once per HA session (see async_get_integration_version).
+_DATA_VERSION: Final[HassKey[str]] = HassKey(f"{DOMAIN}_version")
+
+# A prefetched payload older than this is considered outdated and is not reused.
+_PREFETCHED_MAX_AGE: Final[float] = 60.0
 
 
 def create_entity_id_name(input_string: str) -> str:
@@ -34,3 +57,67 @@ def create_entity_id_name(input_string: str) -> str:
 
     # Recombine with the first "." preserved
     return f"{first_part}.{second_part}"
+
+
+@callback
+def async_store_prefetched_payload(hass: HomeAssistant, url: str, payload: dict[str, Any]) -> None:
+    """Keep a payload validated by the config flow so that the entry setup can reuse it.
+
+    Args:
+        hass (HomeAssistant): The Home Assistant instance.
+        url (str): The URL of the Cup server the payload was fetched from.
+        payload (dict[str, Any]): The raw payload returned by the Cup ``/json`` endpoint.
+
+    Returns:
+        None.
+
+    """
+
+    hass.data.setdefault(_DATA_PREFETCHED, {})[normalize_url(url)] = (time.monotonic(), payload)
+
+
+@callback
+def async_pop_prefetched_payload(hass: HomeAssistant, url: str) -> dict[str, Any] | None:
+    """Return and forget the payload prefetched for a URL, if it is recent enough.
+
+    Args:
+        hass (HomeAssistant): The Home Assistant instance.
+        url (str): The URL of the Cup server.
+
+    Returns:
+        dict[str, Any] | None: The raw payload, or None if there is none or it is outdated.
+
+    """
+
+    stored = hass.data.get(_DATA_PREFETCHED, {}).pop(normalize_url(url), None)
+
+    if stored is None or time.monotonic() - stored[0] > _PREFETCHED_MAX_AGE:
+        return None
+
+    return stored[1]
+
+
+async def async_get_integration_version(hass: HomeAssistant) -> str:
+    """Return the integration version, used to version the Lovelace resource.
+
+    The version comes from the integration metadata already loaded and cached
+    by Home Assistant, so manifest.json is not read again. When the version is
+    missing or set to the default placeholder (dev environment only), a Unix
+    timestamp is used instead, which guarantees the resource is refreshed on
+    every restart. The result is stable for the whole HA session.
+
+    Args:
+        hass (HomeAssistant): The Home Assistant instance.
+
+    Returns:
+        str: The integration version.
+
+    """
+
+    if (version := hass.data.get(_DATA_VERSION)) is None:
+        integration = await async_get_integration(hass, DOMAIN)
+        manifest_version = str(integration.version or "")
+        version = manifest_version if manifest_version and manifest_version != "0.0.0" else str(int(time.time()))
+        hass.data[_DATA_VERSION] = version
+
+    return version
@@ -0,0 +1,302 @@
+"""Long-term statistics of the Cup Component counters.
+
+The counters of each Cup server, and the number of monitored images and of
+pending updates per registry, are imported into the recorder as external
+statistics: one row per hour with a time-weighted mean, a minimum and a
+maximum. Dashboards covering months of history read these rows instead of
+every state change of the counter sensors.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMeanType, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_utc_time_change
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+    from .snapshot import CupSnapshot
+
+
+@dataclass(slots=True)
+class _Aggregate:
+    """Running aggregate of one counter over the current hour."""
+
+    weighted_sum: float
+    duration: float
+    minimum: int
+    maximum: int
+
+    def add_value(self, value: int) -> None:
+        """Take a new value into account in the minimum and the maximum."""
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+
+def _period_start(moment: datetime) -> datetime:
+    """Return the start of the hour containing a moment (external statistics are hourly)."""
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+class CupStatistics:
+    """Aggregate the counters of a Cup server per hour and import them into the recorder.
+
+    The mean is weighted by the time each value was held, so that it does not
+    depend on the polling interval, and refreshes that change nothing (which do
+    not notify the coordinator listeners) are accounted for. The row of the
+    current hour is imported again each time a counter changes, and a last time
+    when the hour ends.
+
+    The hour the aggregation starts in is not imported: after a restart or a
+    reload, its row already holds the counters aggregated before, which an
+    aggregate of the rest of the hour only would overwrite.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        name: str,
+        coordinator: DataUpdateCoordinator[CupSnapshot],
+    ) -> None:
+        """Initialize the aggregation for one Cup server.
+
+        Args:
+            hass (HomeAssistant): The Home Assistant instance.
+            entry_id (str): The ID of the config entry of the Cup server, which the statistic IDs derive from.
+            name (str): The human-readable name of the Cup server, used in the names of the statistics.
+            coordinator (DataUpdateCoordinator[CupSnapshot]): The coordinator publishing the data of the server.
+
+        """
+        self.hass = hass
+        self._name = name
+        self._coordinator = coordinator
+        # Names are not unique: two servers with the same name must not share their statistics.
+        self._prefix = f"{DOMAIN}:{slugify(entry_id)}"
+
+        now = dt_util.utcnow()
+        self._period_start: datetime = _period_start(now)
+        self._first_period_start: datetime = self._period_start
+        self._since: datetime = now
+        self._generation: int | None = None
+
+        self._values: dict[str, int] = {}
+        self._metadata: dict[str, StatisticMetaData] = {}
+        self._aggregates: dict[str, _Aggregate] = {}
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Record the current counters and follow the coordinator updates.
+
+        Returns:
+            CALLBACK_TYPE: A callback stopping the aggregation, which imports the current hour a last time.
+
+        """
+
+        unsubscribe_coordinator = self._coordinator.async_add_listener(self._async_handle_update)
+        unsubscribe_timer = async_track_utc_time_change(self.hass, self._async_period_elapsed, minute=0, second=0)
+        self._async_handle_update()
+
+        @callback
+        def _async_stop() -> None:
+            """Stop the aggregation and flush the current hour."""
+            unsubscribe_coordinator()
+            unsubscribe_timer()
+            self._accumulate(dt_util.utcnow())
+            self._async_import()
+
+        return _async_stop
+
+    def _counters(self, snapshot: CupSnapshot) -> dict[str, tuple[str, int]]:
+        """Return the counters of a snapshot, including the per-registry breakdowns.
+
+        Args:
+            snapshot (CupSnapshot): The data of the Cup server.
+
+        Returns:
+            dict[str, tuple[str, int]]: The name and the value of each counter, keyed by statistic ID.
+
+        """
+
+        counters: dict[str, tuple[str, int]] = {
+            f"{self._prefix}_{key}": (f"{self._name} {key.replace('_', ' ')}", value)
+            for key, value in snapshot.metrics.items()
+        }
+
+        for registry, (monitored, updates) in snapshot.registry_breakdown().items():
+            registry_id = slugify(registry)
+            counters[f"{self._prefix}_monitored_images_{registry_id}"] = (
+                f"{self._name} monitored images ({registry})",
+                monitored,
+            )
+            counters[f"{self._prefix}_updates_available_{registry_id}"] = (
+                f"{self._name} updates available ({registry})",
+                updates,
+            )
+
+        return counters
+
+    @callback
+    def _async_handle_update(self) -> None:
+        """Take the counters of a new snapshot into account.
+
+        Returns:
+            None.
+
+        """
+
+        snapshot = self._coordinator.data
+
+        if snapshot is None or snapshot.generation == self._generation:
+            return
+
+        self._generation = snapshot.generation
+        self._accumulate(dt_util.utcnow())
+
+        counters = self._counters(snapshot)
+
+        # Counters that disappeared (e.g. no image left in a registry) drop to zero.
+        for statistic_id in self._values.keys() - counters.keys():
+            self._set_value(statistic_id, 0)
+
+        for statistic_id, (name, value) in counters.items():
+            if statistic_id not in self._metadata:
+                self._metadata[statistic_id] = StatisticMetaData(
+                    mean_type=StatisticMeanType.ARITHMETIC,
+                    has_sum=False,
+                    name=name,
+                    source=DOMAIN,
+                    statistic_id=statistic_id,
+                    unit_class=None,
+                    unit_of_measurement=None,
+                )
+            self._set_value(statistic_id, value)
+
+        self._async_import()
+
+    def _set_value(self, statistic_id: str, value: int) -> None:
+        """Change the current value of a counter.
+
+        Args:
+            statistic_id (str): The statistic ID of the counter.
+            value (int): The new value.
+
+        Returns:
+            None.
+
+        """
+
+        self._values[statistic_id] = value
+
+        if (aggregate := self._aggregates.get(statistic_id)) is None:
+            self._aggregates[statistic_id] = _Aggregate(weighted_sum=0.0, duration=0.0, minimum=value, maximum=value)
+        else:
+            aggregate.add_value(value)
+
+    def _accumulate(self, until: datetime) -> None:
+        """Weight the current values by the time elapsed since the last accumulation.
+
+        Args:
+            until (datetime): The end of the elapsed time.
+
+        Returns:
+            None.
+
+        """
+
+        elapsed = max((until - self._since).total_seconds(), 0.0)
+        self._since = until
+
+        for statistic_id, value in self._values.items():
+            aggregate = self._aggregates[statistic_id]
+            aggregate.weighted_sum += value * elapsed
+            aggregate.duration += elapsed
+
+    @callback
+    def _async_period_elapsed(self, now: datetime) -> None:
+        """Close the hour that just ended and start a new one.
+
+        Args:
+            now (datetime): The time the timer fired, just after the start of the new hour.
+
+        Returns:
+            None.
+
+        """
+
+        period_start = _period_start(now)
+
+        if period_start <= self._period_start:
+            return
+
+        self._accumulate(period_start)
+        self._async_import()
+
+        self._period_start = period_start
+        self._aggregates = {
+            statistic_id: _Aggregate(weighted_sum=0.0, duration=0.0, minimum=value, maximum=value)
+            for statistic_id, value in self._values.items()
+        }
+
+    @callback
+    def _async_import(self) -> None:
+        """Import (or overwrite) the row of the current hour of every counter.
+
+        No-op during the hour the aggregation started in (see the class docstring).
+
+        Returns:
+            None.
+
+        """
+
+        if self._period_start == self._first_period_start:
+            return
+
+        for statistic_id, aggregate in self._aggregates.items():
+            value = self._values[statistic_id]
+            mean = aggregate.weighted_sum / aggregate.duration if aggregate.duration > 0 else float(value)
+            async_add_external_statistics(
+                self.hass,
+                self._metadata[statistic_id],
+                [
+                    StatisticData(
+                        start=self._period_start,
+                        mean=mean,
+                        min=aggregate.minimum,
+                        max=aggregate.maximum,
+                    )
+                ],
+            )
+
+
+@callback
+def async_setup_statistics(
+    hass: HomeAssistant,
+    entry_id: str,
+    name: str,
+    coordinator: DataUpdateCoordinator[CupSnapshot],
+) -> CALLBACK_TYPE:
+    """Start importing the counters of a Cup server as long-term statistics.
+
+    Args:
+        hass (HomeAssistant): The Home Assistant instance.
+        entry_id (str): The ID of the config entry of the Cup server.
+        name (str): The human-readable name of the Cup server.
+        coordinator (DataUpdateCoordinator[CupSnapshot]): The coordinator publishing the data of the server.
+
+    Returns:
+        CALLBACK_TYPE: A callback stopping the import.
+
+    """
+
+    return CupStatistics(hass, entry_id, name, coordinator).async_start()
@@ -0,0 +1,219 @@
+"""Persistent index of the updates pending on a Cup server, by the time they were first seen.
+
+For each image with an update available, the index keeps the time the update
+was first seen and a digest of the local image (its digests and, for version
+updates, its current version). When the local image changes (e.g. the
+container was updated) and an update is still reported, it is a new update
+and its first-seen time is reset. The index is saved with Home
+Assistant's ``Store`` (debounced writes), so that ages survive restarts.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, Any, Final
+
+from homeassistant.core import callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from datetime import datetime, timedelta
+
+    from homeassistant.core import HomeAssistant
+
+    from .snapshot import CupSnapshot
+
+_STORAGE_VERSION: Final[int] = 1
+
+# Changes are written at most once per this many seconds.
+_SAVE_DELAY: Final[int] = 30
+
+
+def _storage_key(entry_id: str) -> str:
+    """Return the storage key of the index of a config entry."""
+    return f"{DOMAIN}.{entry_id}.pending_updates"
+
+
+def _local_digest(image: dict[str, Any]) -> str:
+    """Return a compact digest of the local image, used to detect that it was updated.
+
+    Version updates carry no local digests: their current version is used instead.
+
+    Args:
+        image (dict[str, Any]): An image object returned by the Cup API.
+
+    Returns:
+        str: The sorted local digests, joined, followed by ``@`` and the current version
+            when Cup reports one (empty when Cup reports neither).
+
+    """
+
+    info = (image.get("result") or {}).get("info") or {}
+    digest = ",".join(sorted(info.get("local_digests") or []))
+
+    if (current_version := info.get("current_version")) is not None:
+        digest = f"{digest}@{current_version}"
+
+    return digest
+
+
+class PendingUpdateIndex:
+    """First-seen time of each pending update of a Cup server.
+
+    Attributes:
+        entries (dict[str, tuple[float, str]]): The first-seen time (Unix timestamp) and
+            the local digest of each pending update, by image reference.
+
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize an empty index.
+
+        Args:
+            hass (HomeAssistant): The Home Assistant instance.
+            entry_id (str): The ID of the config entry of the Cup server.
+
+        """
+        self._store: Store[dict[str, Any]] = Store(hass, _STORAGE_VERSION, _storage_key(entry_id))
+        self.entries: dict[str, tuple[float, str]] = {}
+        self._generation: int | None = None
+
+        # First-seen times, oldest first, kept sorted for the percentiles.
+        self._first_seen: list[float] = []
+
+        # True while changes wait for the delayed save.
+        self._unsaved: bool = False
+
+    async def async_load(self) -> None:
+        """Load the index saved during a previous run.
+
+        Returns:
+            None.
+
+        """
+
+        stored = await self._store.async_load()
+
+        if stored is None:
+            return
+
+        self.entries = {
+            reference: (float(first_seen), str(digest))
+            for reference, (first_seen, digest) in stored.get("images", {}).items()
+        }
+        self._first_seen = sorted(first_seen for first_seen, _ in self.entries.values())
+
+    @callback
+    def async_update(self, snapshot: CupSnapshot) -> None:
+        """Record the updates pending in a snapshot.
+
+        Only new snapshot content is processed. New pending updates are added with
+        the current time, resolved ones are dropped, and the others keep their
+        first-seen time unless the local image changed. A save is scheduled when
+        something changed.
+
+        Args:
+            snapshot (CupSnapshot): The data of the Cup server.
+
+        Returns:
+            None.
+
+        """
+
+        if snapshot.generation == self._generation:
+            return
+
+        self._generation = snapshot.generation
+        now = dt_util.utcnow().timestamp()
+        entries: dict[str, tuple[float, str]] = {}
+
+        for image in snapshot.views.get("updates_available", ()):
+            reference: str = image.get("reference", "")
+            digest = _local_digest(image)
+            previous = self.entries.get(reference)
+            if previous is None or previous[1] not in (digest, ""):
+                entries[reference] = (now, digest)
+            else:
+                # An empty digest was saved before current versions were tracked: the update is not new.
+                entries[reference] = (previous[0], digest)
+
+        if entries == self.entries:
+            return
+
+        self.entries = entries
+        self._first_seen = sorted(first_seen for first_seen, _ in entries.values())
+        self._unsaved = True
+        self._store.async_delay_save(self._data_to_save, _SAVE_DELAY)
+
+    async def async_flush(self) -> None:
+        """Write the changes waiting for the delayed save at once, and cancel it.
+
+        Called when the entry is unloaded, so that a reload reads the latest index
+        and no delayed write recreates the file of a removed entry.
+
+        Returns:
+            None.
+
+        """
+
+        if self._unsaved:
+            await self._store.async_save(self._data_to_save())
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data written by the store.
+
+        Returns:
+            dict[str, Any]: The index, in a compact form.
+
+        """
+
+        self._unsaved = False
+        return {"images": {reference: [first_seen, digest] for reference, (first_seen, digest) in self.entries.items()}}
+
+    @property
+    def oldest(self) -> datetime | None:
+        """Return the first-seen time of the oldest pending update, or None if there is none."""
+
+        if not self._first_seen:
+            return None
+
+        return dt_util.utc_from_timestamp(self._first_seen[0])
+
+    def age_percentile(self, percentile: float, now: datetime) -> timedelta | None:
+        """Return a percentile of the age of the pending updates (nearest-rank method).
+
+        Args:
+            percentile (float): The percentile, between 0 and 100.
+            now (datetime): The time the ages are computed at.
+
+        Returns:
+            timedelta | None: The age, or None if there is no pending update.
+
+        """
+
+        count = len(self._first_seen)
+
+        if not count:
+            return None
+
+        # The k-th youngest update is the k-th from the end of the list sorted oldest first.
+        rank = max(math.ceil(percentile / 100 * count), 1)
+        return now - dt_util.utc_from_timestamp(self._first_seen[count - rank])
+
+
+async def async_remove_pending_index(hass: HomeAssistant, entry_id: str) -> None:
+    """Delete the saved index of a config entry.
+
+    Args:
+        hass (HomeAssistant): The Home Assistant instance.
+        entry_id (str): The ID of the removed config entry.
+
+    Returns:
+        None.
+
+    """
+
+    await Store[dict[str, Any]](hass, _STORAGE_VERSION, _storage_key(entry_id)).async_remove()
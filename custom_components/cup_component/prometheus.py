@@ -0,0 +1,190 @@
+"""Prometheus exporter of the Cup Component counters.
+
+The view renders the counters of every loaded Cup server in the Prometheus
+text exposition format, straight from the in-memory snapshots: per bucket, per
+registry, plus the stale flag and the time of the last check. Scrapes do not
+go through the state machine, and the text is rendered again only when a
+snapshot changes.
+
+The view requires authentication: Prometheus scrapes it with a long-lived
+access token (``authorization: {credentials: <token>}`` in the scrape config).
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Final
+
+from aiohttp import hdrs, web
+
+from homeassistant.components.http import KEY_HASS, HomeAssistantView
+from homeassistant.const import CONF_NAME
+from homeassistant.core import callback
+
+from .const import DOMAIN, URL_BASE
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from homeassistant.core import HomeAssistant
+
+    from . import CupComponentConfigEntry
+    from .snapshot import CupSnapshot
+
+_LOGGER = logging.getLogger(__name__)
+
+METRICS_URL: Final[str] = f"{URL_BASE}/metrics"
+
+_CONTENT_TYPE: Final[str] = "text/plain; version=0.0.4; charset=utf-8"
+
+# Name and help text of each metric family, in rendering order.
+_FAMILIES: Final[dict[str, str]] = {
+    "cup_images": "Number of images in each bucket of a Cup server.",
+    "cup_monitored_images": "Number of images monitored by a Cup server (excluded images not included).",
+    "cup_updates_available": "Number of images with an update available on a Cup server.",
+    "cup_registry_monitored_images": "Number of monitored images of each registry.",
+    "cup_registry_updates_available": "Number of images with an update available of each registry.",
+    "cup_stale": "1 while the last good data is served because the Cup server fails to answer.",
+    "cup_last_checked_timestamp_seconds": "Time of the last check performed by the Cup server.",
+}
+
+# What the rendered text depends on, for each loaded entry.
+type _CacheKey = tuple[tuple[str, str, int, bool, datetime | None], ...]
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text exposition format.
+
+    Args:
+        value (str): The raw label value.
+
+    Returns:
+        str: The value with backslashes, double quotes and line feeds escaped.
+
+    """
+
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _render_snapshot(samples: dict[str, list[str]], server: str, entry_id: str, snapshot: CupSnapshot) -> None:
+    """Add the samples of one Cup server to the metric families.
+
+    Args:
+        samples (dict[str, list[str]]): The sample lines of each metric family, completed in place.
+        server (str): The name of the Cup server.
+        entry_id (str): The ID of the config entry of the Cup server.
+        snapshot (CupSnapshot): The data of the Cup server.
+
+    Returns:
+        None.
+
+    """
+
+    labels = f'server="{_escape(server)}",entry_id="{entry_id}"'
+
+    for bucket, images in snapshot.images.items():
+        samples["cup_images"].append(f'cup_images{{{labels},bucket="{bucket}"}} {len(images)}')
+
+    for key in ("monitored_images", "updates_available"):
+        samples[f"cup_{key}"].append(f"cup_{key}{{{labels}}} {snapshot.metrics.get(key, 0)}")
+
+    for registry, (monitored, updates) in sorted(snapshot.registry_breakdown().items()):
+        registry_labels = f'{labels},registry="{_escape(registry)}"'
+        samples["cup_registry_monitored_images"].append(
+            f"cup_registry_monitored_images{{{registry_labels}}} {monitored}"
+        )
+        samples["cup_registry_updates_available"].append(
+            f"cup_registry_updates_available{{{registry_labels}}} {updates}"
+        )
+
+    samples["cup_stale"].append(f"cup_stale{{{labels}}} {int(snapshot.stale)}")
+
+    if snapshot.last_checked is not None:
+        samples["cup_last_checked_timestamp_seconds"].append(
+            f"cup_last_checked_timestamp_seconds{{{labels}}} {snapshot.last_checked.timestamp()}"
+        )
+
+
+def render_metrics(entries: list[CupComponentConfigEntry]) -> str:
+    """Render the counters of Cup servers in the Prometheus text exposition format.
+
+    Args:
+        entries (list[CupComponentConfigEntry]): The loaded config entries.
+
+    Returns:
+        str: The exposition text, each metric family with its HELP and TYPE lines.
+
+    """
+
+    samples: dict[str, list[str]] = {family: [] for family in _FAMILIES}
+
+    for entry in entries:
+        _render_snapshot(samples, str(entry.data[CONF_NAME]), entry.entry_id, entry.runtime_data.coordinator.data)
+
+    lines: list[str] = []
+
+    for family, description in _FAMILIES.items():
+        if samples[family]:
+            lines.extend((f"# HELP {family} {description}", f"# TYPE {family} gauge", *samples[family]))
+
+    return "\n".join(lines) + "\n"
+
+
+class CupMetricsView(HomeAssistantView):
+    """Serve the counters of the Cup servers to Prometheus."""
+
+    url = METRICS_URL
+    name = f"{DOMAIN}:metrics"
+    requires_auth = True
+
+    def __init__(self) -> None:
+        """Initialize the view with an empty cache."""
+        self._cache_key: _CacheKey | None = None
+        self._body: bytes = b""
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the counters, rendered again only if a snapshot changed since the last scrape.
+
+        Args:
+            request (web.Request): The incoming HTTP request.
+
+        Returns:
+            web.Response: The exposition text.
+
+        """
+
+        hass = request.app[KEY_HASS]
+        entries: list[CupComponentConfigEntry] = hass.config_entries.async_loaded_entries(DOMAIN)
+
+        cache_key: _CacheKey = tuple(
+            (
+                entry.entry_id,
+                str(entry.data[CONF_NAME]),
+                entry.runtime_data.coordinator.data.generation,
+                entry.runtime_data.coordinator.data.stale,
+                entry.runtime_data.coordinator.data.last_checked,
+            )
+            for entry in entries
+        )
+
+        if cache_key != self._cache_key:
+            self._body = render_metrics(entries).encode()
+            self._cache_key = cache_key
+
+        return web.Response(body=self._body, headers={hdrs.CONTENT_TYPE: _CONTENT_TYPE})
+
+
+@callback
+def async_register_metrics_view(hass: HomeAssistant) -> None:
+    """Register the view serving the counters to Prometheus.
+
+    Args:
+        hass (HomeAssistant): The Home Assistant instance.
+
+    Returns:
+        None.
+
+    """
+
+    hass.http.register_view(CupMetricsView())
+    _LOGGER.debug("Registered metrics view %s", METRICS_URL)
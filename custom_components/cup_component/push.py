@@ -0,0 +1,117 @@
+"""Push mode: Cup (or a sidecar) notifies Home Assistant through a webhook.
+
+The webhook accepts two kinds of POST requests:
+
+- the JSON output of Cup (as served by ``/api/v3/json``), categorised at once
+  without any request to the Cup server;
+- an empty body, or a JSON object without ``images`` (e.g. ``{"event": "changed"}``),
+  asking the coordinator to fetch the data.
+
+The webhook only accepts requests from the local network. Polling is slowed
+down to a safety net while push mode is enabled (see ``_get_update_interval``
+in ``__init__``).
+"""
+
+from __future__ import annotations
+
+from http import HTTPStatus
+import logging
+from typing import TYPE_CHECKING
+
+from aiohttp import hdrs, web
+
+from homeassistant.components import webhook
+from homeassistant.const import CONF_NAME, CONF_WEBHOOK_ID
+from homeassistant.core import callback
+from homeassistant.util.json import json_loads
+
+from .const import DOMAIN
+from .exceptions import ContentApiTypeError
+
+if TYPE_CHECKING:
+    from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+
+    from . import CupComponentConfigEntry
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def async_setup_push(hass: HomeAssistant, entry: CupComponentConfigEntry) -> CALLBACK_TYPE:
+    """Register the webhook of a Cup server.
+
+    Args:
+        hass (HomeAssistant): The Home Assistant instance.
+        entry (CupComponentConfigEntry): The loaded config entry, with a webhook ID.
+
+    Returns:
+        CALLBACK_TYPE: A function unregistering the webhook.
+
+    """
+
+    webhook_id: str = entry.data[CONF_WEBHOOK_ID]
+    api = entry.runtime_data.api
+    coordinator = entry.runtime_data.coordinator
+
+    async def _async_handle_webhook(
+        hass: HomeAssistant,
+        webhook_id: str,  # noqa: ARG001 # pylint: disable=unused-argument
+        request: web.Request,
+    ) -> web.Response:
+        """Handle a push of the Cup server.
+
+        Args:
+            hass (HomeAssistant): The Home Assistant instance.
+            webhook_id (str): The ID of the webhook (unused, there is one webhook per entry).
+            request (web.Request): The incoming HTTP request.
+
+        Returns:
+            web.Response: 200 when a payload was categorised, 202 when a refresh was requested, 400 for an invalid payload.
+
+        """
+
+        body = await request.read()
+
+        try:
+            data = json_loads(body) if body.strip() else {}
+        except ValueError:
+            return web.Response(status=HTTPStatus.BAD_REQUEST, text="Invalid JSON.")
+
+        if not isinstance(data, dict):
+            return web.Response(status=HTTPStatus.BAD_REQUEST, text="Expected a JSON object.")
+
+        # Payloads fetched before the push, even for another entry using the same Cup server, are outdated.
+        api.invalidate_shared_payload()
+
+        if "images" not in data:
+            _LOGGER.debug("Change notified for %s, requesting a refresh", entry.data[CONF_NAME])
+            entry.async_create_task(hass, coordinator.async_request_refresh())
+            return web.Response(status=HTTPStatus.ACCEPTED)
+
+        try:
+            await api.async_load_payload(data)
+        except ContentApiTypeError as err:
+            return web.Response(status=HTTPStatus.BAD_REQUEST, text=err.message)
+
+        _LOGGER.debug("Payload pushed for %s (%d images)", entry.data[CONF_NAME], len(data["images"]))
+
+        # Also postpones the safety-net poll.
+        coordinator.async_set_updated_data(api.snapshot)
+        return web.Response(status=HTTPStatus.OK)
+
+    webhook.async_register(
+        hass,
+        DOMAIN,
+        f"Cup {entry.data[CONF_NAME]}",
+        webhook_id,
+        _async_handle_webhook,
+        allowed_methods=[hdrs.METH_POST],
+        local_only=True,
+    )
+
+    @callback
+    def _async_unregister() -> None:
+        """Unregister the webhook."""
+        webhook.async_unregister(hass, webhook_id)
+
+    return _async_unregister
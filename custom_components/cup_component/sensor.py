@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any, Final
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -10,7 +11,10 @@ from homeassistant.components.sensor import (
     SensorEntityDescription,
     SensorStateClass,
 )
-from homeassistant.const import CONF_NAME, EntityCategory
+from homeassistant.const import CONF_NAME, EntityCategory, UnitOfInformation, UnitOfTime
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util
 
 from .entity import CupComponentEntity
 from .helper import create_entity_id_name
@@ -25,8 +29,9 @@ if TYPE_CHECKING:
 
     from . import CupComponentConfigEntry, CupComponentData
     from .api import CupApi
+    from .snapshot import CupSnapshot
 
-# Keys corresponding to numeric metrics stored in cache_metrics
+# Keys corresponding to numeric metrics stored in the snapshot
 _METRIC_SENSOR_KEYS: tuple[str, ...] = (
     "major_updates",
     "minor_updates",
@@ -39,6 +44,20 @@ _METRIC_SENSOR_KEYS: tuple[str, ...] = (
     "excluded_images",
 )
 
+# Percentile of the age of the pending updates reported by each age sensor
+_PENDING_AGE_PERCENTILES: Final[dict[str, float]] = {
+    "pending_age_median": 50,
+    "pending_age_p90": 90,
+}
+
+# Ages grow without new data: refreshes with unchanged content do not notify
+# the entities, so these sensors update themselves on a timer.
+_TIME_DEPENDENT_KEYS: Final[frozenset[str]] = frozenset({"data_age", *_PENDING_AGE_PERCENTILES})
+_AGE_REFRESH_INTERVAL: Final[timedelta] = timedelta(minutes=1)
+
+# Images listed in the attributes of a sensor while the data is over the memory budget
+_OVER_BUDGET_IMAGES_LIMIT: Final[int] = 25
+
 SENSOR_TYPES: tuple[SensorEntityDescription, ...] = (
     SensorEntityDescription(
         key="major_updates",
@@ -91,6 +110,44 @@ SENSOR_TYPES: tuple[SensorEntityDescription, ...] = (
         translation_key="excluded_images",
         state_class=SensorStateClass.MEASUREMENT,
     ),
+    SensorEntityDescription(
+        key="data_age",
+        translation_key="data_age",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    SensorEntityDescription(
+        key="memory_footprint",
+        translation_key="memory_footprint",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        suggested_unit_of_measurement=UnitOfInformation.KIBIBYTES,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    SensorEntityDescription(
+        key="oldest_pending_update",
+        translation_key="oldest_pending_update",
+        device_class=SensorDeviceClass.TIMESTAMP,
+    ),
+    SensorEntityDescription(
+        key="pending_age_median",
+        translation_key="pending_age_median",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_unit_of_measurement=UnitOfTime.DAYS,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="pending_age_p90",
+        translation_key="pending_age_p90",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_unit_of_measurement=UnitOfTime.DAYS,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
 )
 
 
@@ -147,7 +204,7 @@ class CupComponentSensor(CupComponentEntity, SensorEntity):  # pyright: ignore[r
         """
 
         api: CupApi = cup_component.api
-        coordinator: DataUpdateCoordinator[None] = cup_component.coordinator
+        coordinator: DataUpdateCoordinator[CupSnapshot] = cup_component.coordinator
 
         super().__init__(api, coordinator, name, server_unique_id)
         self.entity_description = description  # pyright: ignore[reportIncompatibleVariableOverride]
@@ -156,6 +213,59 @@ class CupComponentSensor(CupComponentEntity, SensorEntity):  # pyright: ignore[r
         raw_name: str = f"sensor.{name}_{description.key}"
         self.entity_id = create_entity_id_name(raw_name)
 
+        self._pending = cup_component.pending
+
+        # Attributes memoised per snapshot generation, stale flag and memory budget state
+        self._attributes: dict[str, Any] | None = None
+        self._attributes_key: tuple[int, bool, bool] | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Start the timer of the age sensors when the entity is added.
+
+        Returns:
+            None.
+
+        """
+
+        await super().async_added_to_hass()
+
+        if self.entity_description.key in _TIME_DEPENDENT_KEYS:
+            self.async_on_remove(async_track_time_interval(self.hass, self._async_refresh_age, _AGE_REFRESH_INTERVAL))
+
+    @callback
+    def _async_refresh_age(self, _now: datetime) -> None:
+        """Write the state of an age sensor, which changes with time only.
+
+        Args:
+            _now (datetime): The time the timer fired.
+
+        Returns:
+            None.
+
+        """
+
+        self.async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if the value or the attributes of this sensor changed.
+
+        Returns:
+            None.
+
+        """
+
+        snapshot = self.snapshot
+        self._async_write_state_if_changed(
+            (
+                self.available,
+                self.native_value,
+                snapshot.stale,
+                snapshot.over_budget,
+                snapshot.digest(self.entity_description.key),
+            )
+        )
+
     @property
     def native_value(self) -> StateType | datetime | None:  # pyright: ignore[reportIncompatibleVariableOverride]
         """Return the state of the device.
@@ -165,11 +275,28 @@ class CupComponentSensor(CupComponentEntity, SensorEntity):  # pyright: ignore[r
 
         """
 
+        snapshot = self.snapshot
+
         if self.entity_description.key in _METRIC_SENSOR_KEYS:
-            return self.api.cache_metrics.get(self.entity_description.key)
+            return snapshot.metrics.get(self.entity_description.key)
 
         if self.entity_description.key == "last_checked":
-            return self.api.cache_last_checked
+            return snapshot.last_checked
+
+        if self.entity_description.key == "data_age":
+            if snapshot.fetched_at is None:
+                return None
+            return int((dt_util.utcnow() - snapshot.fetched_at).total_seconds())
+
+        if self.entity_description.key == "memory_footprint":
+            return snapshot.memory_bytes
+
+        if self.entity_description.key == "oldest_pending_update":
+            return self._pending.oldest
+
+        if (percentile := _PENDING_AGE_PERCENTILES.get(self.entity_description.key)) is not None:
+            age = self._pending.age_percentile(percentile, dt_util.utcnow())
+            return int(age.total_seconds()) if age is not None else None
 
         return None
 
@@ -177,32 +304,29 @@ class CupComponentSensor(CupComponentEntity, SensorEntity):  # pyright: ignore[r
     def extra_state_attributes(self) -> dict[str, Any] | None:  # pyright: ignore[reportIncompatibleVariableOverride]
         """Return the state attributes.
 
+        The dictionary is built once per snapshot generation (stale flag and
+        memory budget state included) and reused until the data changes. While the data is over the memory budget,
+        the list of images is cut to its first entries.
+
         Returns:
             dict[str, Any] | None: A dictionary of extra attributes, or None if not applicable.
 
         """
-        if self.entity_description.key in self.api.cache_images:
-            return {"images_list": self.api.cache_images[self.entity_description.key]}
-
-        if self.entity_description.key == "monitored_images":
-            # Compute the full list of monitored images on the fly (all buckets except excluded)
-            all_images = [
-                image
-                for key, images in self.api.cache_images.items()
-                if key != "excluded_images"
-                for image in images
-            ]
-            return {"images_list": all_images}
-
-        if self.entity_description.key == "updates_available":
-            # Compute the full list of images with pending updates on the fly
-            update_buckets = {"major_updates", "minor_updates", "patch_updates", "other_updates"}
-            all_updates = [
-                image
-                for key, images in self.api.cache_images.items()
-                if key in update_buckets
-                for image in images
-            ]
-            return {"images_list": all_updates}
-
-        return None
+        snapshot = self.snapshot
+        # The generation is kept when a budget change only flips over_budget: it is part of the key.
+        attributes_key = (snapshot.generation, snapshot.stale, snapshot.over_budget)
+
+        if attributes_key != self._attributes_key:
+            # "stale" is True while the last good data is served because the Cup server fails to answer.
+            attributes: dict[str, Any] = {"stale": snapshot.stale}
+            images = snapshot.image_list(self.entity_description.key)
+            if images is not None:
+                if snapshot.over_budget and len(images) > _OVER_BUDGET_IMAGES_LIMIT:
+                    # Over the memory budget, do not copy every image into the state machine.
+                    attributes["truncated"] = True
+                    images = images[:_OVER_BUDGET_IMAGES_LIMIT]
+                attributes = {"images_list": images, **attributes}
+            self._attributes = attributes
+            self._attributes_key = attributes_key
+
+        return self._attributes
@@ -0,0 +1,229 @@
+"""Services of the Cup Component integration."""
+
+from __future__ import annotations
+
+import cProfile
+from functools import partial
+from pathlib import Path
+import pstats
+import time
+import tracemalloc
+from typing import TYPE_CHECKING, Any, Final
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import ATTR_CONFIG_ENTRY_ID
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from . import CupComponentConfigEntry
+
+SERVICE_PROFILE_REFRESH: Final[str] = "profile_refresh"
+
+ATTR_TOP: Final[str] = "top"
+
+_PROFILE_REFRESH_SCHEMA: Final = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_TOP, default=20): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration.
+
+    Args:
+        hass (HomeAssistant): The Home Assistant instance.
+
+    Returns:
+        None.
+
+    """
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE_REFRESH,
+        _async_profile_refresh,
+        schema=_PROFILE_REFRESH_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+def _get_loaded_entry(hass: HomeAssistant, entry_id: str) -> CupComponentConfigEntry:
+    """Return a loaded config entry of the integration.
+
+    Args:
+        hass (HomeAssistant): The Home Assistant instance.
+        entry_id (str): The ID of the config entry.
+
+    Returns:
+        CupComponentConfigEntry: The config entry.
+
+    Raises:
+        ServiceValidationError: If the entry does not exist, belongs to another integration or is not loaded.
+
+    """
+
+    entry = hass.config_entries.async_get_entry(entry_id)
+
+    if entry is None or entry.domain != DOMAIN or entry.state is not ConfigEntryState.LOADED:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="entry_not_loaded",
+            translation_placeholders={"entry_id": entry_id},
+        )
+
+    return entry
+
+
+def _profile_path(hass: HomeAssistant, entry_id: str) -> str:
+    """Return the path of the profile of a config entry, overwritten by each profiled refresh.
+
+    Args:
+        hass (HomeAssistant): The Home Assistant instance.
+        entry_id (str): The ID of the config entry.
+
+    Returns:
+        str: The path, in the configuration directory.
+
+    """
+
+    return hass.config.path(f"{DOMAIN}_profile_{entry_id}.prof")
+
+
+async def async_remove_profile(hass: HomeAssistant, entry_id: str) -> None:
+    """Delete the profile of a config entry, if one was written.
+
+    Args:
+        hass (HomeAssistant): The Home Assistant instance.
+        entry_id (str): The ID of the removed config entry.
+
+    Returns:
+        None.
+
+    """
+
+    await hass.async_add_executor_job(partial(Path(_profile_path(hass, entry_id)).unlink, missing_ok=True))
+
+
+def _write_profile(profiler: cProfile.Profile, path: str, top: int) -> list[dict[str, Any]]:
+    """Write the profile to a file and return the functions with the highest cumulative time.
+
+    This function does blocking I/O and must run in the executor.
+
+    Args:
+        profiler (cProfile.Profile): The profiler, disabled.
+        path (str): The path of the file to write (readable with ``pstats`` or snakeviz).
+        top (int): The number of functions to return.
+
+    Returns:
+        list[dict[str, Any]]: The functions, with their number of calls, own time and cumulative time.
+
+    """
+
+    profiler.dump_stats(path)
+    stats = pstats.Stats(profiler)
+
+    # stats.stats maps (file, line, function) to (primitive calls, calls, own time, cumulative time, callers).
+    functions = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)  # pyright: ignore[reportAttributeAccessIssue]
+
+    return [
+        {
+            "function": f"{file}:{line}({name})",
+            "calls": calls,
+            "own_ms": round(own_time * 1000, 3),
+            "cumulative_ms": round(cumulative_time * 1000, 3),
+        }
+        for (file, line, name), (_, calls, own_time, cumulative_time, _) in functions[:top]
+    ]
+
+
+async def _async_profile_refresh(call: ServiceCall) -> ServiceResponse:
+    """Run one refresh of a Cup server under cProfile and tracemalloc.
+
+    The profile is written to the configuration directory, replacing the
+    previous profile of the same entry. The response sums up
+    the functions with the highest cumulative time, the memory allocated, and
+    the time spent in the network, JSON decoding, categorisation and entity
+    state writes. Categorisation of large inventories runs in the executor and
+    is not part of the profile, only of the timings.
+
+    Args:
+        call (ServiceCall): The service call.
+
+    Returns:
+        ServiceResponse: The summary of the profiled refresh.
+
+    Raises:
+        ServiceValidationError: If the entry is not loaded or another profiler is running.
+        HomeAssistantError: If the refresh fails.
+
+    """
+
+    hass = call.hass
+    entry = _get_loaded_entry(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+    api = entry.runtime_data.api
+    coordinator = entry.runtime_data.coordinator
+
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    memory_before, _ = tracemalloc.get_traced_memory()
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError as err:
+        if not was_tracing:
+            tracemalloc.stop()
+        raise ServiceValidationError(translation_domain=DOMAIN, translation_key="profiler_busy") from err
+
+    start = time.perf_counter()
+
+    try:
+        await api.call_get_all_data(use_shared=False)
+        writes_start = time.perf_counter()
+        coordinator.async_set_updated_data(api.snapshot)
+        entity_writes_ms = (time.perf_counter() - writes_start) * 1000
+    # broad-exception-caught: any failure of the refresh is reported to the caller
+    except Exception as err:  # pylint: disable=broad-exception-caught
+        raise HomeAssistantError(
+            translation_domain=DOMAIN,
+            translation_key="refresh_failed",
+            translation_placeholders={"error": str(err)},
+        ) from err
+    finally:
+        profiler.disable()
+        total_ms = (time.perf_counter() - start) * 1000
+        memory_after, memory_peak = tracemalloc.get_traced_memory()
+        if not was_tracing:
+            tracemalloc.stop()
+
+    path = _profile_path(hass, entry.entry_id)
+    top_functions = await hass.async_add_executor_job(_write_profile, profiler, path, call.data[ATTR_TOP])
+
+    return {
+        "profile_path": path,
+        "timings_ms": {
+            "total": round(total_ms, 3),
+            "network": api.request_timings.get("network_ms"),
+            "decode": api.request_timings.get("decode_ms"),
+            "categorisation": api.instrumentation.get("categorisation_ms"),
+            "entity_writes": round(entity_writes_ms, 3),
+        },
+        "memory_bytes": {
+            "allocated": memory_after - memory_before,
+            "peak": memory_peak - memory_before,
+        },
+        "images": api.instrumentation.get("images"),
+        "memoised_images": api.instrumentation.get("memoised_images"),
+        "categorisation_offloaded": api.instrumentation.get("offloaded"),
+        "top_functions": top_functions,
+    }
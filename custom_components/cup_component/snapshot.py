@@ -0,0 +1,294 @@
+"""Immutable snapshot of the data retrieved from a Cup server."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+import hashlib
+import json
+import sys
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Final
+
+from .exclusion import split_reference
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from datetime import datetime
+
+# Buckets holding images with a pending update.
+UPDATE_BUCKETS: Final[frozenset[str]] = frozenset({"major_updates", "minor_updates", "patch_updates", "other_updates"})
+
+EXCLUDED_BUCKET: Final[str] = "excluded_images"
+
+
+def _digest(images: Any) -> str:
+    """Return a digest of a list of images (or of digests), independent of the key order.
+
+    Args:
+        images (Any): The JSON-serialisable data to digest.
+
+    Returns:
+        str: The hexadecimal digest.
+
+    """
+
+    payload = json.dumps(images, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def image_digest(image: dict[str, Any]) -> str:
+    """Return the digest of one image, from which the digests of a snapshot are derived.
+
+    Args:
+        image (dict[str, Any]): The image, as served by the Cup ``/json`` endpoint.
+
+    Returns:
+        str: The hexadecimal digest.
+
+    """
+
+    return _digest(image)
+
+
+def estimate_size(*objects: Any) -> int:
+    """Estimate the memory held by objects and everything they contain.
+
+    Containers (dict, list, tuple, set, read-only mappings) are walked and every
+    object is counted once, even when it is shared between several containers
+    (e.g. an image referenced by the payload, a bucket and a derived list).
+
+    Args:
+        *objects (Any): The objects to measure.
+
+    Returns:
+        int: The estimated size, in bytes.
+
+    """
+
+    seen: set[int] = set()
+    pending: list[Any] = list(objects)
+    total = 0
+
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+
+        if isinstance(obj, (dict, MappingProxyType)):
+            pending.extend(obj.keys())  # pyright: ignore[reportUnknownMemberType, reportUnknownArgumentType]
+            pending.extend(obj.values())  # pyright: ignore[reportUnknownMemberType, reportUnknownArgumentType]
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            pending.extend(obj)  # pyright: ignore[reportUnknownArgumentType]
+
+    return total
+
+
+def _empty_mapping() -> Mapping[str, Any]:
+    """Return an empty read-only mapping."""
+    return MappingProxyType({})
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class CupSnapshot:
+    """Categorised images and counters of a Cup server, published as a whole.
+
+    A new snapshot is built for every payload received (or every change of the
+    exclusion rules) and replaces the previous one atomically, so that readers
+    never see a mix of old and new data. Derived lists are computed once, when
+    the snapshot is built.
+
+    Two snapshots are equal when they hold the same content (same fingerprint,
+    same ``last_checked`` and same stale flag), whatever their generation and
+    reception time: the coordinator relies on it to skip unchanged refreshes.
+
+    Attributes:
+        images (Mapping[str, tuple[dict[str, Any], ...]]): The images grouped by bucket (excluded images included).
+        metrics (Mapping[str, int]): The counters of each bucket, plus ``monitored_images`` and ``updates_available``.
+        references (Mapping[str, str]): Index of the bucket of each image, by reference.
+        views (Mapping[str, tuple[dict[str, Any], ...]]): Derived lists: ``monitored_images`` and ``updates_available``.
+        digests (Mapping[str, str]): Digest of each bucket and of each derived list.
+        generation (int): Number increased each time new content is categorised.
+        fingerprint (str): Digest of all the categorised images.
+        last_checked (datetime | None): Time of the last check performed by the Cup server.
+        fetched_at (datetime | None): Time the payload was received by the integration.
+        stale (bool): True while this snapshot is served because the Cup server fails to answer.
+        memory_bytes (int): Estimated memory held by the snapshot and the raw payload it was built from.
+        over_budget (bool): True when the data exceeded the memory budget and was reduced to compact records.
+
+    """
+
+    images: Mapping[str, tuple[dict[str, Any], ...]] = field(default_factory=_empty_mapping)
+    metrics: Mapping[str, int] = field(default_factory=_empty_mapping)
+    references: Mapping[str, str] = field(default_factory=_empty_mapping)
+    views: Mapping[str, tuple[dict[str, Any], ...]] = field(default_factory=_empty_mapping)
+    digests: Mapping[str, str] = field(default_factory=_empty_mapping)
+    generation: int = 0
+    fingerprint: str = ""
+    last_checked: datetime | None = None
+    fetched_at: datetime | None = None
+    stale: bool = False
+    memory_bytes: int = 0
+    over_budget: bool = False
+
+    @classmethod
+    def build(  # noqa: PLR0913
+        cls,
+        images: dict[str, list[Any]],
+        metrics: dict[str, int],
+        generation: int,
+        last_checked: datetime | None,
+        fetched_at: datetime | None,
+        image_digests: dict[str, list[str]] | None = None,
+    ) -> CupSnapshot:
+        """Build a snapshot and its indexes from categorised images.
+
+        The digest of a bucket is derived from the digests of its images (see
+        ``image_digest``), which callers keeping them between payloads can pass
+        instead of having every image serialised again.
+
+        Args:
+            images (dict[str, list[Any]]): The images grouped by bucket.
+            metrics (dict[str, int]): The counters.
+            generation (int): The generation number of the snapshot.
+            last_checked (datetime | None): Time of the last check performed by the Cup server.
+            fetched_at (datetime | None): Time the payload was received by the integration.
+            image_digests (dict[str, list[str]] | None): The digest of each image, grouped and ordered like
+                ``images``. Computed when not given.
+
+        Returns:
+            CupSnapshot: The new snapshot.
+
+        """
+
+        frozen_images = {bucket: tuple(bucket_images) for bucket, bucket_images in images.items()}
+        if image_digests is None:
+            image_digests = {
+                bucket: [image_digest(image) for image in bucket_images] for bucket, bucket_images in images.items()
+            }
+        bucket_digests = {bucket: _digest(image_digests[bucket]) for bucket in frozen_images}
+
+        # Derived lists are concatenations of buckets: their digests are derived from the bucket digests.
+        monitored_buckets = [bucket for bucket in frozen_images if bucket != EXCLUDED_BUCKET]
+        update_buckets = [bucket for bucket in frozen_images if bucket in UPDATE_BUCKETS]
+        digests = {
+            **bucket_digests,
+            "monitored_images": _digest([bucket_digests[bucket] for bucket in monitored_buckets]),
+            "updates_available": _digest([bucket_digests[bucket] for bucket in update_buckets]),
+        }
+
+        return cls(
+            images=MappingProxyType(frozen_images),
+            metrics=MappingProxyType(dict(metrics)),
+            references=MappingProxyType(
+                {
+                    image.get("reference", ""): bucket
+                    for bucket, bucket_images in frozen_images.items()
+                    for image in bucket_images
+                }
+            ),
+            views=MappingProxyType(
+                {
+                    "monitored_images": tuple(image for bucket in monitored_buckets for image in frozen_images[bucket]),
+                    "updates_available": tuple(image for bucket in update_buckets for image in frozen_images[bucket]),
+                }
+            ),
+            digests=MappingProxyType(digests),
+            generation=generation,
+            fingerprint=_digest(sorted(bucket_digests.items())),
+            last_checked=last_checked,
+            fetched_at=fetched_at,
+        )
+
+    def _content_key(self) -> tuple[str, datetime | None, bool]:
+        """Return the fields compared by ``__eq__`` and ``__hash__``."""
+        return (self.fingerprint, self.last_checked, self.stale)
+
+    def __eq__(self, other: object) -> bool:
+        """Compare the content of two snapshots.
+
+        Args:
+            other (object): The object to compare with.
+
+        Returns:
+            bool: True if both snapshots hold the same content.
+
+        """
+
+        if not isinstance(other, CupSnapshot):
+            return NotImplemented
+
+        return self._content_key() == other._content_key()
+
+    def __hash__(self) -> int:
+        """Return a hash consistent with ``__eq__``."""
+        return hash(self._content_key())
+
+    def image_list(self, key: str) -> tuple[dict[str, Any], ...] | None:
+        """Return the images of a bucket or of a derived list.
+
+        Args:
+            key (str): A bucket name, ``monitored_images`` or ``updates_available``.
+
+        Returns:
+            tuple[dict[str, Any], ...] | None: The images, or None if the key is unknown.
+
+        """
+
+        if key in self.images:
+            return self.images[key]
+
+        return self.views.get(key)
+
+    def digest(self, key: str) -> str | None:
+        """Return the digest of a bucket or of a derived list.
+
+        Args:
+            key (str): A bucket name, ``monitored_images`` or ``updates_available``.
+
+        Returns:
+            str | None: The digest, or None if the key is unknown.
+
+        """
+
+        return self.digests.get(key)
+
+    def registry_breakdown(self) -> dict[str, tuple[int, int]]:
+        """Count the monitored images and the pending updates of each registry.
+
+        Excluded images are not counted.
+
+        Returns:
+            dict[str, tuple[int, int]]: The number of monitored images and of pending updates, by registry.
+
+        """
+
+        breakdown: dict[str, tuple[int, int]] = {}
+
+        for bucket, images in self.images.items():
+            if bucket == EXCLUDED_BUCKET:
+                continue
+            has_update = int(bucket in UPDATE_BUCKETS)
+            for image in images:
+                registry = split_reference(image.get("reference", ""))[0]
+                monitored, updates = breakdown.get(registry, (0, 0))
+                breakdown[registry] = (monitored + 1, updates + has_update)
+
+        return breakdown
+
+    def with_stale(self, *, stale: bool) -> CupSnapshot:
+        """Return a copy of the snapshot with the stale flag changed.
+
+        Args:
+            stale (bool): The new value of the stale flag.
+
+        Returns:
+            CupSnapshot: This snapshot if the flag is unchanged, otherwise a copy.
+
+        """
+
+        if stale == self.stale:
+            return self
+
+        return replace(self, stale=stale)
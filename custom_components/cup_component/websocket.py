@@ -0,0 +1,170 @@
+"""Websocket API used by the Cup Component Lovelace card."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import CARD_INFO_KEYS, DOMAIN, SIGNAL_SNAPSHOT_UPDATED
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from . import CupComponentConfigEntry
+    from .snapshot import CupSnapshot
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the websocket commands used by the Lovelace card.
+
+    Args:
+        hass (HomeAssistant): The Home Assistant instance.
+
+    Returns:
+        None.
+
+    """
+    websocket_api.async_register_command(hass, websocket_subscribe)
+
+
+def _build_card_records(snapshot: CupSnapshot) -> dict[str, dict[str, Any]]:
+    """Reduce the images of a snapshot to the fields rendered by the card.
+
+    Args:
+        snapshot (CupSnapshot): The current data of the Cup server.
+
+    Returns:
+        dict[str, dict[str, Any]]: The bucket, URL and version fields of each image, by reference.
+
+    """
+
+    records: dict[str, dict[str, Any]] = {}
+
+    for bucket, images in snapshot.images.items():
+        for image in images:
+            info: dict[str, Any] = (image.get("result") or {}).get("info") or {}
+            records[image.get("reference", "")] = {
+                "bucket": bucket,
+                "url": image.get("url"),
+                "info": {key: info[key] for key in CARD_INFO_KEYS if key in info},
+            }
+
+    return records
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe",
+        vol.Required("entry_id"): str,
+    }
+)
+@callback
+def websocket_subscribe(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Subscribe the Lovelace card to compact image updates of a Cup server.
+
+    A full compact snapshot (the fields the card renders for each image, and the
+    counters) is sent once, then only the differences (images added, changed or
+    removed, and changed counters) are pushed after each coordinator refresh.
+    Refreshes that change nothing send nothing. The subscription follows the
+    entry across reloads.
+
+    Args:
+        hass (HomeAssistant): The Home Assistant instance.
+        connection (websocket_api.ActiveConnection): The websocket connection of the subscriber.
+        msg (dict[str, Any]): The subscription message.
+
+    Returns:
+        None.
+
+    """
+
+    entry: CupComponentConfigEntry | None = hass.config_entries.async_get_entry(msg["entry_id"])
+
+    if entry is None or entry.domain != DOMAIN or entry.state is not ConfigEntryState.LOADED:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "Config entry not found or not loaded.")
+        return
+
+    last_snapshot = entry.runtime_data.coordinator.data
+    last_records = _build_card_records(last_snapshot)
+
+    @callback
+    def _async_forward_delta() -> None:
+        """Send the differences since the last message to the subscriber.
+
+        Returns:
+            None.
+
+        """
+        nonlocal last_snapshot, last_records
+
+        if entry.state is not ConfigEntryState.LOADED:
+            return
+
+        snapshot, previous = entry.runtime_data.coordinator.data, last_snapshot
+
+        # Snapshots are replaced as a whole: the same object means nothing changed since the last message.
+        if snapshot is previous:
+            return
+
+        records = _build_card_records(snapshot)
+        changed = {ref: record for ref, record in records.items() if last_records.get(ref) != record}
+        removed = [ref for ref in last_records if ref not in records]
+        changed_metrics = {key: value for key, value in snapshot.metrics.items() if previous.metrics.get(key) != value}
+        last_snapshot, last_records = snapshot, records
+
+        if not changed and not removed and not changed_metrics and snapshot.last_checked == previous.last_checked:
+            return
+
+        connection.send_message(
+            websocket_api.event_message(
+                msg["id"],
+                {
+                    "type": "delta",
+                    "changed": changed,
+                    "removed": removed,
+                    "metrics": changed_metrics,
+                    "last_checked": _isoformat(snapshot.last_checked),
+                },
+            )
+        )
+
+    connection.subscriptions[msg["id"]] = async_dispatcher_connect(
+        hass, SIGNAL_SNAPSHOT_UPDATED.format(entry.entry_id), _async_forward_delta
+    )
+    connection.send_result(msg["id"])
+    connection.send_message(
+        websocket_api.event_message(
+            msg["id"],
+            {
+                "type": "snapshot",
+                "images": last_records,
+                "metrics": dict(last_snapshot.metrics),
+                "last_checked": _isoformat(last_snapshot.last_checked),
+            },
+        )
+    )
+
+
+def _isoformat(value: datetime | None) -> str | None:
+    """Format an optional time for the card.
+
+    Args:
+        value (datetime | None): The time, if known.
+
+    Returns:
+        str | None: The time in ISO 8601 format, or None.
+
+    """
+
+    return value.isoformat() if value is not None else None
@@ -1 +1 @@
-const INTEGRATION_DOMAIN="cup_component",CARD_DESCRIPTION="Displays all monitored Docker images grouped by update type.",CARD_VERSION="1.0",CARD_LOGO_CDN_URL="https://brands.home-assistant.io/_/cup_component/icon.png",CARD_LOGO_API_URL="/api/brands/integration/cup_component/icon.png",LABELS={monitoredSingular:"monitored image",monitoredPlural:"monitored images",upToDateSingular:"up-to-date image",upToDatePlural:"up-to-date images",availableSingular:"update available",availablePlural:"updates available",upToDate:"Up to date",noImages:"No images",imageUnknown:"Unknown",lastCheckedUnknown:"Unknown",editorCollapsedBehaviour:"Default collapsed behaviour",editorHeroStyle:"Hero style",editorHideSections:"Hide sections",editorHideHeroBlock:"Hero block",editorHideFooter:"Footer",editorSectionOrder:"Section order",editorAddButton:"Add"},DEFAULT_SECTIONS=[{key:"major_updates",label:"Major Updates",icon:"mdi:arrow-up-circle",color:"var(--error-color)"},{key:"minor_updates",label:"Minor Updates",icon:"mdi:arrow-up-circle",color:"var(--warning-color)"},{key:"patch_updates",label:"Patch Updates",icon:"mdi:arrow-up-circle",color:"var(--primary-color)"},{key:"other_updates",label:"Other Updates",icon:"mdi:arrow-up-circle",color:"#9b59b6"},{key:"up_to_date",label:"Up to Date",icon:"mdi:check-circle",color:"var(--success-color)"},{key:"unknown",label:"Unknown",icon:"mdi:help-circle-outline",color:"var(--disabled-color)"},{key:"excluded_images",label:"Excluded",icon:"mdi:minus-circle-outline",color:"var(--disabled-color)"}],ALL_SECTION_KEYS=DEFAULT_SECTIONS.map(e=>e.key),_globalCollapsed={},CONFIG_DEFAULTS={hero_style:"badges",collapsed:"if_empty",hide_hero:!1,hide_footer:!1,hide_sections:[],preview:{collapsed:"always",hide_sections:["up_to_date","unknown","excluded_images"],hide_footer:!0}},EDITOR_SECTION_KEYS=[...ALL_SECTION_KEYS,"divider"],EDITOR_SECTION_LABELS={major_updates:"Major Updates",minor_updates:"Minor Updates",patch_updates:"Patch Updates",other_updates:"Other Updates",up_to_date:"Up to Date",unknown:"Unknown",excluded_images:"Excluded",divider:"── Divider ──"},COLLAPSED_OPTIONS=[{value:"always",label:"Always collapsed"},{value:"if_empty",label:"Collapse empty sections"},{value:"never",label:"Never collapsed"}],HERO_STYLE_OPTIONS=[{value:"badges",label:"Badges"},{value:"classic",label:"Classic"}];class CupImagesCardEditor extends HTMLElement{constructor(){super(),this.attachShadow({mode:"open"}),this._config={},this._hass=null,this._dragSrcIndex=null,this._domBuilt=!1}set hass(e){this._hass=e,this._domBuilt&&this.shadowRoot.querySelectorAll("ha-selector").forEach(i=>{i.hass=e})}setConfig(e){this._domBuilt?(this._config={...e},this._updateValues()):(this._config={...e},this._buildDOM())}_buildDOM(){this.shadowRoot.innerHTML=`\n      <style>\n        :host { display: block; }\n        .editor { display: flex; flex-direction: column; gap: 16px; padding: 16px 0; }\n        .collapsible-header {\n          display: flex; align-items: center; justify-content: space-between;\n          cursor: pointer; user-select: none;\n        }\n        .collapsible-header:hover .field-label { color: var(--primary-text-color); }\n        .collapsible-header ha-icon { --mdc-icon-size: 16px; color: var(--secondary-text-color); }\n        .collapsible-body { margin-top: 8px; }\n        .collapsible-body[hidden] { display: none; }\n        .field-label {\n          font-size: var(--ha-font-size-s, 12px);\n          font-weight: 500;\n          text-transform: uppercase;\n          letter-spacing: 0.1em;\n          color: var(--secondary-text-color);\n          margin-bottom: 4px;\n        }\n        .checkbox-grid { display: grid; grid-template-columns: 1fr 1fr; gap: 4px 16px; }\n        .checkbox-row {\n          display: flex; align-items: center; gap: 8px;\n          font-size: var(--ha-font-size-m, 14px);\n          cursor: pointer; user-select: none;\n        }\n        .checkbox-row input[type=checkbox] { width: 18px; height: 18px; cursor: pointer; }\n        .order-list { display: flex; flex-direction: column; gap: 4px; }\n        .order-item {\n          display: flex; align-items: center; gap: 8px;\n          padding: 6px 8px; border-radius: 4px;\n          background: var(--secondary-background-color);\n          cursor: grab; font-size: var(--ha-font-size-m, 14px);\n          border: 1px solid transparent;\n        }\n        .order-item.dragging  { opacity: 0.4; }\n        .order-item.drag-over { border-color: var(--primary-color); }\n        .order-item ha-icon   { --mdc-icon-size: 18px; color: var(--secondary-text-color); flex-shrink: 0; }\n        .order-item span      { flex: 1; }\n        .order-item .remove-btn { cursor: pointer; color: var(--secondary-text-color); --mdc-icon-size: 16px; }\n        .order-item .remove-btn:hover { color: var(--error-color); }\n        .add-section-row { display: flex; align-items: center; gap: 8px; margin-top: 4px; }\n        .add-section-row select {\n          flex: 1; padding: 6px 8px; border-radius: 4px;\n          border: 1px solid var(--divider-color);\n          background: var(--card-background-color);\n          color: var(--primary-text-color);\n          font-size: var(--ha-font-size-m, 14px);\n        }\n        .add-btn {\n          display: inline-flex; align-items: center; gap: 4px;\n          padding: 6px 12px; border-radius: 4px;\n          border: 1px solid var(--primary-color); background: none;\n          color: var(--primary-color); font-size: var(--ha-font-size-m, 14px); cursor: pointer;\n        }\n        .add-btn:hover { background: var(--primary-color); color: white; }\n        /* Hide validation error styling on optional title field */\n        #title-field { --mdc-text-field-error-color: transparent; }\n      </style>\n      <div class="editor">\n\n        <div>\n          <ha-selector id="device-picker"></ha-selector>\n        </div>\n\n        <div>\n          <ha-selector id="title-field"></ha-selector>\n        </div>\n\n        <div>\n          <div class="field-label">${LABELS.editorCollapsedBehaviour}</div>\n          <ha-selector id="collapsed-select"></ha-selector>\n        </div>\n\n        <div>\n          <div class="collapsible-header" id="hero-style-header">\n            <div class="field-label">${LABELS.editorHeroStyle}</div>\n            <ha-icon icon="mdi:chevron-down"></ha-icon>\n          </div>\n          <div class="collapsible-body" id="hero-style-body" hidden>\n            <ha-selector id="hero-style-select"></ha-selector>\n          </div>\n        </div>\n\n        <div>\n          <div class="collapsible-header" id="hide-sections-header">\n            <div class="field-label">${LABELS.editorHideSections}</div>\n            <ha-icon icon="mdi:chevron-down"></ha-icon>\n          </div>\n          <div class="collapsible-body" id="hide-sections-body" hidden>\n            <div class="checkbox-grid">\n              <label class="checkbox-row">\n                <input type="checkbox" id="hide-hero-cb">\n                ${LABELS.editorHideHeroBlock}\n              </label>\n              <label class="checkbox-row">\n                <input type="checkbox" id="hide-footer-cb">\n                ${LABELS.editorHideFooter}\n              </label>\n            </div>\n            <hr style="border:none;border-top:1px solid var(--divider-color);margin:8px 0;">\n            <div class="checkbox-grid">\n              ${ALL_SECTION_KEYS.map(e=>`\n                <label class="checkbox-row">\n                  <input type="checkbox" data-key="${e}">\n                  ${EDITOR_SECTION_LABELS[e]}\n                </label>\n              `).join("")}\n            </div>\n          </div>\n        </div>\n\n        <div>\n          <div class="collapsible-header" id="section-order-header">\n            <div class="field-label">${LABELS.editorSectionOrder}</div>\n            <ha-icon icon="mdi:chevron-down"></ha-icon>\n          </div>\n          <div class="collapsible-body" id="section-order-body" hidden>\n            <div id="order-list-wrapper">\n              <div class="order-list" id="order-list"></div>\n            </div>\n            <div class="add-section-row">\n              <select id="add-select">\n                ${EDITOR_SECTION_KEYS.map(e=>`<option value="${e}">${EDITOR_SECTION_LABELS[e]}</option>`).join("")}\n              </select>\n              <button class="add-btn" id="add-btn"><ha-icon icon="mdi:plus"></ha-icon> ${LABELS.editorAddButton}</button>\n            </div>\n          </div>\n        </div>\n\n        \x3c!-- cup-component-card 1.0 --\x3e\n\n      </div>\n    `;const e=this.shadowRoot;e.querySelector("#device-picker").selector={device:{integration:"cup_component"}},e.querySelector("#device-picker").label=this._hass?.localize("ui.components.device-picker.device")||"Device",e.querySelector("#title-field").selector={text:{suffix:""}};const i=this._hass?.localize("ui.panel.lovelace.editor.card.generic.title")||"Title",t=this._hass?.localize("ui.common.optional")||"optional";e.querySelector("#title-field").label=`${i} (${t})`,e.querySelector("#title-field").required=!1,e.querySelector("#collapsed-select").selector={select:{options:COLLAPSED_OPTIONS}},e.querySelector("#hero-style-select").selector={select:{mode:"list",options:HERO_STYLE_OPTIONS}},this._domBuilt=!0,this._updateValues(),this._attachListeners()}_updateValues(){const e=this._config,i=this.shadowRoot;this._hass&&i.querySelectorAll("ha-selector").forEach(e=>{e.hass=this._hass}),i.querySelector("#device-picker").value=e.device_id??"",i.querySelector("#title-field").value=e.title??"",i.querySelector("#collapsed-select").value=e.collapsed??CONFIG_DEFAULTS.collapsed,i.querySelector("#hero-style-select").value=e.hero_style??CONFIG_DEFAULTS.hero_style,i.querySelector("#hide-hero-cb").checked=!!e.hide_hero,i.querySelector("#hide-footer-cb").checked=!!e.hide_footer;const t=new Set(e.hide_sections??[]);i.querySelectorAll("input[type=checkbox][data-key]").forEach(e=>{e.checked=t.has(e.dataset.key)});const o=e.order_sections??ALL_SECTION_KEYS;i.querySelector("#order-list").innerHTML=o.map((e,i)=>`\n      <div class="order-item" draggable="true" data-index="${i}" data-key="${e}">\n        <ha-icon icon="mdi:drag"></ha-icon>\n        <span>${EDITOR_SECTION_LABELS[e]??e}</span>\n        <ha-icon class="remove-btn" icon="mdi:close" data-index="${i}"></ha-icon>\n      </div>\n    `).join("")}_attachListeners(){const e=this.shadowRoot;e.querySelector("#device-picker").addEventListener("value-changed",e=>{this._updateConfig({device_id:e.detail.value})}),e.querySelector("#title-field").addEventListener("value-changed",e=>{const i=(e.detail.value??"").trim();i?this._config.title=i:delete this._config.title,this._fireConfig()}),e.querySelector("#collapsed-select").addEventListener("value-changed",e=>{const i=e.detail.value;this._updateConfig({collapsed:i===CONFIG_DEFAULTS.collapsed?void 0:i})}),e.querySelector("#hero-style-select").addEventListener("value-changed",e=>{const i=e.detail.value;this._updateConfig({hero_style:i===CONFIG_DEFAULTS.hero_style?void 0:i})}),e.querySelector("#hide-hero-cb").addEventListener("change",e=>{this._updateConfig({hide_hero:e.target.checked||void 0})}),e.querySelector("#hide-footer-cb").addEventListener("change",e=>{this._updateConfig({hide_footer:e.target.checked||void 0})}),e.querySelector("#hide-sections-body").addEventListener("change",i=>{if(!i.target.matches("input[type=checkbox][data-key]"))return;const t=[...e.querySelectorAll("input[type=checkbox][data-key]")].filter(e=>e.checked).map(e=>e.dataset.key);this._updateConfig({hide_sections:t.length?t:void 0})});const i=e.querySelector("#order-list-wrapper");i.addEventListener("dragstart",e=>{const i=e.target.closest(".order-item");i&&(this._dragSrcIndex=parseInt(i.dataset.index,10),i.classList.add("dragging"))}),i.addEventListener("dragend",()=>{e.querySelectorAll(".order-item").forEach(e=>e.classList.remove("dragging","drag-over"))}),i.addEventListener("dragover",i=>{i.preventDefault();const t=i.target.closest(".order-item");e.querySelectorAll(".order-item").forEach(e=>e.classList.remove("drag-over")),t&&t.classList.add("drag-over")}),i.addEventListener("drop",e=>{e.preventDefault();const i=e.target.closest(".order-item");if(!i||null===this._dragSrcIndex)return;const t=parseInt(i.dataset.index,10);if(t===this._dragSrcIndex)return;const o=[...this._config.order_sections??ALL_SECTION_KEYS],[n]=o.splice(this._dragSrcIndex,1);o.splice(t,0,n),this._dragSrcIndex=null,this._updateConfig({order_sections:o})}),i.addEventListener("click",e=>{const i=e.target.closest(".remove-btn");if(!i)return;const t=parseInt(i.dataset.index,10),o=[...this._config.order_sections??ALL_SECTION_KEYS];o.splice(t,1),this._updateConfig({order_sections:o.length?o:void 0})});const t=(i,t)=>{const o=e.querySelector(`#${i}`),n=e.querySelector(`#${t}`),r=o.querySelector("ha-icon");o.addEventListener("click",()=>{const e=n.hasAttribute("hidden");e?n.removeAttribute("hidden"):n.setAttribute("hidden",""),r.setAttribute("icon",e?"mdi:chevron-up":"mdi:chevron-down")})};t("hero-style-header","hero-style-body"),t("hide-sections-header","hide-sections-body"),t("section-order-header","section-order-body"),e.querySelector("#add-btn").addEventListener("click",()=>{const i=e.querySelector("#add-select").value;if(!i)return;const t=[...this._config.order_sections??ALL_SECTION_KEYS];t.push(i),this._updateConfig({order_sections:t})})}_fireConfig(){this.dispatchEvent(new CustomEvent("config-changed",{detail:{config:this._config},bubbles:!0,composed:!0}))}_updateConfig(e){for(const[i,t]of Object.entries(e))void 0===t?delete this._config[i]:this._config[i]=t;this._fireConfig(),this._updateValues()}}customElements.define("cup-component-card-editor",CupImagesCardEditor);class CupImagesCard extends HTMLElement{constructor(){super(),this._deviceEntities=null,this._initialized=!1,this._logoUrl="",this.attachShadow({mode:"open"}),this.shadowRoot.addEventListener("click",e=>{const i=e.target.closest(".section-title");if(!i)return;const t=i.dataset.key,o=this.shadowRoot.querySelector(`.section-body[data-key="${t}"]`),n=i.querySelector("ha-icon");if(!o)return;const r="none"!==o.style.display;_globalCollapsed[t]=r,o.style.display=r?"none":"",i.classList.toggle("expanded",!r),n&&n.setAttribute("icon",r?"mdi:chevron-down":"mdi:chevron-up")})}setConfig(e){if(!e.device_id)throw new Error("Please define a device_id.");const{_preview:i,...t}=e;i&&(delete t.collapsed,delete t.hide_sections,delete t.hide_footer),this._config=i?e:t,this._deviceEntities=null,this._initialized=!1}set hass(e){if(this._hass=e,!this._logoResolved)return this._logoResolved=!0,void this._resolveLogoUrl().then(()=>this._render());this._logoUrl&&this._render()}getCardSize(){return 3}static getConfigElement(){return document.createElement("cup-component-card-editor")}static getStubConfig(e){const i=Object.values(e?.entities??{}).find(e=>"cup_component"===e.platform);return{device_id:i?.device_id??"",_preview:!0,...CONFIG_DEFAULTS.preview}}async _resolveLogoUrl(){const e=this._hass?.config?.version??"",[i,t]=e.split(".").map(Number);if(!(i>2026||2026===i&&t>=3))return void(this._logoUrl=CARD_LOGO_CDN_URL);const o=await this._hass.connection.sendMessagePromise({type:"brands/access_token"});o.token&&(this._logoUrl=`${CARD_LOGO_API_URL}?token=${o.token}`)}_isCollapsed(e,i){const t=this._config.collapsed??CONFIG_DEFAULTS.collapsed;return"always"===t||"never"!==t&&(e in _globalCollapsed?_globalCollapsed[e]:0===i)}get _deviceVisitUrl(){return this._hass?.devices?.[this._config?.device_id]?.configuration_url??null}_renderLogoHtml(){const e=`<img src="${this._logoUrl}" alt="Logo Cup Component">`;return this._deviceVisitUrl?`<a href="${this._deviceVisitUrl}" target="_blank" rel="noopener noreferrer" style="display:inline-flex;">${e}</a>`:e}_pluralize(e,i,t){return e>1?t:i}_updateIcon(e){return e>0?"mdi:arrow-up-circle":"mdi:check-circle-outline"}_resolveDeviceEntities(){if(this._deviceEntities)return this._deviceEntities;const e={};for(const i of Object.values(this._hass.entities??{}))i.device_id===this._config.device_id&&i.translation_key&&(e[i.translation_key]=i.entity_id);return this._deviceEntities=e,e}_resolveSensorEntityId(e){return Object.values(this._hass.entities??{}).find(i=>i.device_id===this._config.device_id&&i.entity_id.startsWith("sensor.")&&i.translation_key===e)?.entity_id}_resolveMetrics(){const e=this._resolveDeviceEntities(),i=parseInt(this._hass.states[e.monitored_images]?.state,10)||0,t=this._resolveSensorEntityId("updates_available");return{monitored_images:i,updates_available:parseInt(this._hass.states[t]?.state,10)||0}}_resolveLastChecked(){const e=this._hass.states[this._resolveSensorEntityId("last_checked")]?.state;return e?new Date(e).toLocaleString():LABELS.lastCheckedUnknown}_classifyImage(e){const i=e?.result;if(null==i?.has_update)return"unknown";if(!1===i.has_update)return"up_to_date";return{major:"major_updates",minor:"minor_updates",patch:"patch_updates",other:"other_updates"}[i?.info?.version_update_type]??"other_updates"}_resolveSections(){const e=Object.fromEntries(DEFAULT_SECTIONS.map(e=>[e.key,e])),i=this._resolveDeviceEntities(),t=this._hass.states[i.monitored_images]?.attributes?.images_list??[],o=Object.fromEntries(ALL_SECTION_KEYS.map(e=>[e,[]]));for(const e of t)o[this._classifyImage(e)].push(e);const n=i.excluded_images;n&&(o.excluded_images=this._hass.states[n]?.attributes?.images_list??[]);const r=this._config.order_sections??ALL_SECTION_KEYS,s=ALL_SECTION_KEYS.filter(e=>!r.includes(e)&&"divider"!==e),a=new Set(this._config.hide_sections??[]);return[...r,...s].filter(i=>"divider"===i||!a.has(i)&&e[i]).map(i=>"divider"===i?{key:"divider",divider:!0}:{...e[i],images:o[i]??[]})}_renderHeroBadges(e){return`\n      ${this._renderLogoHtml()}\n      <div class="hero-badge-wrapper">\n        <span class="hero-badge monitored">\n          <ha-icon icon="mdi:docker"></ha-icon>\n          ${e.monitored_images} ${this._pluralize(e.monitored_images,LABELS.monitoredSingular,LABELS.monitoredPlural)}\n        </span>\n        <span class="hero-badge ${e.updates_available>0?"has-updates":""}">\n          <ha-icon icon="${this._updateIcon(e.updates_available)}"></ha-icon>\n          ${e.updates_available>0?`${e.updates_available} ${this._pluralize(e.updates_available,LABELS.availableSingular,LABELS.availablePlural)}`:LABELS.upToDate}\n        </span>\n      </div>`}_renderHeroClassic(e){return`\n      <div class="hero-counter">\n        ${this._renderLogoHtml()}\n        <div class="hero-stats">\n          <span class="hero-number">${e.monitored_images}<span class="hero-label">&nbsp;&nbsp;${this._pluralize(e.monitored_images,LABELS.monitoredSingular,LABELS.monitoredPlural)}</span></span>\n          <span class="hero-updates ${e.updates_available>0?"has-updates":""}">\n            <ha-icon icon="${this._updateIcon(e.updates_available)}"></ha-icon>\n            ${e.updates_available} ${this._pluralize(e.updates_available,LABELS.availableSingular,LABELS.availablePlural)}\n          </span>\n        </div>\n      </div>`}_render(){if(!this._hass||!this._config)return;const e=this._resolveSections(),i=this._resolveMetrics(),t=!!this._config.title,o=!this._config.hide_hero,n=!this._config.hide_footer,r=this._config.hero_style??CONFIG_DEFAULTS.hero_style;if(this._initialized){if("classic"===r){const e=this.shadowRoot.querySelector(".hero-number");e&&(e.innerHTML=`${i.monitored_images}<span class="hero-label">&nbsp;&nbsp;${this._pluralize(i.monitored_images,LABELS.monitoredSingular,LABELS.monitoredPlural)}</span>`);const t=this.shadowRoot.querySelector(".hero-updates");if(t){t.className="hero-updates"+(i.updates_available>0?" has-updates":"");const e=t.querySelector("ha-icon");e&&e.setAttribute("icon",this._updateIcon(i.updates_available)),t.childNodes[t.childNodes.length-1].textContent=` ${i.updates_available} ${this._pluralize(i.updates_available,LABELS.availableSingular,LABELS.availablePlural)}`}}else{const e=this.shadowRoot.querySelector(".hero-badge.monitored");e&&(e.childNodes[e.childNodes.length-1].textContent=` ${i.monitored_images} ${this._pluralize(i.monitored_images,LABELS.monitoredSingular,LABELS.monitoredPlural)}`);const t=this.shadowRoot.querySelector(".hero-badge:not(.monitored)");if(t){t.className="hero-badge"+(i.updates_available>0?" has-updates":"");const e=t.querySelector("ha-icon");e&&e.setAttribute("icon",this._updateIcon(i.updates_available)),t.childNodes[t.childNodes.length-1].textContent=i.updates_available>0?` ${i.updates_available} ${this._pluralize(i.updates_available,LABELS.availableSingular,LABELS.availablePlural)}`:` ${LABELS.upToDate}`}}const t=this.shadowRoot.querySelector(".refresh-button");t&&(t.innerHTML=`<ha-icon icon="mdi:clock-outline"></ha-icon> ${this._resolveLastChecked()}`),e.forEach(e=>{if(e.divider)return;const i=this.shadowRoot.querySelector(`.section-title[data-key="${e.key}"] .section-count`);i&&(i.textContent=e.images.length);const t=this.shadowRoot.querySelector(`.section-body[data-key="${e.key}"]`);t&&"none"!==t.style.display&&(t.innerHTML=this._renderImages(e))})}else{const s=t?"0px":"12px",a=t?"1px":"6px";this.shadowRoot.innerHTML=`\n        <style>\n          :host { display: block; }\n          ha-card {\n            padding-top: ${t||o?"0":"16px"} !important;\n          }\n          .card-header { margin-block-start: 0; margin-block-end: 0; padding-bottom: 8px; }\n          .card-header .name { overflow: hidden; text-overflow: ellipsis; white-space: nowrap; }\n\n          /* ── Hero: shared ── */\n          .card-hero {\n            display: flex; flex-direction: row; align-items: center;\n            padding: ${s} 16px ${a};\n          }\n\n          /* ── Hero: badges style ── */\n          .card-hero > img, .card-hero > a > img { width: 52px; height: 52px; object-fit: contain; flex-shrink: 0; }\n          .hero-badge-wrapper { flex: 1; display: flex; justify-content: center; align-items: center; gap: 8px; flex-wrap: wrap; }\n          .hero-badge {\n            display: inline-flex; align-items: center; gap: 6px;\n            padding: 4px 12px 4px 8px; border-radius: 999px;\n            font-size: 14px; font-weight: 600;\n            background: rgba(67,160,71,0.15); color: var(--success-color, #43a047);\n          }\n          .hero-badge.monitored  { background: rgba(21,101,192,0.15); color: var(--primary-color, #1565c0); }\n          .hero-badge.has-updates { background: rgba(219,68,55,0.15); color: var(--error-color, #db4437); }\n          .hero-badge ha-icon { --mdc-icon-size: 20px; }\n\n          /* ── Hero: classic style ── */\n          .hero-counter { display: flex; align-items: center; gap: 12px; }\n          .hero-counter > img, .hero-counter > a > img { width: 52px; height: 52px; object-fit: contain; }\n          .hero-stats { display: flex; flex-direction: column; gap: 4px; padding-left: 8px; }\n          .hero-number {\n            display: flex; align-items: baseline; white-space: nowrap;\n            font-size: 32px; font-weight: 700; line-height: 1;\n            color: var(--success-color, #43a047);\n          }\n          .hero-label { font-size: 16px; font-weight: 400; color: var(--success-color, #43a047); }\n          .hero-updates {\n            display: flex; align-items: center; gap: 4px;\n            font-size: 13px; color: var(--secondary-text-color);\n          }\n          .hero-updates ha-icon { --mdc-icon-size: 14px; }\n          .hero-updates.has-updates { color: var(--error-color, #db4437); }\n\n          /* ── Sections ── */\n          .sections-divider { border: none; border-top: 1px solid var(--divider-color); margin: 8px 16px; }\n          .section { margin: 0 8px; }\n          .section-title {\n            display: flex; align-items: center; justify-content: space-between;\n            font-size: 0.9em; font-weight: 500;\n            text-transform: uppercase; letter-spacing: 0.05em;\n            color: var(--secondary-text-color);\n            margin: 20px 8px 12px; cursor: pointer; user-select: none;\n          }\n          .section-title:first-child { margin-top: 0; }\n          .section-title.expanded { margin-bottom: 2px; }\n          .section-title:hover { color: var(--primary-text-color); }\n          .section-title ha-icon { --mdc-icon-size: 16px; width: 16px; height: 16px; display: flex; }\n          .section-body { padding: 0 8px; }\n          .image-row {\n            display: flex; align-items: center; gap: 16px;\n            min-height: 48px; padding: 8px;\n            border-bottom: 1px solid var(--divider-color); box-sizing: border-box;\n          }\n          .image-row:last-child { border-bottom: none; }\n          .image-icon-wrapper {\n            display: flex; align-items: center; justify-content: center;\n            width: 40px; height: 40px; flex-shrink: 0;\n          }\n          .image-icon-wrapper ha-icon { --mdc-icon-size: 24px; }\n          .image-info {\n            display: flex; flex-direction: column; justify-content: center;\n            overflow: hidden; flex: 1;\n          }\n          .image-name {\n            font-size: var(--ha-font-size-m, 14px); font-weight: 400;\n            color: var(--primary-text-color);\n            overflow: hidden; text-overflow: ellipsis; white-space: nowrap;\n          }\n          .image-version {\n            font-size: var(--ha-font-size-s, 12px); color: var(--secondary-text-color);\n            overflow: hidden; text-overflow: ellipsis; white-space: nowrap;\n          }\n          .image-version .version-arrow { margin: 0 4px; }\n          .image-link { display: flex; align-items: center; color: var(--secondary-text-color); flex-shrink: 0; }\n          .image-link:hover { color: var(--primary-text-color); }\n          .image-link ha-icon { --mdc-icon-size: 18px; }\n          .empty {\n            font-size: var(--ha-font-size-m, 14px); color: var(--secondary-text-color);\n            font-style: italic; padding: 4px 8px 8px;\n          }\n\n          /* ── Footer ── */\n          .card-footer {\n            display: flex; align-items: center; justify-content: flex-end;\n            padding: 0 16px 6px; margin-top: 4px;\n          }\n          .refresh-button {\n            display: inline-flex; align-items: center; gap: 6px;\n            padding: 0 8px 4px; border-radius: 999px; border: none;\n            background: none; cursor: pointer;\n            color: var(--secondary-text-color); font-size: 10px;\n          }\n          .refresh-button:hover { color: var(--primary-text-color); background: var(--secondary-background-color); }\n          .refresh-button ha-icon { --mdc-icon-size: 12px; }\n        </style>\n        <ha-card>\n          ${t?`<h1 class="card-header"><div class="name">${this._config.title}</div></h1>${o?'<hr class="sections-divider">':""}`:""}\n          ${o?`\n          <div class="card-hero">\n            ${"classic"===r?this._renderHeroClassic(i):this._renderHeroBadges(i)}\n          </div>\n          <hr class="sections-divider">`:""}\n          ${e.map(e=>{if(e.divider)return'<hr class="sections-divider">';const i=this._isCollapsed(e.key,e.images.length);return`\n              <div class="section">\n                <div class="section-title${i?"":" expanded"}" data-key="${e.key}">\n                  <span>${e.label} (<span class="section-count">${e.images.length}</span>)</span>\n                  <ha-icon icon="${i?"mdi:chevron-down":"mdi:chevron-up"}"></ha-icon>\n                </div>\n                <div class="section-body" data-key="${e.key}" style="${i?"display:none":""}">\n                  ${this._renderImages(e)}\n                </div>\n              </div>`}).join("")}\n          ${n?`\n          <div class="card-footer">\n            <button class="refresh-button" id="refresh-btn">\n              <ha-icon icon="mdi:clock-outline"></ha-icon> ${this._resolveLastChecked()}\n            </button>\n          </div>`:""}\n        </ha-card>\n      `,this._initialized=!0,this.shadowRoot.getElementById("refresh-btn")?.addEventListener("click",()=>this._pressRefresh())}}async _pressRefresh(){const e=this._resolveDeviceEntities().action_refresh;e&&await this._hass.callService("button","press",{entity_id:e})}_renderVersion(e){const i=e?.result?.info;if(!i)return"";if("digest"===i.type){const e=i.local_digests?.[0]?.substring(7,19),t=i.remote_digest?.substring(7,19);return e&&t?`<span class="image-version">${e}<span class="version-arrow">→</span>${t}</span>`:""}const t=i.current_version,o=i.new_version;return t||o?t&&o&&t!==o?`<span class="image-version">${t}<span class="version-arrow">→</span>${o}</span>`:`<span class="image-version">${t??o}</span>`:""}_renderImages(e){return 0===e.images.length?`<div class="empty">${LABELS.noImages}</div>`:e.images.map(i=>`\n      <div class="image-row">\n        <div class="image-icon-wrapper">\n          <ha-icon icon="${e.icon}" style="color: ${e.color}"></ha-icon>\n        </div>\n        <div class="image-info">\n          <span class="image-name">${i.reference??i.name??LABELS.imageUnknown}</span>\n          ${this._renderVersion(i)}\n        </div>\n        ${i.url?`<a class="image-link" href="${i.url}" target="_blank" rel="noopener noreferrer"><ha-icon icon="mdi:open-in-new"></ha-icon></a>`:""}\n      </div>\n    `).join("")}}customElements.define("cup-component-card",CupImagesCard),window.customCards=window.customCards??[],window.customCards.push({type:"cup-component-card",name:"Cup Component Card",description:CARD_DESCRIPTION,preview:!0}),console.info("%c 🐼 CUP-COMPONENT-CARD %c Version 1.7 ","color: white; background: #2196f3; font-weight: 700;","color: #2196f3; background: white; font-weight: 700;");
\ No newline at end of file
+const INTEGRATION_DOMAIN="cup_component",CARD_DESCRIPTION="Displays all monitored Docker images grouped by update type.",CARD_VERSION="1.0",CARD_LOGO_CDN_URL="https://brands.home-assistant.io/_/cup_component/icon.png",CARD_LOGO_API_URL="/api/brands/integration/cup_component/icon.png",LABELS={monitoredSingular:"monitored image",monitoredPlural:"monitored images",upToDateSingular:"up-to-date image",upToDatePlural:"up-to-date images",availableSingular:"update available",availablePlural:"updates available",upToDate:"Up to date",noImages:"No images",imageUnknown:"Unknown",lastCheckedUnknown:"Unknown",editorCollapsedBehaviour:"Default collapsed behaviour",editorHeroStyle:"Hero style",editorHideSections:"Hide sections",editorHideHeroBlock:"Hero block",editorHideFooter:"Footer",editorSectionOrder:"Section order",editorAddButton:"Add"},DEFAULT_SECTIONS=[{key:"major_updates",label:"Major Updates",icon:"mdi:arrow-up-circle",color:"var(--error-color)"},{key:"minor_updates",label:"Minor Updates",icon:"mdi:arrow-up-circle",color:"var(--warning-color)"},{key:"patch_updates",label:"Patch Updates",icon:"mdi:arrow-up-circle",color:"var(--primary-color)"},{key:"other_updates",label:"Other Updates",icon:"mdi:arrow-up-circle",color:"#9b59b6"},{key:"up_to_date",label:"Up to Date",icon:"mdi:check-circle",color:"var(--success-color)"},{key:"unknown",label:"Unknown",icon:"mdi:help-circle-outline",color:"var(--disabled-color)"},{key:"excluded_images",label:"Excluded",icon:"mdi:minus-circle-outline",color:"var(--disabled-color)"}],ALL_SECTION_KEYS=DEFAULT_SECTIONS.map(e=>e.key),_globalCollapsed={},CONFIG_DEFAULTS={hero_style:"badges",collapsed:"if_empty",hide_hero:!1,hide_footer:!1,hide_sections:[],preview:{collapsed:"always",hide_sections:["up_to_date","unknown","excluded_images"],hide_footer:!0}},EDITOR_SECTION_KEYS=[...ALL_SECTION_KEYS,"divider"],EDITOR_SECTION_LABELS={major_updates:"Major Updates",minor_updates:"Minor Updates",patch_updates:"Patch Updates",other_updates:"Other Updates",up_to_date:"Up to Date",unknown:"Unknown",excluded_images:"Excluded",divider:"── Divider ──"},COLLAPSED_OPTIONS=[{value:"always",label:"Always collapsed"},{value:"if_empty",label:"Collapse empty sections"},{value:"never",label:"Never collapsed"}],HERO_STYLE_OPTIONS=[{value:"badges",label:"Badges"},{value:"classic",label:"Classic"}];class CupImagesCardEditor extends HTMLElement{constructor(){super(),this.attachShadow({mode:"open"}),this._config={},this._hass=null,this._dragSrcIndex=null,this._domBuilt=!1}set hass(e){this._hass=e,this._domBuilt&&this.shadowRoot.querySelectorAll("ha-selector").forEach(i=>{i.hass=e})}setConfig(e){this._domBuilt?(this._config={...e},this._updateValues()):(this._config={...e},this._buildDOM())}_buildDOM(){this.shadowRoot.innerHTML=`\n      <style>\n        :host { display: block; }\n        .editor { display: flex; flex-direction: column; gap: 16px; padding: 16px 0; }\n        .collapsible-header {\n          display: flex; align-items: center; justify-content: space-between;\n          cursor: pointer; user-select: none;\n        }\n        .collapsible-header:hover .field-label { color: var(--primary-text-color); }\n        .collapsible-header ha-icon { --mdc-icon-size: 16px; color: var(--secondary-text-color); }\n        .collapsible-body { margin-top: 8px; }\n        .collapsible-body[hidden] { display: none; }\n        .field-label {\n          font-size: var(--ha-font-size-s, 12px);\n          font-weight: 500;\n          text-transform: uppercase;\n          letter-spacing: 0.1em;\n          color: var(--secondary-text-color);\n          margin-bottom: 4px;\n        }\n        .checkbox-grid { display: grid; grid-template-columns: 1fr 1fr; gap: 4px 16px; }\n        .checkbox-row {\n          display: flex; align-items: center; gap: 8px;\n          font-size: var(--ha-font-size-m, 14px);\n          cursor: pointer; user-select: none;\n        }\n        .checkbox-row input[type=checkbox] { width: 18px; height: 18px; cursor: pointer; }\n        .order-list { display: flex; flex-direction: column; gap: 4px; }\n        .order-item {\n          display: flex; align-items: center; gap: 8px;\n          padding: 6px 8px; border-radius: 4px;\n          background: var(--secondary-background-color);\n          cursor: grab; font-size: var(--ha-font-size-m, 14px);\n          border: 1px solid transparent;\n        }\n        .order-item.dragging  { opacity: 0.4; }\n        .order-item.drag-over { border-color: var(--primary-color); }\n        .order-item ha-icon   { --mdc-icon-size: 18px; color: var(--secondary-text-color); flex-shrink: 0; }\n        .order-item span      { flex: 1; }\n        .order-item .remove-btn { cursor: pointer; color: var(--secondary-text-color); --mdc-icon-size: 16px; }\n        .order-item .remove-btn:hover { color: var(--error-color); }\n        .add-section-row { display: flex; align-items: center; gap: 8px; margin-top: 4px; }\n        .add-section-row select {\n          flex: 1; padding: 6px 8px; border-radius: 4px;\n          border: 1px solid var(--divider-color);\n          background: var(--card-background-color);\n          color: var(--primary-text-color);\n          font-size: var(--ha-font-size-m, 14px);\n        }\n        .add-btn {\n          display: inline-flex; align-items: center; gap: 4px;\n          padding: 6px 12px; border-radius: 4px;\n          border: 1px solid var(--primary-color); background: none;\n          color: var(--primary-color); font-size: var(--ha-font-size-m, 14px); cursor: pointer;\n        }\n        .add-btn:hover { background: var(--primary-color); color: white; }\n        /* Hide validation error styling on optional title field */\n        #title-field { --mdc-text-field-error-color: transparent; }\n      </style>\n      <div class="editor">\n\n        <div>\n          <ha-selector id="device-picker"></ha-selector>\n        </div>\n\n        <div>\n          <ha-selector id="title-field"></ha-selector>\n        </div>\n\n        <div>\n          <div class="field-label">${LABELS.editorCollapsedBehaviour}</div>\n          <ha-selector id="collapsed-select"></ha-selector>\n        </div>\n\n        <div>\n          <div class="collapsible-header" id="hero-style-header">\n            <div class="field-label">${LABELS.editorHeroStyle}</div>\n            <ha-icon icon="mdi:chevron-down"></ha-icon>\n          </div>\n          <div class="collapsible-body" id="hero-style-body" hidden>\n            <ha-selector id="hero-style-select"></ha-selector>\n          </div>\n        </div>\n\n        <div>\n          <div class="collapsible-header" id="hide-sections-header">\n            <div class="field-label">${LABELS.editorHideSections}</div>\n            <ha-icon icon="mdi:chevron-down"></ha-icon>\n          </div>\n          <div class="collapsible-body" id="hide-sections-body" hidden>\n            <div class="checkbox-grid">\n              <label class="checkbox-row">\n                <input type="checkbox" id="hide-hero-cb">\n                ${LABELS.editorHideHeroBlock}\n              </label>\n              <label class="checkbox-row">\n                <input type="checkbox" id="hide-footer-cb">\n                ${LABELS.editorHideFooter}\n              </label>\n            </div>\n            <hr style="border:none;border-top:1px solid var(--divider-color);margin:8px 0;">\n            <div class="checkbox-grid">\n              ${ALL_SECTION_KEYS.map(e=>`\n                <label class="checkbox-row">\n                  <input type="checkbox" data-key="${e}">\n                  ${EDITOR_SECTION_LABELS[e]}\n                </label>\n              `).join("")}\n            </div>\n          </div>\n        </div>\n\n        <div>\n          <div class="collapsible-header" id="section-order-header">\n            <div class="field-label">${LABELS.editorSectionOrder}</div>\n            <ha-icon icon="mdi:chevron-down"></ha-icon>\n          </div>\n          <div class="collapsible-body" id="section-order-body" hidden>\n            <div id="order-list-wrapper">\n              <div class="order-list" id="order-list"></div>\n            </div>\n            <div class="add-section-row">\n              <select id="add-select">\n                ${EDITOR_SECTION_KEYS.map(e=>`<option value="${e}">${EDITOR_SECTION_LABELS[e]}</option>`).join("")}\n              </select>\n              <button class="add-btn" id="add-btn"><ha-icon icon="mdi:plus"></ha-icon> ${LABELS.editorAddButton}</button>\n            </div>\n          </div>\n        </div>\n\n        \x3c!-- cup-component-card 1.0 --\x3e\n\n      </div>\n    `;const e=this.shadowRoot;e.querySelector("#device-picker").selector={device:{integration:"cup_component"}},e.querySelector("#device-picker").label=this._hass?.localize("ui.components.device-picker.device")||"Device",e.querySelector("#title-field").selector={text:{suffix:""}};const i=this._hass?.localize("ui.panel.lovelace.editor.card.generic.title")||"Title",t=this._hass?.localize("ui.common.optional")||"optional";e.querySelector("#title-field").label=`${i} (${t})`,e.querySelector("#title-field").required=!1,e.querySelector("#collapsed-select").selector={select:{options:COLLAPSED_OPTIONS}},e.querySelector("#hero-style-select").selector={select:{mode:"list",options:HERO_STYLE_OPTIONS}},this._domBuilt=!0,this._updateValues(),this._attachListeners()}_updateValues(){const e=this._config,i=this.shadowRoot;this._hass&&i.querySelectorAll("ha-selector").forEach(e=>{e.hass=this._hass}),i.querySelector("#device-picker").value=e.device_id??"",i.querySelector("#title-field").value=e.title??"",i.querySelector("#collapsed-select").value=e.collapsed??CONFIG_DEFAULTS.collapsed,i.querySelector("#hero-style-select").value=e.hero_style??CONFIG_DEFAULTS.hero_style,i.querySelector("#hide-hero-cb").checked=!!e.hide_hero,i.querySelector("#hide-footer-cb").checked=!!e.hide_footer;const t=new Set(e.hide_sections??[]);i.querySelectorAll("input[type=checkbox][data-key]").forEach(e=>{e.checked=t.has(e.dataset.key)});const o=e.order_sections??ALL_SECTION_KEYS;i.querySelector("#order-list").innerHTML=o.map((e,i)=>`\n      <div class="order-item" draggable="true" data-index="${i}" data-key="${e}">\n        <ha-icon icon="mdi:drag"></ha-icon>\n        <span>${EDITOR_SECTION_LABELS[e]??e}</span>\n        <ha-icon class="remove-btn" icon="mdi:close" data-index="${i}"></ha-icon>\n      </div>\n    `).join("")}_attachListeners(){const e=this.shadowRoot;e.querySelector("#device-picker").addEventListener("value-changed",e=>{this._updateConfig({device_id:e.detail.value})}),e.querySelector("#title-field").addEventListener("value-changed",e=>{const i=(e.detail.value??"").trim();i?this._config.title=i:delete this._config.title,this._fireConfig()}),e.querySelector("#collapsed-select").addEventListener("value-changed",e=>{const i=e.detail.value;this._updateConfig({collapsed:i===CONFIG_DEFAULTS.collapsed?void 0:i})}),e.querySelector("#hero-style-select").addEventListener("value-changed",e=>{const i=e.detail.value;this._updateConfig({hero_style:i===CONFIG_DEFAULTS.hero_style?void 0:i})}),e.querySelector("#hide-hero-cb").addEventListener("change",e=>{this._updateConfig({hide_hero:e.target.checked||void 0})}),e.querySelector("#hide-footer-cb").addEventListener("change",e=>{this._updateConfig({hide_footer:e.target.checked||void 0})}),e.querySelector("#hide-sections-body").addEventListener("change",i=>{if(!i.target.matches("input[type=checkbox][data-key]"))return;const t=[...e.querySelectorAll("input[type=checkbox][data-key]")].filter(e=>e.checked).map(e=>e.dataset.key);this._updateConfig({hide_sections:t.length?t:void 0})});const i=e.querySelector("#order-list-wrapper");i.addEventListener("dragstart",e=>{const i=e.target.closest(".order-item");i&&(this._dragSrcIndex=parseInt(i.dataset.index,10),i.classList.add("dragging"))}),i.addEventListener("dragend",()=>{e.querySelectorAll(".order-item").forEach(e=>e.classList.remove("dragging","drag-over"))}),i.addEventListener("dragover",i=>{i.preventDefault();const t=i.target.closest(".order-item");e.querySelectorAll(".order-item").forEach(e=>e.classList.remove("drag-over")),t&&t.classList.add("drag-over")}),i.addEventListener("drop",e=>{e.preventDefault();const i=e.target.closest(".order-item");if(!i||null===this._dragSrcIndex)return;const t=parseInt(i.dataset.index,10);if(t===this._dragSrcIndex)return;const o=[...this._config.order_sections??ALL_SECTION_KEYS],[n]=o.splice(this._dragSrcIndex,1);o.splice(t,0,n),this._dragSrcIndex=null,this._updateConfig({order_sections:o})}),i.addEventListener("click",e=>{const i=e.target.closest(".remove-btn");if(!i)return;const t=parseInt(i.dataset.index,10),o=[...this._config.order_sections??ALL_SECTION_KEYS];o.splice(t,1),this._updateConfig({order_sections:o.length?o:void 0})});const t=(i,t)=>{const o=e.querySelector(`#${i}`),n=e.querySelector(`#${t}`),r=o.querySelector("ha-icon");o.addEventListener("click",()=>{const e=n.hasAttribute("hidden");e?n.removeAttribute("hidden"):n.setAttribute("hidden",""),r.setAttribute("icon",e?"mdi:chevron-up":"mdi:chevron-down")})};t("hero-style-header","hero-style-body"),t("hide-sections-header","hide-sections-body"),t("section-order-header","section-order-body"),e.querySelector("#add-btn").addEventListener("click",()=>{const i=e.querySelector("#add-select").value;if(!i)return;const t=[...this._config.order_sections??ALL_SECTION_KEYS];t.push(i),this._updateConfig({order_sections:t})})}_fireConfig(){this.dispatchEvent(new CustomEvent("config-changed",{detail:{config:this._config},bubbles:!0,composed:!0}))}_updateConfig(e){for(const[i,t]of Object.entries(e))void 0===t?delete this._config[i]:this._config[i]=t;this._fireConfig(),this._updateValues()}}customElements.define("cup-component-card-editor",CupImagesCardEditor);class CupImagesCard extends HTMLElement{constructor(){super(),this._deviceEntities=null,this._initialized=!1,this._logoUrl="",this._subscription=null,this._subscribedEntry=null,this._images=null,this._metrics=null,this._lastChecked=null,this.attachShadow({mode:"open"}),this.shadowRoot.addEventListener("click",e=>{const i=e.target.closest(".section-title");if(!i)return;const t=i.dataset.key,o=this.shadowRoot.querySelector(`.section-body[data-key="${t}"]`),n=i.querySelector("ha-icon");if(!o)return;const r="none"!==o.style.display;_globalCollapsed[t]=r,o.style.display=r?"none":"",i.classList.toggle("expanded",!r),n&&n.setAttribute("icon",r?"mdi:chevron-down":"mdi:chevron-up")})}setConfig(e){if(!e.device_id)throw new Error("Please define a device_id.");const{_preview:i,...t}=e;i&&(delete t.collapsed,delete t.hide_sections,delete t.hide_footer),this._config=i?e:t,this._deviceEntities=null,this._initialized=!1,this._unsubscribe()}set hass(e){if(this._hass=e,this._subscribe(),!this._logoResolved)return this._logoResolved=!0,void this._resolveLogoUrl().then(()=>this._render());this._logoUrl&&this._render()}connectedCallback(){this._hass&&this._subscribe()}disconnectedCallback(){this._unsubscribe()}_subscribe(){const e=this._hass?.devices?.[this._config?.device_id],i=e?.primary_config_entry??e?.config_entries?.[0];i&&this.isConnected&&this._subscribedEntry!==i&&(this._unsubscribe(),this._subscribedEntry=i,this._subscription=this._hass.connection.subscribeMessage(e=>this._handleSubscriptionEvent(e),{type:`${INTEGRATION_DOMAIN}/subscribe`,entry_id:i}).catch(e=>(console.warn("Cup Component Card: unable to subscribe to the images",e),null)))}_unsubscribe(){const e=this._subscription;this._subscription=null,this._subscribedEntry=null,this._images=null,this._metrics=null,this._lastChecked=null,e?.then(e=>e?.()).catch(()=>{})}_handleSubscriptionEvent(e){if("snapshot"===e.type)this._images=new Map(Object.entries(e.images)),this._metrics={...e.metrics};else{this._images??=new Map;for(const[i,t]of Object.entries(e.changed))this._images.set(i,t);for(const i of e.removed)this._images.delete(i);this._metrics={...this._metrics,...e.metrics}}this._lastChecked=e.last_checked,this._logoUrl&&this._render()}getCardSize(){return 3}static getConfigElement(){return document.createElement("cup-component-card-editor")}static getStubConfig(e){const i=Object.values(e?.entities??{}).find(e=>"cup_component"===e.platform);return{device_id:i?.device_id??"",_preview:!0,...CONFIG_DEFAULTS.preview}}async _resolveLogoUrl(){const e=this._hass?.config?.version??"",[i,t]=e.split(".").map(Number);if(!(i>2026||2026===i&&t>=3))return void(this._logoUrl=CARD_LOGO_CDN_URL);const o=await this._hass.connection.sendMessagePromise({type:"brands/access_token"});o.token&&(this._logoUrl=`${CARD_LOGO_API_URL}?token=${o.token}`)}_isCollapsed(e,i){const t=this._config.collapsed??CONFIG_DEFAULTS.collapsed;return"always"===t||"never"!==t&&(e in _globalCollapsed?_globalCollapsed[e]:0===i)}get _deviceVisitUrl(){return this._hass?.devices?.[this._config?.device_id]?.configuration_url??null}_renderLogoHtml(){const e=`<img src="${this._logoUrl}" alt="Logo Cup Component">`;return this._deviceVisitUrl?`<a href="${this._deviceVisitUrl}" target="_blank" rel="noopener noreferrer" style="display:inline-flex;">${e}</a>`:e}_pluralize(e,i,t){return e>1?t:i}_updateIcon(e){return e>0?"mdi:arrow-up-circle":"mdi:check-circle-outline"}_resolveDeviceEntities(){if(this._deviceEntities)return this._deviceEntities;const e={};for(const i of Object.values(this._hass.entities??{}))i.device_id===this._config.device_id&&i.translation_key&&(e[i.translation_key]=i.entity_id);return this._deviceEntities=e,e}_resolveSensorEntityId(e){return Object.values(this._hass.entities??{}).find(i=>i.device_id===this._config.device_id&&i.entity_id.startsWith("sensor.")&&i.translation_key===e)?.entity_id}_resolveMetrics(){if(this._metrics)return{monitored_images:this._metrics.monitored_images??0,updates_available:this._metrics.updates_available??0};const e=this._resolveDeviceEntities(),i=parseInt(this._hass.states[e.monitored_images]?.state,10)||0,t=this._resolveSensorEntityId("updates_available");return{monitored_images:i,updates_available:parseInt(this._hass.states[t]?.state,10)||0}}_resolveLastChecked(){const e=this._images?this._lastChecked:this._hass.states[this._resolveSensorEntityId("last_checked")]?.state;return e?new Date(e).toLocaleString():LABELS.lastCheckedUnknown}_resolveSections(){const e=Object.fromEntries(DEFAULT_SECTIONS.map(e=>[e.key,e])),o=Object.fromEntries(ALL_SECTION_KEYS.map(e=>[e,[]]));for(const[e,i]of this._images??[])o[i.bucket]?.push({reference:e,url:i.url,result:{info:i.info}});const r=this._config.order_sections??ALL_SECTION_KEYS,s=ALL_SECTION_KEYS.filter(e=>!r.includes(e)&&"divider"!==e),a=new Set(this._config.hide_sections??[]);return[...r,...s].filter(i=>"divider"===i||!a.has(i)&&e[i]).map(i=>"divider"===i?{key:"divider",divider:!0}:{...e[i],images:o[i]??[]})}_renderHeroBadges(e){return`\n      ${this._renderLogoHtml()}\n      <div class="hero-badge-wrapper">\n        <span class="hero-badge monitored">\n          <ha-icon icon="mdi:docker"></ha-icon>\n          ${e.monitored_images} ${this._pluralize(e.monitored_images,LABELS.monitoredSingular,LABELS.monitoredPlural)}\n        </span>\n        <span class="hero-badge ${e.updates_available>0?"has-updates":""}">\n          <ha-icon icon="${this._updateIcon(e.updates_available)}"></ha-icon>\n          ${e.updates_available>0?`${e.updates_available} ${this._pluralize(e.updates_available,LABELS.availableSingular,LABELS.availablePlural)}`:LABELS.upToDate}\n        </span>\n      </div>`}_renderHeroClassic(e){return`\n      <div class="hero-counter">\n        ${this._renderLogoHtml()}\n        <div class="hero-stats">\n          <span class="hero-number">${e.monitored_images}<span class="hero-label">&nbsp;&nbsp;${this._pluralize(e.monitored_images,LABELS.monitoredSingular,LABELS.monitoredPlural)}</span></span>\n          <span class="hero-updates ${e.updates_available>0?"has-updates":""}">\n            <ha-icon icon="${this._updateIcon(e.updates_available)}"></ha-icon>\n            ${e.updates_available} ${this._pluralize(e.updates_available,LABELS.availableSingular,LABELS.availablePlural)}\n          </span>\n        </div>\n      </div>`}_render(){if(!this._hass||!this._config)return;const e=this._resolveSections(),i=this._resolveMetrics(),t=!!this._config.title,o=!this._config.hide_hero,n=!this._config.hide_footer,r=this._config.hero_style??CONFIG_DEFAULTS.hero_style;if(this._initialized){if("classic"===r){const e=this.shadowRoot.querySelector(".hero-number");e&&(e.innerHTML=`${i.monitored_images}<span class="hero-label">&nbsp;&nbsp;${this._pluralize(i.monitored_images,LABELS.monitoredSingular,LABELS.monitoredPlural)}</span>`);const t=this.shadowRoot.querySelector(".hero-updates");if(t){t.className="hero-updates"+(i.updates_available>0?" has-updates":"");const e=t.querySelector("ha-icon");e&&e.setAttribute("icon",this._updateIcon(i.updates_available)),t.childNodes[t.childNodes.length-1].textContent=` ${i.updates_available} ${this._pluralize(i.updates_available,LABELS.availableSingular,LABELS.availablePlural)}`}}else{const e=this.shadowRoot.querySelector(".hero-badge.monitored");e&&(e.childNodes[e.childNodes.length-1].textContent=` ${i.monitored_images} ${this._pluralize(i.monitored_images,LABELS.monitoredSingular,LABELS.monitoredPlural)}`);const t=this.shadowRoot.querySelector(".hero-badge:not(.monitored)");if(t){t.className="hero-badge"+(i.updates_available>0?" has-updates":"");const e=t.querySelector("ha-icon");e&&e.setAttribute("icon",this._updateIcon(i.updates_available)),t.childNodes[t.childNodes.length-1].textContent=i.updates_available>0?` ${i.updates_available} ${this._pluralize(i.updates_available,LABELS.availableSingular,LABELS.availablePlural)}`:` ${LABELS.upToDate}`}}const t=this.shadowRoot.querySelector(".refresh-button");t&&(t.innerHTML=`<ha-icon icon="mdi:clock-outline"></ha-icon> ${this._resolveLastChecked()}`),e.forEach(e=>{if(e.divider)return;const i=this.shadowRoot.querySelector(`.section-title[data-key="${e.key}"] .section-count`);i&&(i.textContent=e.images.length);const t=this.shadowRoot.querySelector(`.section-body[data-key="${e.key}"]`);t&&"none"!==t.style.display&&(t.innerHTML=this._renderImages(e))})}else{const s=t?"0px":"12px",a=t?"1px":"6px";this.shadowRoot.innerHTML=`\n        <style>\n          :host { display: block; }\n          ha-card {\n            padding-top: ${t||o?"0":"16px"} !important;\n          }\n          .card-header { margin-block-start: 0; margin-block-end: 0; padding-bottom: 8px; }\n          .card-header .name { overflow: hidden; text-overflow: ellipsis; white-space: nowrap; }\n\n          /* ── Hero: shared ── */\n          .card-hero {\n            display: flex; flex-direction: row; align-items: center;\n            padding: ${s} 16px ${a};\n          }\n\n          /* ── Hero: badges style ── */\n          .card-hero > img, .card-hero > a > img { width: 52px; height: 52px; object-fit: contain; flex-shrink: 0; }\n          .hero-badge-wrapper { flex: 1; display: flex; justify-content: center; align-items: center; gap: 8px; flex-wrap: wrap; }\n          .hero-badge {\n            display: inline-flex; align-items: center; gap: 6px;\n            padding: 4px 12px 4px 8px; border-radius: 999px;\n            font-size: 14px; font-weight: 600;\n            background: rgba(67,160,71,0.15); color: var(--success-color, #43a047);\n          }\n          .hero-badge.monitored  { background: rgba(21,101,192,0.15); color: var(--primary-color, #1565c0); }\n          .hero-badge.has-updates { background: rgba(219,68,55,0.15); color: var(--error-color, #db4437); }\n          .hero-badge ha-icon { --mdc-icon-size: 20px; }\n\n          /* ── Hero: classic style ── */\n          .hero-counter { display: flex; align-items: center; gap: 12px; }\n          .hero-counter > img, .hero-counter > a > img { width: 52px; height: 52px; object-fit: contain; }\n          .hero-stats { display: flex; flex-direction: column; gap: 4px; padding-left: 8px; }\n          .hero-number {\n            display: flex; align-items: baseline; white-space: nowrap;\n            font-size: 32px; font-weight: 700; line-height: 1;\n            color: var(--success-color, #43a047);\n          }\n          .hero-label { font-size: 16px; font-weight: 400; color: var(--success-color, #43a047); }\n          .hero-updates {\n            display: flex; align-items: center; gap: 4px;\n            font-size: 13px; color: var(--secondary-text-color);\n          }\n          .hero-updates ha-icon { --mdc-icon-size: 14px; }\n          .hero-updates.has-updates { color: var(--error-color, #db4437); }\n\n          /* ── Sections ── */\n          .sections-divider { border: none; border-top: 1px solid var(--divider-color); margin: 8px 16px; }\n          .section { margin: 0 8px; }\n          .section-title {\n            display: flex; align-items: center; justify-content: space-between;\n            font-size: 0.9em; font-weight: 500;\n            text-transform: uppercase; letter-spacing: 0.05em;\n            color: var(--secondary-text-color);\n            margin: 20px 8px 12px; cursor: pointer; user-select: none;\n          }\n          .section-title:first-child { margin-top: 0; }\n          .section-title.expanded { margin-bottom: 2px; }\n          .section-title:hover { color: var(--primary-text-color); }\n          .section-title ha-icon { --mdc-icon-size: 16px; width: 16px; height: 16px; display: flex; }\n          .section-body { padding: 0 8px; }\n          .image-row {\n            display: flex; align-items: center; gap: 16px;\n            min-height: 48px; padding: 8px;\n            border-bottom: 1px solid var(--divider-color); box-sizing: border-box;\n          }\n          .image-row:last-child { border-bottom: none; }\n          .image-icon-wrapper {\n            display: flex; align-items: center; justify-content: center;\n            width: 40px; height: 40px; flex-shrink: 0;\n          }\n          .image-icon-wrapper ha-icon { --mdc-icon-size: 24px; }\n          .image-info {\n            display: flex; flex-direction: column; justify-content: center;\n            overflow: hidden; flex: 1;\n          }\n          .image-name {\n            font-size: var(--ha-font-size-m, 14px); font-weight: 400;\n            color: var(--primary-text-color);\n            overflow: hidden; text-overflow: ellipsis; white-space: nowrap;\n          }\n          .image-version {\n            font-size: var(--ha-font-size-s, 12px); color: var(--secondary-text-color);\n            overflow: hidden; text-overflow: ellipsis; white-space: nowrap;\n          }\n          .image-version .version-arrow { margin: 0 4px; }\n          .image-link { display: flex; align-items: center; color: var(--secondary-text-color); flex-shrink: 0; }\n          .image-link:hover { color: var(--primary-text-color); }\n          .image-link ha-icon { --mdc-icon-size: 18px; }\n          .empty {\n            font-size: var(--ha-font-size-m, 14px); color: var(--secondary-text-color);\n            font-style: italic; padding: 4px 8px 8px;\n          }\n\n          /* ── Footer ── */\n          .card-footer {\n            display: flex; align-items: center; justify-content: flex-end;\n            padding: 0 16px 6px; margin-top: 4px;\n          }\n          .refresh-button {\n            display: inline-flex; align-items: center; gap: 6px;\n            padding: 0 8px 4px; border-radius: 999px; border: none;\n            background: none; cursor: pointer;\n            color: var(--secondary-text-color); font-size: 10px;\n          }\n          .refresh-button:hover { color: var(--primary-text-color); background: var(--secondary-background-color); }\n          .refresh-button ha-icon { --mdc-icon-size: 12px; }\n        </style>\n        <ha-card>\n          ${t?`<h1 class="card-header"><div class="name">${this._config.title}</div></h1>${o?'<hr class="sections-divider">':""}`:""}\n          ${o?`\n          <div class="card-hero">\n            ${"classic"===r?this._renderHeroClassic(i):this._renderHeroBadges(i)}\n          </div>\n          <hr class="sections-divider">`:""}\n          ${e.map(e=>{if(e.divider)return'<hr class="sections-divider">';const i=this._isCollapsed(e.key,e.images.length);return`\n              <div class="section">\n                <div class="section-title${i?"":" expanded"}" data-key="${e.key}">\n                  <span>${e.label} (<span class="section-count">${e.images.length}</span>)</span>\n                  <ha-icon icon="${i?"mdi:chevron-down":"mdi:chevron-up"}"></ha-icon>\n                </div>\n                <div class="section-body" data-key="${e.key}" style="${i?"display:none":""}">\n                  ${this._renderImages(e)}\n                </div>\n              </div>`}).join("")}\n          ${n?`\n          <div class="card-footer">\n            <button class="refresh-button" id="refresh-btn">\n              <ha-icon icon="mdi:clock-outline"></ha-icon> ${this._resolveLastChecked()}\n            </button>\n          </div>`:""}\n        </ha-card>\n      `,this._initialized=!0,this.shadowRoot.getElementById("refresh-btn")?.addEventListener("click",()=>this._pressRefresh())}}async _pressRefresh(){const e=this._resolveDeviceEntities().action_refresh;e&&await this._hass.callService("button","press",{entity_id:e})}_renderVersion(e){const i=e?.result?.info;if(!i)return"";if("digest"===i.type){const e=i.local_digests?.[0]?.substring(7,19),t=i.remote_digest?.substring(7,19);return e&&t?`<span class="image-version">${e}<span class="version-arrow">→</span>${t}</span>`:""}const t=i.current_version,o=i.new_version;return t||o?t&&o&&t!==o?`<span class="image-version">${t}<span class="version-arrow">→</span>${o}</span>`:`<span class="image-version">${t??o}</span>`:""}_renderImages(e){return 0===e.images.length?`<div class="empty">${LABELS.noImages}</div>`:e.images.map(i=>`\n      <div class="image-row">\n        <div class="image-icon-wrapper">\n          <ha-icon icon="${e.icon}" style="color: ${e.color}"></ha-icon>\n        </div>\n        <div class="image-info">\n          <span class="image-name">${i.reference??i.name??LABELS.imageUnknown}</span>\n          ${this._renderVersion(i)}\n        </div>\n        ${i.url?`<a class="image-link" href="${i.url}" target="_blank" rel="noopener noreferrer"><ha-icon icon="mdi:open-in-new"></ha-icon></a>`:""}\n      </div>\n    `).join("")}}customElements.define("cup-component-card",CupImagesCard),window.customCards=window.customCards??[],window.customCards.push({type:"cup-component-card",name:"Cup Component Card",description:CARD_DESCRIPTION,preview:!0}),console.info("%c 🐼 CUP-COMPONENT-CARD %c Version 1.7 ","color: white; background: #2196f3; font-weight: 700;","color: #2196f3; background: white; font-weight: 700;");
\ No newline at end of file